@@ -1,6 +1,7 @@
 import os
 
 from celery import Celery
+from django.conf import settings
 
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app1.settings')
@@ -17,6 +18,13 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
 
 
+@app.on_after_finalize.connect
+def setup_periodic_tasks(sender, **kwargs):
+    """Sets up interview availability to be precomputed periodically."""
+    from interviews.tasks import precompute_availability
+    sender.add_periodic_task(settings.INTERVIEWS_AVAILABILITY_REFRESH_INTERVAL, precompute_availability.s())
+
+
 @app.task(bind=True, ignore_result=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
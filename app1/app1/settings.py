@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'django_extensions',
     'global_use',
     'interviews',
@@ -88,6 +89,91 @@ DATABASES = {
 }
 
 
+# Redis
+# Shared by the free/busy cache and the cache framework, Celery uses CELERY_BROKER_URL from the environment.
+
+REDIS_HOST = os.environ.get("REDIS_HOST")
+REDIS_URL = (
+    f'{os.environ.get("REDIS_ENGINE", "redis")}://{REDIS_HOST}:{os.environ.get("REDIS_PORT", "6379")}'
+    if REDIS_HOST else None
+)
+
+# Shared by every worker through redis1, each worker keeps its own cache when Redis is not configured
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'KEY_PREFIX': 'app1',
+    } if REDIS_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Sessions are read from the cache and only written through to db1
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# Seconds free/busy provider responses stay cached in Redis
+FREE_BUSY_CACHE_TTL = int(os.environ.get("FREE_BUSY_CACHE_TTL", 300))
+
+# Free/busy provider: mock, synthetic, directory, http or the dotted path of a factory returning a provider, see
+# interviews.free_busy_cache.FREE_BUSY_PROVIDERS. Defaults to synthetic when FREE_BUSY_SYNTHETIC_SEED is set and mock
+# otherwise. The directory provider reads {id}.json or {id}.ics calendars from FREE_BUSY_PROVIDER_DIRECTORY
+
+FREE_BUSY_PROVIDER = os.environ.get("FREE_BUSY_PROVIDER") or None
+FREE_BUSY_PROVIDER_DIRECTORY = os.environ.get("FREE_BUSY_PROVIDER_DIRECTORY") or None
+
+# Remote free/busy service of the http provider and the async availability view (the provider above when unset),
+# most requests in flight per view and seconds each request may take
+
+FREE_BUSY_PROVIDER_URL = os.environ.get("FREE_BUSY_PROVIDER_URL") or None
+FREE_BUSY_MAX_CONCURRENCY = int(os.environ.get("FREE_BUSY_MAX_CONCURRENCY", 10))
+FREE_BUSY_TIMEOUT = float(os.environ.get("FREE_BUSY_TIMEOUT", 5))
+
+# Seeded synthetic calendars used instead of mock_availability when FREE_BUSY_SYNTHETIC_SEED is set, for load tests
+# Busy blocks per interviewer per working day and comma separated time zones interviewers are spread across
+
+FREE_BUSY_SYNTHETIC_SEED = (
+    int(os.environ["FREE_BUSY_SYNTHETIC_SEED"]) if os.environ.get("FREE_BUSY_SYNTHETIC_SEED") else None
+)
+FREE_BUSY_SYNTHETIC_DENSITY = float(os.environ.get("FREE_BUSY_SYNTHETIC_DENSITY", 2))
+FREE_BUSY_SYNTHETIC_TIMEZONES = os.environ.get("FREE_BUSY_SYNTHETIC_TIMEZONES", "UTC").split(",")
+
+
+# Interviews
+# Availability backend is python, bitmask or postgres (single query against stored BusyBlocks)
+
+INTERVIEWS_AVAILABILITY_BACKEND = os.environ.get("INTERVIEWS_AVAILABILITY_BACKEND", "python")
+
+# Busy blocks the per-process LRU cache of merged panel busy unions holds, 0 disables it
+
+INTERVIEWS_PANEL_CACHE_SIZE = int(os.environ.get("INTERVIEWS_PANEL_CACHE_SIZE", 100000))
+
+# Seconds between celery-beat precomputing availability and seconds stored availability is served before it is
+# recomputed inline
+
+INTERVIEWS_AVAILABILITY_REFRESH_INTERVAL = int(os.environ.get("INTERVIEWS_AVAILABILITY_REFRESH_INTERVAL", 300))
+INTERVIEWS_AVAILABILITY_MAX_AGE = int(os.environ.get("INTERVIEWS_AVAILABILITY_MAX_AGE", 900))
+
+# Seconds availability responses stay in the shared cache, they are keyed by ETag so a change never serves stale slots
+
+INTERVIEWS_AVAILABILITY_CACHE_TTL = int(os.environ.get("INTERVIEWS_AVAILABILITY_CACHE_TTL", 300))
+
+# Longest scheduling horizon in days and largest page of slots the availability view serves
+
+INTERVIEWS_MAX_HORIZON_DAYS = int(os.environ.get("INTERVIEWS_MAX_HORIZON_DAYS", 92))
+INTERVIEWS_MAX_PAGE_SIZE = int(os.environ.get("INTERVIEWS_MAX_PAGE_SIZE", 500))
+
+# Seconds between keepalive comments on idle availability event streams and seconds clients wait before reconnecting
+
+INTERVIEWS_EVENTS_HEARTBEAT = int(os.environ.get("INTERVIEWS_EVENTS_HEARTBEAT", 15))
+INTERVIEWS_EVENTS_RETRY = int(os.environ.get("INTERVIEWS_EVENTS_RETRY", 5))
+
+# Seconds a reserved slot stays held in Redis before it is released unless celery confirmed it
+
+INTERVIEWS_RESERVATION_HOLD_TTL = int(os.environ.get("INTERVIEWS_RESERVATION_HOLD_TTL", 120))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -0,0 +1,77 @@
+import functools
+import logging
+import time as time_module
+
+import redis
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Errors of an unreachable shared cache, RedisCache does not catch them
+CACHE_ERRORS = (redis.RedisError, ConnectionError)
+
+
+def get_or_set_single_flight(key:str, compute, timeout:int, lock_timeout:float=10, poll_interval:float=0.05):
+    """
+    Gets a value from the shared cache or computes and caches it. On a miss only the caller that takes the key's lock
+    computes the value and every other caller waits for it, so an expired key costs one computation across all
+    workers instead of one per request in flight. Waiters compute the value themselves when the lock holder fails or
+    takes longer than lock_timeout. Every caller computes the value itself while the cache is unreachable.
+    :param key: cache key
+    :param compute: function computing the value, it must not return None
+    :param timeout: seconds the value stays cached
+    :param lock_timeout: seconds the lock is held at most
+    :param poll_interval: seconds between checks for the lock holder's value
+    :returns: cached or computed value
+    """
+    lock_key = f'{key}:lock'
+    try:
+        value = cache.get(key)
+        if value is not None:
+            return value
+        locked = cache.add(lock_key, 1, lock_timeout)
+        if not locked:
+            deadline = time_module.monotonic() + lock_timeout
+            while time_module.monotonic() < deadline:
+                time_module.sleep(poll_interval)
+                value = cache.get(key)
+                if value is not None:
+                    return value
+                if cache.get(lock_key) is None:
+                    break
+    except CACHE_ERRORS:
+        logger.warning('Shared cache unavailable, computing %s without it', key, exc_info=True)
+        return compute()
+    try:
+        value = compute()
+        try:
+            cache.set(key, value, timeout)
+        except CACHE_ERRORS:
+            logger.warning('Shared cache unavailable, %s not cached', key, exc_info=True)
+    finally:
+        if locked:
+            try:
+                cache.delete(lock_key)
+            except CACHE_ERRORS:
+                logger.warning('Shared cache unavailable, lock of %s left to expire', key, exc_info=True)
+    return value
+
+
+def single_flight_cache(key_func, timeout):
+    """
+    Caches the results of a function in the shared cache with get_or_set_single_flight.
+    :param key_func: function of the same arguments returning the cache key, or None to skip the cache
+    :param timeout: seconds results stay cached, or a function returning them so settings are read on every call
+    :returns: decorator
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            key = key_func(*args, **kwargs)
+            if key is None:
+                return function(*args, **kwargs)
+            return get_or_set_single_flight(
+                key, lambda: function(*args, **kwargs), timeout() if callable(timeout) else timeout
+            )
+        return wrapper
+    return decorator
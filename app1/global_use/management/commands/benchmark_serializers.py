@@ -0,0 +1,49 @@
+import json
+import timeit
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from global_use.serializers import django_model_to_json, serialize_model
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks serialize_model against django_model_to_json on stored model instances.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', help='model label Ex: interviews.InterviewTemplate')
+        parser.add_argument('--related', nargs='*', default=[], help='related fields to nest Ex: interviewers')
+        parser.add_argument('--count', type=int, default=100, help='number of instances to serialize')
+        parser.add_argument('--repeat', type=int, default=5, help='number of timed runs, the best is reported')
+
+    def handle(self, *args, **options):
+        try:
+            model_class = apps.get_model(options['model'])
+        except (LookupError, ValueError) as e:
+            raise CommandError(e)
+        related = tuple(options['related'])
+        instances = list(model_class.objects.prefetch_related(*related)[:options['count']])
+        if not instances:
+            raise CommandError(f'No {options["model"]} instances to serialize')
+
+        # Both paths end as a JSON string so the encoding serialize_model defers to the response is counted
+        paths = {
+            'django_model_to_json': lambda: json.dumps(
+                [django_model_to_json(instance) for instance in instances], cls=DjangoJSONEncoder
+            ),
+            'serialize_model': lambda: json.dumps(
+                [serialize_model(instance, related=related) for instance in instances], cls=DjangoJSONEncoder
+            ),
+        }
+        results = {}
+        for name, path in paths.items():
+            path()
+            results[name] = min(timeit.repeat(path, number=1, repeat=options['repeat']))
+            self.stdout.write(
+                f'{name}: {results[name] * 1000:.2f} ms for {len(instances)} instances '
+                f'({len(instances) / results[name]:.0f} instances/s)'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'serialize_model is {results["django_model_to_json"] / results["serialize_model"]:.1f}x faster'
+        ))
@@ -0,0 +1,16 @@
+from functools import cache
+
+import redis
+from django.conf import settings
+
+
+@cache
+def get_redis_client() -> redis.Redis | None:
+    """
+    Gets the process wide Redis client for redis1. The client keeps its own connection pool so it is shared by every
+    request in the worker.
+    :returns: Redis client or None when REDIS_URL is not configured
+    """
+    if not settings.REDIS_URL:
+        return None
+    return redis.Redis.from_url(settings.REDIS_URL)
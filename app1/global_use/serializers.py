@@ -1,3 +1,6 @@
+from functools import cache
+from operator import attrgetter
+
 from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.forms import model_to_dict
@@ -8,6 +11,62 @@ class ExtendedEncoder(DjangoJSONEncoder):
         if isinstance(obj, models.Model):
             return model_to_dict(obj)
         return super().default(obj)
-    
+
 def django_model_to_json(model: models.Model):
     return json.loads(json.dumps(model, cls=ExtendedEncoder))
+
+
+@cache
+def get_model_extractor(model_class: type[models.Model], related: tuple[str, ...] = ()):
+    """
+    Compiles a function that builds the dict of a model instance, cached per model class and related fields. Fields
+    are the ones model_to_dict returns, foreign keys are their id and related fields are only followed when listed.
+    :param model_class: Django model class
+    :param related: names of foreign key, one to one or many to many fields to nest as dicts of the related models
+    :returns: function of a model instance returning a dict
+    """
+    opts = model_class._meta
+    getters = [
+        (field.name, attrgetter(field.attname)) for field in opts.concrete_fields if getattr(field, 'editable', False)
+    ]
+    for name in related:
+        field = opts.get_field(name)
+        extract_related = get_model_extractor(field.related_model)
+        if field.many_to_many or field.one_to_many:
+            getters.append((name, lambda instance, name=name, extract=extract_related: [
+                extract(related_instance) for related_instance in getattr(instance, name).all()
+            ]))
+        else:
+            getters.append((name, lambda instance, name=name, extract=extract_related: (
+                None if (related_instance := getattr(instance, name)) is None else extract(related_instance)
+            )))
+
+    def extract(instance):
+        return {name: getter(instance) for name, getter in getters}
+
+    return extract
+
+
+def serialize_model(model: models.Model, related=()) -> dict:
+    """
+    Builds a dict of a model instance without encoding it. Dates and times are left as python objects to be encoded
+    once by JsonResponse or DjangoJSONEncoder.
+    :param model: Django model instance
+    :param related: names of related fields to nest Ex: ('interviewers',), prefetch them to avoid a query per instance
+    :returns: dict of the model Ex: {'interviewId': 1, 'name': 'Technical Interview', 'interviewers': [{'id': 1, ...}]}
+    """
+    return get_model_extractor(type(model), tuple(related))(model)
+
+
+def serialize_models(models_iterable, related=()) -> list[dict]:
+    """
+    Builds dicts of many model instances of the same class with one extractor.
+    :param models_iterable: iterable of Django model instances
+    :param related: names of related fields to nest
+    :returns: list of dicts of the models
+    """
+    models_list = list(models_iterable)
+    if not models_list:
+        return []
+    extract = get_model_extractor(type(models_list[0]), tuple(related))
+    return [extract(model) for model in models_list]
@@ -1,3 +1,82 @@
-from django.test import TestCase
+import io
+import json
+import threading
+import time as time_module
+from datetime import time
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test import TestCase, override_settings
+
+from global_use.cache import get_or_set_single_flight, single_flight_cache
+from global_use.serializers import django_model_to_json, serialize_model
+from interviews.models import InterviewTemplate, Interviewer
+
 
 # Create your tests here.
+class GlobalUseCacheTestCase(TestCase):
+    def setUp(self):
+        cache.delete_many(['test_single_flight', 'test_single_flight:lock', 'test_single_flight_cache:1'])
+
+    def test_get_or_set_single_flight(self):
+        calls, results = [], []
+
+        def compute():
+            calls.append(1)
+            time_module.sleep(0.2)
+            return {'value': len(calls)}
+
+        def request():
+            results.append(get_or_set_single_flight('test_single_flight', compute, timeout=60))
+
+        threads = [threading.Thread(target=request) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'value': 1}] * 8)
+        self.assertIsNone(cache.get('test_single_flight:lock'))
+
+    def test_single_flight_cache(self):
+        calls = []
+
+        @single_flight_cache(lambda value: f'test_single_flight_cache:{value}' if value else None, timeout=lambda: 60)
+        def double(value):
+            calls.append(value)
+            return value * 2
+
+        self.assertEqual([double(1), double(1), double(0), double(0)], [2, 2, 0, 0])
+        self.assertEqual(calls, [1, 0, 0])
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://127.0.0.1:1',
+    }})
+    def test_get_or_set_single_flight_cache_unavailable(self):
+        with self.assertLogs('global_use.cache', 'WARNING'):
+            value = get_or_set_single_flight('test_single_flight', lambda: {'value': 1}, timeout=60)
+        self.assertEqual(value, {'value': 1})
+
+
+class GlobalUseSerializersTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.interview = InterviewTemplate.objects.create(name='technical', durationMinutes=60)
+        cls.interview.interviewers.add(Interviewer.objects.create(name='Jane Doe'))
+
+    def test_serialize_model(self):
+        self.assertEqual(
+            json.loads(json.dumps(serialize_model(self.interview, related=('interviewers',)), cls=DjangoJSONEncoder)),
+            django_model_to_json(self.interview)
+        )
+        self.assertNotIn('interviewers', serialize_model(self.interview))
+        self.assertIsInstance(
+            serialize_model(self.interview, related=('interviewers',))['interviewers'][0]['start_time'], time
+        )
+
+    def test_benchmark_serializers(self):
+        call_command(
+            'benchmark_serializers', 'interviews.InterviewTemplate', '--related', 'interviewers', '--repeat', '1',
+            stdout=io.StringIO()
+        )
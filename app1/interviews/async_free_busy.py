@@ -0,0 +1,212 @@
+import asyncio
+from abc import ABC, abstractmethod
+from datetime import date, datetime, UTC
+from typing import TYPE_CHECKING
+from weakref import WeakKeyDictionary
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from interviews.helpers import (
+    DEFAULT_HORIZON_DAYS,
+    FREE_BUSY_WINDOW_DAYS,
+    get_horizon_window_starts,
+    get_time_blocks_from_busy_data_windows
+)
+from interviews.free_busy_cache import FreeBusyProviderError, free_busy_cache, get_free_busy_provider
+from interviews.slots import Slot
+
+if TYPE_CHECKING:
+    import httpx
+
+
+class AsyncFreeBusyProvider(ABC):
+    """
+    Async free/busy provider interface. Providers fetch one interviewer at a time so
+    get_free_busy_data_async can fetch a whole panel concurrently.
+    """
+    @abstractmethod
+    async def get_interviewer_free_busy(self, interviewer_id:int, start_date:date) -> dict:
+        """
+        Gets the free/busy data of one interviewer for the week window starting at start_date.
+        :param interviewer_id: interviewer id
+        :param start_date: start date of the week window
+        :returns: free/busy data {'interviewerId': 1, 'busy': [{'start': '2025-01-22T10:00:00Z', 'end': ...}, ...]}
+        """
+
+    async def aclose(self) -> None:
+        """
+        Releases any connections held by the provider.
+        """
+
+
+class MockAsyncFreeBusyProvider(AsyncFreeBusyProvider):
+    """
+    Async provider backed by the provider FREE_BUSY_PROVIDER selects, used when FREE_BUSY_PROVIDER_URL is not set. The
+    sync provider runs in a worker thread, so it does not block the event loop and the fetch timeout applies to it.
+    """
+    async def get_interviewer_free_busy(self, interviewer_id:int, start_date:date) -> dict:
+        free_busy_data = await sync_to_async(get_free_busy_provider(), thread_sensitive=False)(
+            [interviewer_id], start_date=start_date, days=FREE_BUSY_WINDOW_DAYS
+        )
+        return free_busy_data[0]
+
+
+_http_clients = WeakKeyDictionary()
+
+
+def get_async_http_client() -> "httpx.AsyncClient":
+    """
+    Gets the HTTP client shared by every request to the free/busy service on the running event loop, so connections
+    are kept alive and reused across requests. Async connections can not be shared across loops.
+    :returns: httpx.AsyncClient
+    """
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None or client.is_closed:
+        client = _http_clients[loop] = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=settings.FREE_BUSY_MAX_CONCURRENCY)
+        )
+    return client
+
+
+class HttpFreeBusyProvider(AsyncFreeBusyProvider):
+    """
+    Async provider for a remote free/busy service answering
+    GET {base_url}/interviewers/{id}/free-busy?start=2025-01-22&days=7 with the same json get_free_busy_data returns
+    for a single interviewer. Uses the event loop's shared client unless a client or max_connections is given. httpx is
+    only imported once a provider is created, so workers without FREE_BUSY_PROVIDER_URL never load it.
+    """
+    def __init__(self, base_url:str, client:"httpx.AsyncClient"=None, max_connections:int=None):
+        import httpx
+
+        self.base_url = base_url.rstrip('/')
+        # Only a client created for this provider is closed by aclose
+        self.owns_client = client is None and max_connections is not None
+        if self.owns_client:
+            client = httpx.AsyncClient(limits=httpx.Limits(max_connections=max_connections))
+        self.client = client or get_async_http_client()
+
+    async def get_interviewer_free_busy(self, interviewer_id:int, start_date:date) -> dict:
+        import httpx
+
+        try:
+            response = await self.client.get(
+                f'{self.base_url}/interviewers/{interviewer_id}/free-busy',
+                params={'start': start_date.isoformat(), 'days': FREE_BUSY_WINDOW_DAYS}
+            )
+            response.raise_for_status()
+            return response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            raise FreeBusyProviderError(f'Free/busy provider failed for interviewer {interviewer_id}: {e}') from e
+
+    async def aclose(self) -> None:
+        if self.owns_client:
+            await self.client.aclose()
+
+
+def get_async_free_busy_provider() -> AsyncFreeBusyProvider:
+    """
+    Gets the async free/busy provider configured by FREE_BUSY_PROVIDER_URL.
+    :returns: HttpFreeBusyProvider if FREE_BUSY_PROVIDER_URL is set else MockAsyncFreeBusyProvider
+    """
+    if settings.FREE_BUSY_PROVIDER_URL:
+        return HttpFreeBusyProvider(settings.FREE_BUSY_PROVIDER_URL)
+    return MockAsyncFreeBusyProvider()
+
+
+async def get_free_busy_data_async(interviewer_ids, start_date=None, provider=None, max_concurrency=None,
+                                   timeout=None, semaphore=None) -> list[dict]:
+    """
+    Fetches free/busy data for every interviewer concurrently with at most max_concurrency requests in flight.
+    :param list[int] interviewer_ids: list of interviewer ids
+    :param date start_date: start date of the week window, defaults to today in UTC
+    :param AsyncFreeBusyProvider provider: provider to fetch from, defaults to get_async_free_busy_provider()
+    :param int max_concurrency: most requests in flight, defaults to FREE_BUSY_MAX_CONCURRENCY
+    :param float timeout: seconds each request may take, defaults to FREE_BUSY_TIMEOUT
+    :param asyncio.Semaphore semaphore: semaphore shared with other calls, overrides max_concurrency
+    :returns: free/busy data in the same order as interviewer_ids [{'interviewerId': 1, 'busy': [...]}, ...]
+    :raises FreeBusyProviderError: if any request fails or times out
+    """
+    if not start_date:
+        start_date = datetime.now(UTC).date()
+    if timeout is None:
+        timeout = settings.FREE_BUSY_TIMEOUT
+    semaphore = semaphore or asyncio.Semaphore(max_concurrency or settings.FREE_BUSY_MAX_CONCURRENCY)
+    close_provider = provider is None
+    provider = provider or get_async_free_busy_provider()
+
+    async def fetch(interviewer_id):
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(provider.get_interviewer_free_busy(interviewer_id, start_date), timeout)
+            except TimeoutError as e:
+                raise FreeBusyProviderError(f'Free/busy provider timed out for interviewer {interviewer_id}') from e
+
+    try:
+        return list(await asyncio.gather(*(fetch(interviewer_id) for interviewer_id in interviewer_ids)))
+    finally:
+        if close_provider:
+            await provider.aclose()
+
+
+async def get_cached_free_busy_data_async(interviewer_ids, start_date, provider, timeout=None,
+                                          semaphore=None) -> list[dict]:
+    """
+    Async counterpart of FreeBusyCache.get_free_busy_data. Gets free/busy data from the shared Redis free/busy cache,
+    fetches the misses concurrently with get_free_busy_data_async and adds the interviewers' stored BusyBlocks.
+    :param list[int] interviewer_ids: list of interviewer ids
+    :param date start_date: start date of the week window
+    :param AsyncFreeBusyProvider provider: provider to fetch the misses from
+    :param float timeout: seconds each request may take, defaults to FREE_BUSY_TIMEOUT
+    :param asyncio.Semaphore semaphore: semaphore shared with other calls
+    :returns: free/busy data in the same order as interviewer_ids [{'interviewerId': 1, 'busy': [...]}, ...]
+    :raises FreeBusyProviderError: if any request fails or times out
+    """
+    cached = await sync_to_async(free_busy_cache.get_cached)(interviewer_ids, start_date)
+    missing_ids = [
+        interviewer_id for interviewer_id, data in zip(interviewer_ids, cached or [None] * len(interviewer_ids))
+        if data is None
+    ]
+    fetched = {}
+    if missing_ids:
+        busy_data = await get_free_busy_data_async(
+            missing_ids, start_date=start_date, provider=provider, timeout=timeout, semaphore=semaphore
+        )
+        busy_data = await sync_to_async(free_busy_cache.add_stored_busy_blocks)(busy_data, missing_ids, start_date)
+        fetched = dict(zip(missing_ids, busy_data))
+    if cached is None:
+        return [fetched[interviewer_id] for interviewer_id in interviewer_ids]
+    await sync_to_async(free_busy_cache.store)(start_date, fetched, len(interviewer_ids) - len(missing_ids))
+    return [
+        fetched[interviewer_id] if data is None else data for interviewer_id, data in zip(interviewer_ids, cached)
+    ]
+
+
+async def get_time_blocks_from_busy_data_async(interviewers, days=DEFAULT_HORIZON_DAYS, provider=None,
+                                               max_concurrency=None, timeout=None) -> list[list[Slot]]:
+    """
+    Async version of get_time_blocks_from_busy_data that reads the shared free/busy cache and fetches the misses of
+    every interviewer and week window concurrently sharing one concurrency bound.
+    :param list[int] interviewers: list of interviewer ids
+    :param int days: number of days in the horizon after today
+    :param AsyncFreeBusyProvider provider: provider to fetch from, defaults to get_async_free_busy_provider()
+    :param int max_concurrency: most requests in flight, defaults to FREE_BUSY_MAX_CONCURRENCY
+    :param float timeout: seconds each request may take, defaults to FREE_BUSY_TIMEOUT
+    :returns: unavailable time blocks for the interview [(start_minute, end_minute), ...]
+    :raises FreeBusyProviderError: if any request fails or times out
+    """
+    semaphore = asyncio.Semaphore(max_concurrency or settings.FREE_BUSY_MAX_CONCURRENCY)
+    close_provider = provider is None
+    provider = provider or get_async_free_busy_provider()
+    try:
+        busy_data_windows = await asyncio.gather(*(
+            get_cached_free_busy_data_async(interviewers, window_start, provider, timeout=timeout, semaphore=semaphore)
+            for window_start in get_horizon_window_starts(days)
+        ))
+    finally:
+        if close_provider:
+            await provider.aclose()
+    return get_time_blocks_from_busy_data_windows(busy_data_windows)
@@ -0,0 +1,162 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, UTC
+from weakref import WeakKeyDictionary
+
+import redis
+import redis.asyncio
+from django.conf import settings
+
+from global_use.redis_client import get_redis_client
+from interviews.helpers import time_blocks_to_json
+from interviews.slots import Slot, to_minutes
+
+logger = logging.getLogger(__name__)
+
+# Events a stream may fall behind by before its queued diffs are dropped and it is sent a fresh snapshot
+EVENT_QUEUE_SIZE = 100
+# Queued in place of a diff when a stream has to be sent a fresh snapshot
+RESYNC = None
+
+
+def get_channel(interview_id:int) -> str:
+    """
+    Gets the Redis pub/sub channel availability diffs of an InterviewTemplate are published on.
+    :param interview_id: interviewId of InterviewTemplate
+    :returns: channel name
+    """
+    return f'availability:{interview_id}'
+
+
+def diff_slots(old_slots, new_slots) -> tuple[list[Slot], list[Slot]]:
+    """
+    Gets the slots added and removed between two versions of an interview's availability. Slots starting within the
+    next 24 hours are never served so they are left out, slots only aging out of the window are not a change.
+    :param list[Slot] old_slots: previous available time blocks
+    :param list[Slot] new_slots: current available time blocks
+    :returns: (added time blocks, removed time blocks) each sorted
+    """
+    min_minute = to_minutes(datetime.now(UTC) + timedelta(days=1), ceil=True)
+    old_slots = {Slot(start, end) for start, end in old_slots if start >= min_minute}
+    new_slots = {Slot(start, end) for start, end in new_slots if start >= min_minute}
+    return sorted(new_slots - old_slots), sorted(old_slots - new_slots)
+
+
+def publish_availability_diff(interview_id:int, old_slots, new_slots) -> int:
+    """
+    Publishes the slots added and removed from an interview's availability to every worker streaming its events, call
+    after its stored availability changes. Nothing is published when the upcoming slots are unchanged.
+    :param interview_id: interviewId of InterviewTemplate
+    :param list[Slot] old_slots: previous available time blocks
+    :param list[Slot] new_slots: current available time blocks
+    :returns: number of workers that received the diff
+    """
+    added, removed = diff_slots(old_slots, new_slots)
+    client = get_redis_client()
+    if client is None or not (added or removed):
+        return 0
+    try:
+        return client.publish(get_channel(interview_id), json.dumps({
+            'interviewId': interview_id,
+            'added': time_blocks_to_json(added),
+            'removed': time_blocks_to_json(removed),
+        }))
+    except redis.RedisError:
+        logger.warning('Availability events unavailable, diff not published', exc_info=True)
+        return 0
+
+
+class AvailabilityEventHub:
+    """
+    Fans availability diffs out to every event stream of a worker over a single Redis pub/sub connection. A template's
+    channel is only subscribed while at least one stream of the worker follows it and one reader task dispatches
+    messages to the streams' queues, so a worker holds one Redis connection however many clients it streams to.
+    """
+    def __init__(self, client:redis.asyncio.Redis):
+        self.client = client
+        self.pubsub = client.pubsub(ignore_subscribe_messages=True)
+        self.queues = defaultdict(set)
+        self.lock = asyncio.Lock()
+        self.reader = None
+
+    async def subscribe(self, interview_id:int) -> asyncio.Queue:
+        """
+        Follows the availability diffs of an InterviewTemplate.
+        :param interview_id: interviewId of InterviewTemplate
+        :returns: queue of published diffs, RESYNC when the stream fell behind
+        """
+        channel = get_channel(interview_id)
+        queue = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+        async with self.lock:
+            self.queues[channel].add(queue)
+            if len(self.queues[channel]) == 1:
+                await self.pubsub.subscribe(channel)
+            if self.reader is None or self.reader.done():
+                self.reader = asyncio.create_task(self.read())
+        return queue
+
+    async def unsubscribe(self, interview_id:int, queue:asyncio.Queue) -> None:
+        """
+        Stops following the availability diffs of an InterviewTemplate.
+        :param interview_id: interviewId of InterviewTemplate
+        :param queue: queue returned by subscribe
+        """
+        channel = get_channel(interview_id)
+        async with self.lock:
+            self.queues[channel].discard(queue)
+            if not self.queues[channel]:
+                del self.queues[channel]
+                await self.pubsub.unsubscribe(channel)
+
+    async def read(self) -> None:
+        """
+        Dispatches published diffs to the queues following their channel until no stream is left.
+        """
+        while self.queues:
+            try:
+                message = await self.pubsub.get_message(timeout=1.0)
+            except redis.RedisError:
+                # Diffs published while disconnected are lost so every stream starts over from a snapshot
+                logger.warning('Availability events unavailable, resyncing streams', exc_info=True)
+                for queues in list(self.queues.values()):
+                    for queue in queues:
+                        self.put(queue, RESYNC)
+                await asyncio.sleep(1)
+                continue
+            if message is not None:
+                event = json.loads(message['data'])
+                for queue in self.queues.get(message['channel'].decode(), ()):
+                    self.put(queue, event)
+
+    @staticmethod
+    def put(queue:asyncio.Queue, event) -> None:
+        """
+        Queues an event for a stream without waiting on it, a stream that is too far behind gets RESYNC instead.
+        :param queue: queue of the stream
+        :param dict event: published diff or RESYNC
+        """
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(RESYNC)
+
+
+_event_hubs = WeakKeyDictionary()
+
+
+def get_event_hub() -> AvailabilityEventHub | None:
+    """
+    Gets the availability event hub of the running event loop, async Redis connections can not be shared across
+    loops.
+    :returns: AvailabilityEventHub or None when REDIS_URL is not configured
+    """
+    if not settings.REDIS_URL:
+        return None
+    loop = asyncio.get_running_loop()
+    if loop not in _event_hubs:
+        _event_hubs[loop] = AvailabilityEventHub(redis.asyncio.Redis.from_url(settings.REDIS_URL))
+    return _event_hubs[loop]
@@ -0,0 +1,236 @@
+import random
+import threading
+import time as time_module
+import tracemalloc
+
+import redis
+from datetime import datetime, timedelta, UTC
+
+from interviews.helpers import (
+    FREE_BUSY_WINDOW_DAYS,
+    get_all_available_time_blocks,
+    get_all_possible_time_blocks,
+    get_available_from_unavailable_time_block,
+    get_time_blocks_from_busy_data,
+    get_time_blocks_from_busy_data_windows,
+    merge_unavailable_time_blocks
+)
+from interviews.slots import Slot, to_minutes
+from interviews.synthetic_availability import SyntheticCalendar
+
+# Monday midnight UTC so every run benchmarks the same weekdays
+BENCHMARK_DATETIME = datetime(year=2025, month=1, day=6, tzinfo=UTC)
+BENCHMARKS = ('possible', 'busy_data', 'available_from_unavailable', 'all_available_python', 'all_available_bitmask')
+BASE_CASE = {'interviewers': 10, 'density': 2.0, 'duration': 60, 'days': 6}
+SWEEPS = {
+    'interviewers': [1, 10, 100, 1000],
+    'density': [0.5, 2.0, 6.0],
+    'duration': [30, 60, 120],
+    'days': [6, 30, 92],
+}
+# Parameters each benchmark depends on, cases that only differ in other parameters are run once
+BENCHMARK_PARAMETERS = {
+    'possible': ('duration', 'days'),
+    'busy_data': ('interviewers', 'density', 'days'),
+    'available_from_unavailable': ('interviewers', 'density', 'duration', 'days'),
+    'all_available_python': ('interviewers', 'density', 'duration', 'days'),
+    'all_available_bitmask': ('interviewers', 'density', 'duration', 'days'),
+}
+
+
+def get_cases(sweeps=None, base_case=None) -> list[dict]:
+    """
+    Gets the benchmark cases, each sweep varies one parameter while the others keep their base value.
+    :param dict[str, list] sweeps: values of each parameter to sweep, defaults to SWEEPS
+    :param dict base_case: value of each parameter while another one is swept, defaults to BASE_CASE
+    :returns: list of cases [{'interviewers': 10, 'density': 2.0, 'duration': 60, 'days': 6}, ...]
+    """
+    sweeps = SWEEPS if sweeps is None else sweeps
+    base_case = base_case or BASE_CASE
+    cases = [dict(base_case)]
+    for parameter, values in sweeps.items():
+        for value in values:
+            case = dict(base_case, **{parameter: value})
+            if case not in cases:
+                cases.append(case)
+    return cases
+
+
+def get_key(benchmark:str, case:dict) -> str:
+    """
+    Gets the name results are saved and compared under.
+    :param benchmark: name of the benchmark
+    :param case: benchmark case
+    :returns: key Ex: possible[duration=60,days=6]
+    """
+    return f'{benchmark}[' + ','.join(f'{parameter}={case[parameter]}' for parameter in BENCHMARK_PARAMETERS[benchmark]) + ']'
+
+
+def get_benchmark_functions(case:dict, benchmarks=BENCHMARKS, seed:int=0) -> dict:
+    """
+    Builds the synthetic data of a case and the function to time for each benchmark.
+    :param case: benchmark case
+    :param benchmarks: names of the benchmarks to run
+    :param seed: random seed of the synthetic busy data
+    :returns: functions keyed by benchmark name
+    """
+    interviewer_ids = list(range(1, case['interviewers'] + 1))
+    interviewers = [{'id': interviewer_id} for interviewer_id in interviewer_ids]
+    duration, days, dt = case['duration'], case['days'], BENCHMARK_DATETIME
+    provider = SyntheticCalendar(seed=seed, density=case['density'])
+    busy_data_windows = [
+        provider(interviewer_ids, start_date=dt.date() + timedelta(days=FREE_BUSY_WINDOW_DAYS * week))
+        for week in range(days // FREE_BUSY_WINDOW_DAYS + 1)
+    ]
+    unavailable_time_blocks_list = get_time_blocks_from_busy_data_windows(busy_data_windows)
+    possible_time_blocks = get_all_possible_time_blocks(duration, dt=dt, days=days)
+    unavailable_time_blocks = merge_unavailable_time_blocks(unavailable_time_blocks_list)
+    functions = {
+        'possible': lambda: get_all_possible_time_blocks(duration, dt=dt, days=days),
+        'busy_data': lambda: get_time_blocks_from_busy_data(interviewer_ids, days=days, provider=provider),
+        'available_from_unavailable': lambda: get_available_from_unavailable_time_block(
+            possible_time_blocks, unavailable_time_blocks
+        ),
+        'all_available_python': lambda: get_all_available_time_blocks(
+            interviewers, duration, dt=dt, unavailable_time_blocks_list=unavailable_time_blocks_list, backend='python',
+            days=days
+        ),
+        'all_available_bitmask': lambda: get_all_available_time_blocks(
+            interviewers, duration, dt=dt, unavailable_time_blocks_list=unavailable_time_blocks_list, backend='bitmask',
+            days=days
+        ),
+    }
+    return {benchmark: functions[benchmark] for benchmark in benchmarks}
+
+
+def measure(function, min_time:float=0.2, repeat:int=3) -> dict[str, float]:
+    """
+    Times a function and measures its peak memory. Each timed run calls the function until min_time has passed and
+    the best of repeat runs is kept. Peak memory is measured in a separate call since tracemalloc slows it down.
+    :param function: function without arguments
+    :param min_time: seconds each timed run lasts at least
+    :param repeat: number of timed runs
+    :returns: {'ops_per_sec': ops_per_sec, 'peak_memory_kib': peak_memory_kib}
+    """
+    function()
+    ops_per_sec = 0
+    for _ in range(repeat):
+        calls, started = 0, time_module.perf_counter()
+        while True:
+            function()
+            calls += 1
+            elapsed = time_module.perf_counter() - started
+            if elapsed >= min_time:
+                break
+        ops_per_sec = max(ops_per_sec, calls / elapsed)
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'ops_per_sec': ops_per_sec, 'peak_memory_kib': peak / 1024}
+
+
+def run_benchmarks(cases, benchmarks=BENCHMARKS, seed:int=0, min_time:float=0.2, repeat:int=3, callback=None) -> dict:
+    """
+    Runs every benchmark of every case once.
+    :param list[dict] cases: benchmark cases
+    :param benchmarks: names of the benchmarks to run
+    :param seed: random seed of the synthetic busy data
+    :param min_time: seconds each timed run lasts at least
+    :param repeat: number of timed runs
+    :param callback: called as callback(key, result) after each benchmark
+    :returns: results keyed by get_key {'possible[duration=60,days=6]': {'ops_per_sec': ..., 'peak_memory_kib': ...}}
+    """
+    results = {}
+    for case in cases:
+        pending = [benchmark for benchmark in benchmarks if get_key(benchmark, case) not in results]
+        if not pending:
+            continue
+        for benchmark, function in get_benchmark_functions(case, pending, seed=seed).items():
+            key = get_key(benchmark, case)
+            results[key] = measure(function, min_time=min_time, repeat=repeat)
+            if callback:
+                callback(key, results[key])
+    return results
+
+
+def compare_results(results:dict, baseline:dict, threshold:float=0.25) -> list[dict]:
+    """
+    Gets the benchmarks that got slower than the baseline by more than threshold. Benchmarks missing from either
+    side are ignored.
+    :param results: results of run_benchmarks
+    :param baseline: saved results of run_benchmarks
+    :param threshold: allowed slowdown Ex: 0.25 fails benchmarks under 75% of the baseline ops/sec
+    :returns: regressions [{'key': key, 'baseline': ops_per_sec, 'ops_per_sec': ops_per_sec, 'ratio': ratio}, ...]
+    """
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        ratio = result['ops_per_sec'] / baseline[key]['ops_per_sec']
+        if ratio < 1 - threshold:
+            regressions.append({
+                'key': key, 'baseline': baseline[key]['ops_per_sec'], 'ops_per_sec': result['ops_per_sec'], 'ratio': ratio
+            })
+    return regressions
+
+
+def run_reservation_benchmark(holds, requests:int=1000, concurrency:int=200, panel_size:int=3, slots:int=20,
+                              duration:int=60, seed:int=0) -> dict:
+    """
+    Benchmarks reservation holds under contention. concurrency threads are released at once and send requests
+    holding random slots of the same panel. Slots start half an hour apart, so with durations over 30 minutes
+    neighbouring slots overlap as well. Winning holds are checked to never overlap each other.
+    :param ReservationHolds holds: holds to benchmark, give it a key_prefix of its own
+    :param requests: number of hold requests
+    :param concurrency: number of simultaneous clients
+    :param panel_size: number of interviewers of the panel
+    :param slots: number of slots requests pick from
+    :param duration: duration in minutes of the slots
+    :param seed: random seed of the slots requested
+    :returns: {'requests': ..., 'held': ..., 'conflicts': ..., 'errors': Redis errors, 'requests_per_sec': ...,
+        'p50_ms': ..., 'p99_ms': ..., 'double_booked': overlapping winning holds}
+    """
+    rng = random.Random(seed)
+    first_start = to_minutes(BENCHMARK_DATETIME)
+    plan = [Slot(start, start + duration) for start in (
+        first_start + 30 * rng.randrange(slots) for _ in range(requests)
+    )]
+    interviewer_ids = list(range(1, panel_size + 1))
+    latencies, winners, errors, released = [], [], [], []
+    barrier = threading.Barrier(concurrency, action=lambda: released.append(time_module.perf_counter()))
+
+    def client(index):
+        barrier.wait()
+        for slot in plan[index::concurrency]:
+            started = time_module.perf_counter()
+            try:
+                hold = holds.hold(0, interviewer_ids, slot, f'candidate {index}')
+            except redis.RedisError as e:
+                errors.append(e)
+                continue
+            latencies.append(time_module.perf_counter() - started)
+            if hold is not None:
+                winners.append(slot)
+
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time_module.perf_counter() - released[0]
+
+    winners.sort()
+    latencies.sort()
+    return {
+        'requests': requests,
+        'held': len(winners),
+        'conflicts': len(latencies) - len(winners),
+        'errors': len(errors),
+        'requests_per_sec': requests / elapsed,
+        'p50_ms': latencies[len(latencies) // 2] * 1000 if latencies else 0,
+        'p99_ms': latencies[min(len(latencies) * 99 // 100, len(latencies) - 1)] * 1000 if latencies else 0,
+        'double_booked': sum(1 for previous, slot in zip(winners, winners[1:]) if slot.start < previous.end),
+    }
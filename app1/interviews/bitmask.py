@@ -0,0 +1,121 @@
+from datetime import datetime, timedelta, UTC, time
+from itertools import chain
+from math import gcd
+
+import numpy as np
+
+from interviews.helpers import MINUTES_PER_DAY, set_time_to_nearest_half_hour, get_time_blocks_from_busy_data
+from interviews.slots import Slot, to_minutes
+from interviews.working_hours import get_panel_working_hours
+
+SLOT_MINUTES = 30
+
+
+def get_cell_minutes(duration, unavailable_offsets) -> int:
+    """
+    Gets the largest cell size in minutes that lines up with half hour marks, the interview duration and every busy
+    block boundary so the bitmask gives the same answer as comparing datetimes.
+    :param int duration: duration in minutes of interview
+    :param np.ndarray unavailable_offsets: busy block boundaries in minutes from the start of the horizon
+    :returns: cell size in minutes
+    """
+    cell_minutes = gcd(SLOT_MINUTES, duration)
+    if unavailable_offsets.size:
+        cell_minutes = gcd(cell_minutes, int(np.gcd.reduce(unavailable_offsets)))
+    return cell_minutes
+
+
+def get_interval_mask(interval_starts, interval_ends, cell_minutes, cells) -> np.ndarray:
+    """
+    Gets a mask of the cells covered by at least one interval. Interval boundaries that fall inside a cell round
+    outward, and intervals that touch or overlap cover one continuous run of cells.
+    :param np.ndarray interval_starts: interval starts in minutes from the start of the horizon
+    :param np.ndarray interval_ends: interval ends in minutes from the start of the horizon
+    :param int cell_minutes: cell size in minutes
+    :param int cells: number of cells in the horizon
+    :returns: boolean array with one cell per cell_minutes across the horizon
+    """
+    changes = np.bincount(np.clip(interval_starts // cell_minutes, 0, cells), minlength=cells + 1)
+    changes -= np.bincount(np.clip(-(-interval_ends // cell_minutes), 0, cells), minlength=cells + 1)
+    return np.cumsum(changes)[:cells] > 0
+
+
+def get_working_mask(working_starts, working_ends, min_offset, cell_minutes, cells) -> np.ndarray:
+    """
+    Gets a mask of the cells an interview may occupy, within the panel's working hours and no earlier than min_offset.
+    Working hours come coalesced from get_panel_working_hours, so this matches get_possible_start_ranges.
+    :param np.ndarray working_starts: starts of the panel's working hours in minutes from the start of the horizon
+    :param np.ndarray working_ends: ends of the panel's working hours in minutes from the start of the horizon
+    :param int min_offset: earliest time an interview may start in minutes from origin
+    :param int cell_minutes: cell size in minutes
+    :param int cells: number of cells in the horizon
+    :returns: boolean array with one cell per cell_minutes across the horizon
+    """
+    working_mask = get_interval_mask(working_starts, working_ends, cell_minutes, cells)
+    min_cell = -(-min_offset // cell_minutes)
+    working_mask[:max(min_cell, 0)] = False
+    return working_mask
+
+
+def get_unavailable_offsets(unavailable_time_blocks_list, origin_minute) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Flattens busy blocks into arrays of start/end offsets in minutes from origin. A panel is free only where no
+    interviewer is busy, so the blocks of every interviewer go into the same arrays.
+    :param list[list[Slot]] unavailable_time_blocks_list: list of lists of unavailable time blocks
+    :param int origin_minute: midnight UTC of the first day of the horizon in minutes since the Unix epoch
+    :returns: (starts, ends) arrays
+    """
+    count = sum(map(len, unavailable_time_blocks_list))
+    offsets = np.fromiter(
+        chain.from_iterable(chain.from_iterable(unavailable_time_blocks_list)), dtype=np.int64, count=2 * count
+    ) - origin_minute
+    return offsets[0::2], offsets[1::2]
+
+
+def get_all_available_time_blocks_bitmask(interviewers, duration, dt=None, unavailable_time_blocks_list=None,
+                                          days=6, limit=None) -> list[Slot]:
+    """
+    Bitmask version of get_all_available_time_blocks. The panel's busy blocks are counted into one array of cells,
+    the cells no interviewer is busy in are ANDed with the working hours and a sliding window finds every start where
+    the whole duration is free. Returns the same time blocks as get_all_available_time_blocks.
+    :param list[dict] interviewers: dict of interviewers
+    :param int duration: duration in minutes of interview
+    :param datetime dt: start date and time of interview week
+    :param list[list[Slot]] unavailable_time_blocks_list: list of lists of unavailable time blocks
+    :param int days: number of days in the horizon
+    :param int limit: only return the first limit time blocks
+    :returns: available time blocks for the interview [(start_minute, end_minute), ...]
+    """
+    interviewer_ids = [interviewer['id'] for interviewer in interviewers]
+    if not unavailable_time_blocks_list:
+        unavailable_time_blocks_list = get_time_blocks_from_busy_data(interviewer_ids, days=days)
+    if not dt:
+        dt = datetime.now(UTC)
+    start_datetime = dt + timedelta(days=1)
+    start_date = start_datetime.date()
+    origin = datetime.combine(start_date, time(0), tzinfo=UTC)
+    origin_minute = to_minutes(origin)
+    min_offset = to_minutes(
+        datetime.combine(start_date, set_time_to_nearest_half_hour(start_datetime.time()), tzinfo=UTC)
+    ) - origin_minute
+    working_hours = get_panel_working_hours(interviewers, start_date, days)
+    working_offsets = np.fromiter(
+        chain.from_iterable(working_hours), dtype=np.int64, count=2 * len(working_hours)
+    ) - origin_minute
+
+    starts, ends = get_unavailable_offsets(unavailable_time_blocks_list, origin_minute)
+    cell_minutes = get_cell_minutes(duration, np.concatenate([starts, ends, working_offsets]))
+    cells = days * MINUTES_PER_DAY // cell_minutes
+    window = duration // cell_minutes
+    if window <= 0 or window > cells:
+        return []
+
+    free = get_working_mask(working_offsets[0::2], working_offsets[1::2], min_offset, cell_minutes, cells)
+    free &= ~get_interval_mask(starts, ends, cell_minutes, cells)
+
+    busy_counts = np.concatenate([[0], np.cumsum(~free)])
+    window_free = (busy_counts[window:] - busy_counts[:-window]) == 0
+    window_free[np.arange(window_free.size) % (SLOT_MINUTES // cell_minutes) != 0] = False
+
+    starts = (np.flatnonzero(window_free)[:limit] * cell_minutes + origin_minute).tolist()
+    return [Slot(start, start + duration) for start in starts]
@@ -0,0 +1,47 @@
+from django.db import connection
+
+from interviews.helpers import get_possible_start_ranges
+from interviews.models import BusyBlock
+from interviews.slots import Slot
+
+AVAILABLE_TIME_BLOCKS_SQL = """
+SELECT slot.start_minute
+FROM unnest(%(first_starts)s::bigint[], %(last_starts)s::bigint[]) AS working(first_start, last_start)
+CROSS JOIN LATERAL generate_series(working.first_start, working.last_start, 30) AS slot(start_minute)
+WHERE NOT EXISTS (
+    SELECT 1 FROM {busy_block_table} busy
+    WHERE busy.interviewer_id = ANY(%(interviewer_ids)s)
+        AND busy.period && tstzrange(
+            to_timestamp(slot.start_minute * 60), to_timestamp((slot.start_minute + %(duration)s) * 60), '[)'
+        )
+)
+ORDER BY slot.start_minute
+LIMIT %(limit)s
+"""
+
+
+def get_all_available_time_blocks_db(interviewers, duration, dt=None, days=6, limit=None) -> list[Slot]:
+    """
+    Postgres version of get_all_available_time_blocks that runs as a single query against stored BusyBlocks.
+    Candidate slots are generated with generate_series over the start ranges of the panel's working hours and any slot
+    overlapping an interviewer's busy range is removed with an anti-join on the GiST index.
+    :param list[dict] interviewers: dict of interviewers
+    :param int duration: duration in minutes of interview
+    :param datetime dt: start date and time of interview week
+    :param int days: number of days in the horizon
+    :param int limit: only return the first limit time blocks
+    :returns: available time blocks for the interview [(start_minute, end_minute), ...]
+    """
+    start_ranges = get_possible_start_ranges(duration, dt=dt, days=days, interviewers=interviewers)
+    if not start_ranges:
+        return []
+    first_starts, last_starts = zip(*start_ranges)
+    with connection.cursor() as cursor:
+        cursor.execute(AVAILABLE_TIME_BLOCKS_SQL.format(busy_block_table=BusyBlock._meta.db_table), {
+            'duration': duration,
+            'first_starts': list(first_starts),
+            'last_starts': list(last_starts),
+            'interviewer_ids': [interviewer['id'] for interviewer in interviewers],
+            'limit': limit,
+        })
+        return [Slot(start, start + duration) for start, in cursor.fetchall()]
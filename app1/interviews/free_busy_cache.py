@@ -0,0 +1,281 @@
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime, UTC
+from functools import cache
+
+import redis
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+from global_use.redis_client import get_redis_client
+from interviews.panel_cache import panel_union_cache
+
+logger = logging.getLogger(__name__)
+
+# Factories of the free/busy providers selectable by name with FREE_BUSY_PROVIDER. A backend's module is only imported
+# the first time it is selected, so workers never load Faker, NumPy or httpx for providers they do not use. Factories
+# take no arguments, read their own settings and return a provider called as
+# provider(interviewer_ids, start_date=None, days=7) that returns free/busy data in the same order as interviewer_ids.
+FREE_BUSY_PROVIDERS = {
+    'mock': 'interviews.mock_availability.get_provider',
+    'synthetic': 'interviews.synthetic_availability.get_provider',
+    'directory': 'interviews.free_busy_files.get_provider',
+    'http': 'interviews.http_free_busy.get_provider',
+}
+
+
+class FreeBusyProviderError(Exception):
+    """Raised when a free/busy provider fails or does not answer within the timeout."""
+
+
+@cache
+def get_free_busy_provider_factory(name:str):
+    """
+    Imports the factory of a free/busy provider once per process.
+    :param name: key of FREE_BUSY_PROVIDERS or dotted path of a factory
+    :returns: factory returning the provider
+    :raises ImproperlyConfigured: if the provider can not be imported
+    """
+    try:
+        return import_string(FREE_BUSY_PROVIDERS.get(name, name))
+    except ImportError as e:
+        raise ImproperlyConfigured(f'Unknown free/busy provider {name!r}: {e}') from e
+
+
+def get_free_busy_provider():
+    """
+    Gets the free/busy provider configured by FREE_BUSY_PROVIDER. When it is not set seeded synthetic calendars are
+    used if FREE_BUSY_SYNTHETIC_SEED is set and mock_availability otherwise.
+    :returns: provider(interviewer_ids, start_date=None, days=7)
+    """
+    name = settings.FREE_BUSY_PROVIDER or ('synthetic' if settings.FREE_BUSY_SYNTHETIC_SEED is not None else 'mock')
+    return get_free_busy_provider_factory(name)()
+
+
+class FreeBusyCache:
+    """
+    Caches free/busy provider responses in Redis keyed by interviewer id and the start date of the week window. A
+    panel is read with a single MGET and only the interviewers that miss are fetched from the provider. Falls back to
+    the provider when Redis is not configured or unreachable. Providers are called as
+    provider(interviewer_ids, start_date=window_start) and return the week starting at window_start, defaults to
+    get_free_busy_provider. The interviewers' stored BusyBlocks, like busy block events and confirmed reservations the
+    provider does not know about, are added to what the provider returns.
+    """
+    def __init__(self, provider=None, client=None, ttl=None, key_prefix='free_busy', stored_busy_blocks=True):
+        self._provider = provider
+        self._client = client
+        self._ttl = ttl
+        self.key_prefix = key_prefix
+        self.stored_busy_blocks = stored_busy_blocks
+        # Busy data versions used when Redis is not configured or unreachable
+        self._local_versions = defaultdict(int)
+
+    @property
+    def provider(self):
+        return self._provider or get_free_busy_provider()
+
+    @property
+    def client(self) -> redis.Redis | None:
+        return self._client or get_redis_client()
+
+    @property
+    def ttl(self) -> int:
+        return self._ttl or settings.FREE_BUSY_CACHE_TTL
+
+    def get_key(self, interviewer_id, window_start) -> str:
+        """
+        Gets the Redis key of an interviewer's free/busy data for a week window.
+        :param int interviewer_id: interviewer id
+        :param date window_start: start date of the week window
+        :returns: Redis key
+        """
+        return f'{self.key_prefix}:{interviewer_id}:{window_start.isoformat()}'
+
+    def add_stored_busy_blocks(self, busy_data, interviewer_ids, window_start) -> list[dict]:
+        """
+        Adds the interviewers' stored BusyBlocks of the week window to free/busy data fetched from a provider.
+        :param list[dict] busy_data: free/busy data in the same order as interviewer_ids
+        :param list[int] interviewer_ids: list of interviewer ids
+        :param date window_start: start date of the week window
+        :returns: free/busy data in the same order as interviewer_ids [{'interviewerId': 1, 'busy': [...]}, ...]
+        """
+        if not self.stored_busy_blocks or not interviewer_ids:
+            return busy_data
+        from interviews.models import BusyBlock
+        stored_busy_data = BusyBlock.get_free_busy_data(interviewer_ids, start_date=window_start)
+        return [
+            {**data, 'busy': data.get('busy', []) + stored_data['busy']} if stored_data['busy'] else data
+            for data, stored_data in zip(busy_data, stored_busy_data)
+        ]
+
+    def fetch(self, interviewer_ids, window_start) -> list[dict]:
+        """
+        Fetches free/busy data from the provider and adds the interviewers' stored BusyBlocks of the week window.
+        :param list[int] interviewer_ids: list of interviewer ids
+        :param date window_start: start date of the week window
+        :returns: free/busy data in the same order as interviewer_ids [{'interviewerId': 1, 'busy': [...]}, ...]
+        """
+        busy_data = self.provider(interviewer_ids, start_date=window_start)
+        return self.add_stored_busy_blocks(busy_data, interviewer_ids, window_start)
+
+    def get_cached(self, interviewer_ids, window_start) -> list[dict | None] | None:
+        """
+        Reads the cached free/busy data of the given interviewers with a single MGET.
+        :param list[int] interviewer_ids: list of interviewer ids
+        :param date window_start: start date of the week window
+        :returns: free/busy data in the same order as interviewer_ids with None for misses, or None when Redis is not
+            configured or unreachable
+        """
+        client = self.client
+        if client is None or not interviewer_ids:
+            return None
+        keys = [self.get_key(interviewer_id, window_start) for interviewer_id in interviewer_ids]
+        try:
+            cached = client.mget(keys)
+        except redis.RedisError:
+            logger.warning('Free/busy cache unavailable, falling back to provider', exc_info=True)
+            return None
+        return [None if value is None else json.loads(value) for value in cached]
+
+    def store(self, window_start, fetched:dict, hits:int) -> None:
+        """
+        Caches free/busy data fetched after get_cached missed and counts the hits and misses.
+        :param date window_start: start date of the week window
+        :param fetched: free/busy data by interviewer id {1: {'interviewerId': 1, 'busy': [...]}, ...}
+        :param hits: number of interviewers get_cached found
+        """
+        client = self.client
+        if client is None:
+            return
+        try:
+            pipeline = client.pipeline(transaction=False)
+            for interviewer_id, data in fetched.items():
+                pipeline.set(self.get_key(interviewer_id, window_start), json.dumps(data), ex=self.ttl)
+            pipeline.incrby(f'{self.key_prefix}:stats:hits', hits)
+            pipeline.incrby(f'{self.key_prefix}:stats:misses', len(fetched))
+            pipeline.execute()
+        except redis.RedisError:
+            logger.warning('Free/busy cache unavailable, results not cached', exc_info=True)
+
+    def get_free_busy_data(self, interviewer_ids, window_start=None) -> list[dict]:
+        """
+        Gets free/busy data for the given interviewers from the cache and fetches all misses from the provider in one
+        call.
+        :param list[int] interviewer_ids: list of interviewer ids
+        :param date window_start: start date of the week window, defaults to today in UTC
+        :returns: free/busy data in the same order as interviewer_ids [{'interviewerId': 1, 'busy': [...]}, ...]
+        """
+        if not window_start:
+            window_start = datetime.now(UTC).date()
+        cached = self.get_cached(interviewer_ids, window_start)
+        if cached is None:
+            return self.fetch(interviewer_ids, window_start)
+        missing_ids = [interviewer_id for interviewer_id, data in zip(interviewer_ids, cached) if data is None]
+        fetched = dict(zip(missing_ids, self.fetch(missing_ids, window_start))) if missing_ids else {}
+        self.store(window_start, fetched, len(interviewer_ids) - len(missing_ids))
+        return [
+            fetched[interviewer_id] if data is None else data for interviewer_id, data in zip(interviewer_ids, cached)
+        ]
+
+    def invalidate(self, interviewer_ids, window_start=None) -> int:
+        """
+        Removes cached free/busy data for the given interviewers.
+        :param list[int] interviewer_ids: list of interviewer ids
+        :param date window_start: start date of the week window to remove, defaults to every cached window
+        :returns: number of cache entries removed
+        """
+        client = self.client
+        if client is None or not interviewer_ids:
+            return 0
+        try:
+            if window_start:
+                keys = [self.get_key(interviewer_id, window_start) for interviewer_id in interviewer_ids]
+            else:
+                keys = [
+                    key for interviewer_id in interviewer_ids
+                    for key in client.scan_iter(match=f'{self.key_prefix}:{interviewer_id}:*')
+                ]
+            return client.delete(*keys) if keys else 0
+        except redis.RedisError:
+            logger.warning('Free/busy cache unavailable, cached free/busy data not removed', exc_info=True)
+            return 0
+
+    def get_versions(self, interviewer_ids) -> list[int]:
+        """
+        Gets the busy data version of each interviewer, shared by every worker through Redis. A version only changes
+        when bump_versions is called for the interviewer.
+        :param list[int] interviewer_ids: list of interviewer ids
+        :returns: versions in the same order as interviewer_ids
+        """
+        client = self.client
+        if client is not None and interviewer_ids:
+            try:
+                versions = client.mget([f'{self.key_prefix}:version:{interviewer_id}' for interviewer_id in interviewer_ids])
+                return [int(version or 0) for version in versions]
+            except redis.RedisError:
+                logger.warning('Free/busy cache unavailable, using local busy data versions', exc_info=True)
+        return [self._local_versions[interviewer_id] for interviewer_id in interviewer_ids]
+
+    def bump_versions(self, interviewer_ids) -> None:
+        """
+        Moves the busy data version of each interviewer forward, call when their busy data changes.
+        :param list[int] interviewer_ids: list of interviewer ids
+        """
+        for interviewer_id in interviewer_ids:
+            self._local_versions[interviewer_id] += 1
+        client = self.client
+        if client is None or not interviewer_ids:
+            return
+        try:
+            pipeline = client.pipeline(transaction=False)
+            for interviewer_id in interviewer_ids:
+                pipeline.incr(f'{self.key_prefix}:version:{interviewer_id}')
+            pipeline.execute()
+        except redis.RedisError:
+            logger.warning('Free/busy cache unavailable, busy data versions not bumped', exc_info=True)
+
+    def get_stats(self) -> dict[str, int]:
+        """
+        Gets the cache hit and miss counters shared by every worker.
+        :returns: {'hits': hits, 'misses': misses}
+        """
+        client = self.client
+        if client is None:
+            return {'hits': 0, 'misses': 0}
+        hits, misses = client.mget([f'{self.key_prefix}:stats:hits', f'{self.key_prefix}:stats:misses'])
+        return {'hits': int(hits or 0), 'misses': int(misses or 0)}
+
+    def reset_stats(self) -> None:
+        """
+        Resets the cache hit and miss counters.
+        """
+        client = self.client
+        if client is not None:
+            client.delete(f'{self.key_prefix}:stats:hits', f'{self.key_prefix}:stats:misses')
+
+
+free_busy_cache = FreeBusyCache()
+
+
+def invalidate_free_busy_data(interviewer_ids, window_start=None) -> int:
+    """
+    Removes cached free/busy data and this process's cached panel unions for the given interviewers and bumps their
+    busy data versions so other workers' cached panel unions miss too, call when their calendars change.
+    :param list[int] interviewer_ids: list of interviewer ids
+    :param date window_start: start date of the week window to remove, defaults to every cached window
+    :returns: number of free/busy cache entries removed
+    """
+    panel_union_cache.invalidate(interviewer_ids, window_start=window_start)
+    free_busy_cache.bump_versions(interviewer_ids)
+    return free_busy_cache.invalidate(interviewer_ids, window_start=window_start)
+
+
+def get_busy_data_versions(interviewer_ids) -> list[int]:
+    """
+    Gets the busy data version of each interviewer, it changes every time their busy data is invalidated or imported.
+    :param list[int] interviewer_ids: list of interviewer ids
+    :returns: versions in the same order as interviewer_ids
+    """
+    return free_busy_cache.get_versions(interviewer_ids)
@@ -0,0 +1,314 @@
+import json
+import re
+from datetime import date, datetime, timedelta, UTC, time
+from functools import lru_cache
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from dateutil.rrule import rruleset, rrulestr
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from interviews.slots import Slot, time_block_to_slot, to_datetime, to_minutes
+
+ICS_DURATION = re.compile(r'^(?P<sign>[+-])?P(?:(?P<weeks>\d+)W)?(?:(?P<days>\d+)D)?'
+                          r'(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?$')
+
+
+def load_free_busy_json(path) -> list[dict]:
+    """
+    Loads a JSON free/busy dump in the same format get_free_busy_data returns.
+    :param str path: path of the JSON file
+    :returns: free/busy data [{'interviewerId': 1, 'busy': [{'start': '2025-01-22T10:00:00Z', 'end': ...}, ...]}, ...]
+    """
+    with open(path) as file:
+        data = json.load(file)
+    return data if isinstance(data, list) else [data]
+
+
+def load_free_busy_ics(path, interviewer_id=None) -> list[dict]:
+    """
+    Loads busy blocks from an ICS calendar using FREEBUSY properties of VFREEBUSY components and opaque VEVENTs.
+    :param str path: path of the ICS file
+    :param int interviewer_id: id of the interviewer the calendar belongs to, defaults to the file name (e.g. 12.ics)
+    :returns: free/busy data [{'interviewerId': 1, 'busy': [{'start': '2025-01-22T10:00:00Z', 'end': ...}, ...]}]
+    """
+    if interviewer_id is None:
+        interviewer_id = int(Path(path).stem)
+    with open(path) as file:
+        busy = parse_ics_busy_blocks(file.read())
+    return [{'interviewerId': interviewer_id, 'busy': busy}]
+
+
+def load_free_busy_file(path, interviewer_id=None) -> list[dict]:
+    """
+    Loads a JSON or ICS free/busy file based on its extension.
+    :param str path: path of the .json or .ics file
+    :param int interviewer_id: id of the interviewer an ICS calendar belongs to
+    :returns: free/busy data [{'interviewerId': 1, 'busy': [{'start': '2025-01-22T10:00:00Z', 'end': ...}, ...]}, ...]
+    """
+    if Path(path).suffix.lower() == '.ics':
+        return load_free_busy_ics(path, interviewer_id=interviewer_id)
+    return load_free_busy_json(path)
+
+
+def parse_ics_busy_blocks(text, since:datetime=None, until:datetime=None) -> list[dict[str, str]]:
+    """
+    Parses busy blocks out of ICS text. Recurring events are expanded in their own time zone, honouring RDATE, EXDATE
+    and instances moved or cancelled with RECURRENCE-ID, into the occurrences overlapping since to until.
+    :param str text: ICS calendar
+    :param datetime since: start of the window recurring events are expanded in, defaults to today in UTC
+    :param datetime until: end of the window recurring events are expanded in, defaults to
+    INTERVIEWS_MAX_HORIZON_DAYS after since
+    :returns: busy blocks [{'start': '2025-01-22T10:00:00Z', 'end': '2025-01-22T11:00:00Z'}, ...]
+    :raises ValueError: if a recurrence rule is invalid
+    """
+    if since is None:
+        since = datetime.combine(datetime.now(UTC).date(), time(0), tzinfo=UTC)
+    if until is None:
+        until = since + timedelta(days=settings.INTERVIEWS_MAX_HORIZON_DAYS + 1)
+    busy, events = [], []
+    event = None
+    # Open components, so properties of a component nested in an event such as a VALARM's DURATION are not the event's
+    components = []
+    for name, params, value in iter_ics_properties(text):
+        if name == 'BEGIN':
+            components.append(value.upper())
+            if components[-1] == 'VEVENT':
+                event = {'RDATE': [], 'EXDATE': []}
+        elif name == 'END':
+            if components and components.pop() == 'VEVENT' and event is not None:
+                if event.get('DTSTART'):
+                    events.append(event)
+                event = None
+        elif event is not None:
+            if components[-1] != 'VEVENT':
+                continue
+            if name in ('DTSTART', 'DTEND', 'RECURRENCE-ID'):
+                event[name] = parse_ics_datetime(value, params)
+                if name == 'DTSTART':
+                    event['all_day'] = params.get('VALUE') == 'DATE' or len(value) == 8
+                    event['TZID'] = params.get('TZID', '').strip('"') or None
+                    event['floating'] = not value.endswith('Z') and not event['TZID']
+            elif name == 'DURATION':
+                event[name] = parse_ics_duration(value)
+            elif name in ('TRANSP', 'STATUS'):
+                event[name] = value.upper()
+            elif name in ('UID', 'RRULE'):
+                event[name] = value
+            elif name in ('RDATE', 'EXDATE'):
+                # RDATE periods start/end only need their start, the duration comes from the event
+                event[name].extend(parse_ics_datetime(period.split('/')[0], params) for period in value.split(','))
+        elif name == 'FREEBUSY' and params.get('FBTYPE', 'BUSY').upper().startswith('BUSY'):
+            for period in value.split(','):
+                start, end = period.split('/')
+                start = parse_ics_datetime(start, params)
+                end = start + parse_ics_duration(end) if end.upper().startswith(('P', '+P', '-P')) else parse_ics_datetime(end, params)
+                busy.append({'start': to_iso(start), 'end': to_iso(end)})
+
+    # Instances of a recurring event moved or cancelled by another VEVENT with the same UID
+    overridden = {(event.get('UID'), event['RECURRENCE-ID']) for event in events if event.get('RECURRENCE-ID')}
+    for event in events:
+        if event.get('TRANSP') == 'TRANSPARENT' or event.get('STATUS') == 'CANCELLED':
+            continue
+        start = event['DTSTART']
+        if event.get('DTEND'):
+            end = event['DTEND']
+        elif event.get('DURATION'):
+            end = start + event['DURATION']
+        else:
+            end = start + timedelta(days=1) if event['all_day'] else start
+        if end <= start:
+            continue
+        if (event.get('RRULE') or event['RDATE']) and not event.get('RECURRENCE-ID'):
+            for occurrence in iter_ics_occurrences(event, since - (end - start), until):
+                if (event.get('UID'), occurrence) not in overridden:
+                    busy.append({'start': to_iso(occurrence), 'end': to_iso(occurrence + (end - start))})
+        else:
+            busy.append({'start': to_iso(start), 'end': to_iso(end)})
+    return busy
+
+
+def iter_ics_occurrences(event:dict, since:datetime, until:datetime):
+    """
+    Expands a recurring VEVENT into the starts of its occurrences. Rules run on the event's wall clock, so a weekly
+    meeting at 9:00 in New York stays at 9:00 across daylight saving time changes.
+    :param event: parsed VEVENT with DTSTART, RRULE, RDATE and EXDATE in UTC
+    :param since: only occurrences starting after since
+    :param until: only occurrences starting before until
+    :returns: generator of UTC datetimes
+    :raises ValueError: if the recurrence rule is invalid
+    """
+    # Floating and all-day events recur without a time zone and their UNTIL has none either
+    zone = None if event['floating'] else ZoneInfo(event['TZID']) if event['TZID'] else UTC
+    start = to_wall_clock(event['DTSTART'], zone)
+    occurrences = rruleset()
+    if event.get('RRULE'):
+        try:
+            occurrences.rrule(rrulestr(event['RRULE'], dtstart=start))
+        except (ValueError, TypeError) as e:
+            raise ValueError(f'Invalid RRULE {event["RRULE"]}: {e}') from e
+    occurrences.rdate(start)
+    for rdate in event['RDATE']:
+        occurrences.rdate(to_wall_clock(rdate, zone))
+    for exdate in event['EXDATE']:
+        occurrences.exdate(to_wall_clock(exdate, zone))
+    for occurrence in occurrences.between(to_wall_clock(since, zone), to_wall_clock(until, zone)):
+        yield occurrence.replace(tzinfo=UTC) if zone is None else occurrence.astimezone(UTC)
+
+
+def to_wall_clock(dt:datetime, zone) -> datetime:
+    """
+    Converts a UTC datetime to the wall clock recurrence rules run on.
+    :param dt: tz-aware datetime
+    :param ZoneInfo zone: time zone of the event, None for floating times which are kept as naive UTC
+    :returns: datetime in zone or naive UTC datetime
+    """
+    return dt.astimezone(UTC).replace(tzinfo=None) if zone is None else dt.astimezone(zone)
+
+
+def iter_ics_properties(text):
+    """
+    Unfolds ICS lines and yields each property.
+    :param str text: ICS calendar
+    :returns: generator of (name, params, value)
+    """
+    lines = []
+    for line in text.splitlines():
+        if line[:1] in (' ', '\t') and lines:
+            lines[-1] += line[1:]
+        elif line:
+            lines.append(line)
+    for line in lines:
+        key, _, value = line.partition(':')
+        name, *params = key.split(';')
+        params = dict(param.split('=', 1) if '=' in param else (param, '') for param in params)
+        yield name.upper(), {param_name.upper(): param_value for param_name, param_value in params.items()}, value.strip()
+
+
+def parse_ics_datetime(value, params=None) -> datetime:
+    """
+    Parses an ICS DATE or DATE-TIME value to a UTC datetime. Floating times are treated as UTC.
+    :param str value: ICS value Ex: 20250122T100000Z, 20250122T100000, 20250122
+    :param dict params: property parameters, TZID is used for local times
+    :returns: UTC datetime
+    """
+    params = params or {}
+    if len(value) == 8:
+        return datetime.combine(datetime.strptime(value, '%Y%m%d').date(), time(0), tzinfo=UTC)
+    dt = datetime.strptime(value.rstrip('Z'), '%Y%m%dT%H%M%S')
+    if not value.endswith('Z') and params.get('TZID'):
+        return dt.replace(tzinfo=ZoneInfo(params['TZID'].strip('"'))).astimezone(UTC)
+    return dt.replace(tzinfo=UTC)
+
+
+def parse_ics_duration(value) -> timedelta:
+    """
+    Parses an ICS DURATION value.
+    :param str value: ICS duration Ex: PT1H30M, P1D
+    :returns: timedelta of the duration
+    """
+    match = ICS_DURATION.match(value.upper())
+    if not match:
+        raise ValueError(f'Invalid ICS duration: {value}')
+    duration = timedelta(**{
+        unit: int(match.group(unit) or 0) for unit in ('weeks', 'days', 'hours', 'minutes', 'seconds')
+    })
+    return -duration if match.group('sign') == '-' else duration
+
+
+def to_iso(dt) -> str:
+    """
+    Formats a UTC datetime the way free/busy providers do.
+    :param datetime dt: UTC datetime
+    :returns: ISO 8601 string Ex: 2025-01-22T10:00:00Z
+    """
+    return dt.astimezone(UTC).replace(tzinfo=None).isoformat() + 'Z'
+
+
+def parse_busy_datetime(value) -> datetime:
+    """
+    Parses the start or end of a busy block, times without an offset are treated as UTC.
+    :param str value: ISO 8601 string Ex: 2025-01-22T10:00:00Z
+    :returns: tz-aware datetime
+    """
+    dt = datetime.fromisoformat(value)
+    return dt if dt.tzinfo else dt.replace(tzinfo=UTC)
+
+
+@lru_cache(maxsize=1024)
+def load_busy_slots(path:str, mtime_ns:int, interviewer_id:int, today:date) -> tuple[Slot, ...]:
+    """
+    Loads the busy blocks of an interviewer's free/busy file, cached until the file's modification time or the day
+    changes.
+    :param path: path of the .json or .ics file
+    :param mtime_ns: modification time of the file, part of the cache key
+    :param interviewer_id: id of the interviewer the file belongs to
+    :param today: current day in UTC, part of the cache key as recurring ICS events are expanded from it
+    :returns: sorted busy time blocks ((start_minute, end_minute), ...)
+    """
+    return tuple(sorted(
+        time_block_to_slot(parse_busy_datetime(block['start']), parse_busy_datetime(block['end']))
+        for data in load_free_busy_file(path, interviewer_id=interviewer_id)
+        if data.get('interviewerId', interviewer_id) == interviewer_id
+        for block in data['busy']
+    ))
+
+
+class FreeBusyDirectoryProvider:
+    """
+    Free/busy provider reading each interviewer's calendar from {directory}/{id}.json or {directory}/{id}.ics, like
+    the files written by a calendar sync job. Files are only parsed again when they change and interviewers without a
+    file are free.
+    """
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def get_busy_slots(self, interviewer_id:int) -> tuple[Slot, ...]:
+        """
+        Gets the busy blocks of an interviewer's file.
+        :param interviewer_id: interviewer id
+        :returns: sorted busy time blocks ((start_minute, end_minute), ...), empty without a file
+        """
+        for suffix in ('.json', '.ics'):
+            path = self.directory / f'{interviewer_id}{suffix}'
+            try:
+                mtime_ns = path.stat().st_mtime_ns
+            except FileNotFoundError:
+                continue
+            return load_busy_slots(str(path), mtime_ns, interviewer_id, datetime.now(UTC).date())
+        return ()
+
+    def __call__(self, interviewer_ids, start_date=None, days:int=7) -> list[dict]:
+        """
+        Gets the busy blocks of each interviewer overlapping the days starting at start_date.
+        :param list[int] interviewer_ids: list of interviewer ids
+        :param date start_date: first day, defaults to today in UTC
+        :param days: number of days
+        :returns: free/busy data [{'interviewerId': 1, 'busy': [{'start': '2025-01-22T10:00:00Z', 'end': ...}, ...]}, ...]
+        """
+        if not start_date:
+            start_date = datetime.now(UTC).date()
+        window_start = to_minutes(datetime.combine(start_date, time(0), tzinfo=UTC))
+        window_end = window_start + days * 24 * 60
+        return [
+            {
+                'interviewerId': interviewer_id,
+                'busy': [
+                    {'start': to_iso(to_datetime(start)), 'end': to_iso(to_datetime(end))}
+                    for start, end in self.get_busy_slots(interviewer_id) if start < window_end and end > window_start
+                ]
+            }
+            for interviewer_id in interviewer_ids
+        ]
+
+
+def get_provider() -> FreeBusyDirectoryProvider:
+    """
+    Gets the free/busy provider reading FREE_BUSY_PROVIDER_DIRECTORY, selected with FREE_BUSY_PROVIDER=directory.
+    :returns: FreeBusyDirectoryProvider
+    :raises ImproperlyConfigured: if FREE_BUSY_PROVIDER_DIRECTORY is not set
+    """
+    if not settings.FREE_BUSY_PROVIDER_DIRECTORY:
+        raise ImproperlyConfigured('FREE_BUSY_PROVIDER=directory needs FREE_BUSY_PROVIDER_DIRECTORY')
+    return FreeBusyDirectoryProvider(settings.FREE_BUSY_PROVIDER_DIRECTORY)
@@ -1,6 +1,18 @@
-from datetime import datetime, timedelta, UTC, time
+import heapq
+from itertools import dropwhile, islice
+from datetime import date, datetime, timedelta, UTC, time
+
+from django.conf import settings
+
+from interviews.free_busy_cache import free_busy_cache
+from interviews.panel_cache import panel_union_cache
+from interviews.slots import Slot, time_block_to_slot, to_iso, to_minutes
+from interviews.working_hours import get_panel_working_hours, get_working_hours_key
+
+DEFAULT_HORIZON_DAYS = 6
+FREE_BUSY_WINDOW_DAYS = 7
+MINUTES_PER_DAY = 24 * 60
 
-from interviews.mock_availability import get_free_busy_data
 
 def set_time_to_nearest_half_hour(dt_time) -> time:
     """
@@ -27,100 +39,363 @@ def set_time_to_nearest_half_hour(dt_time) -> time:
     return time(hour=hour, minute=minute, second=0)
 
 
-def get_all_possible_time_blocks(duration, dt=None) -> list[dict[str, datetime]]:
+def time_block_to_json(time_block) -> dict[str, str]:
+    """
+    Converts a time block to UTC ISO 8601 strings the same way JsonResponse encodes them. Only done at the edge,
+    everything before it passes Slots.
+    :param Slot time_block: time block (start_minute, end_minute)
+    :returns: time block {'start': '2025-01-22T10:00:00Z', 'end': '2025-01-22T11:00:00Z'}
+    """
+    return {'start': to_iso(time_block[0]), 'end': to_iso(time_block[1])}
+
+
+def time_blocks_to_json(time_blocks) -> list[dict[str, str]]:
+    """
+    Converts time blocks to UTC ISO 8601 strings the same way JsonResponse encodes them.
+    :param list[Slot] time_blocks: list of time blocks [(start_minute, end_minute), ...]
+    :returns: list of time blocks [{'start': '2025-01-22T10:00:00Z', 'end': '2025-01-22T11:00:00Z'}, ...]
+    """
+    return [time_block_to_json(time_block) for time_block in time_blocks]
+
+
+def time_blocks_from_json(time_blocks) -> list[Slot]:
+    """
+    Converts time blocks with ISO 8601 strings to Slots, partial minutes round outward.
+    :param list[dict[str, str]] time_blocks: list of time blocks [{'start': '2025-01-22T10:00:00Z', 'end': '2025-01-22T11:00:00Z'}, ...]
+    :returns: list of time blocks [(start_minute, end_minute), ...]
+    """
+    return [
+        time_block_to_slot(datetime.fromisoformat(time_block['start']), datetime.fromisoformat(time_block['end']))
+        for time_block in time_blocks
+    ]
+
+
+def get_all_possible_time_blocks(duration, dt=None, days=DEFAULT_HORIZON_DAYS, interviewers=None) -> list[Slot]:
     """
     Gets all possible time blocks for a given interview duration for the next week excluding Saturdays and Sundays.
     :param int duration: duration in minutes of interview
     :param datetime dt: start date and time of interview week
-    :returns: blocks of available times for the interview [{'start': start_datetime, 'end': end_datetime}, ...]
+    :param int days: number of days in the horizon, defaults to the rest of the mock_availability week
+    :param list[dict] interviewers: dict of interviewers whose working hours the time blocks must fall in
+    :returns: blocks of available times for the interview [(start_minute, end_minute), ...]
     Requirements:
         Slots must be exactly the duration minutes of the template
         Slots must begin on hour or half-hour marks (e.g., 10:00, 10:30)
         No slot may begin less than 24 hours in the future
         All times must be in UTC in ISO 8601 format
-        Must exclude Saturday and Sunday.
-        Must start and end between 9AM-5PM (9-17) UTC based on mock_availability
-        Must match date range of 7 days based on mock_availability
+        Must exclude Saturday and Sunday in each interviewer's time zone.
+        Must start and end within every interviewer's working hours, 9AM-5PM (9-17) UTC by default
+        Must match date range of 7 days based on mock_availability unless days is given
+    """
+    return list(iter_possible_time_blocks(duration, dt=dt, days=days, interviewers=interviewers))
+
+
+def get_possible_start_ranges(duration, dt=None, days=DEFAULT_HORIZON_DAYS, interviewers=None) -> list[tuple[int, int]]:
+    """
+    Gets the first and last start of the possible time blocks in each stretch of the panel's working hours, every half
+    hour in between is a possible start.
+    :param int duration: duration in minutes of interview
+    :param datetime dt: start date and time of interview week
+    :param int days: number of days in the horizon
+    :param list[dict] interviewers: dict of interviewers whose working hours the time blocks must fall in
+    :returns: list of (first_start_minute, last_start_minute)
     """
     if not dt:
         dt = datetime.now(UTC)
     start_datetime = dt + timedelta(days=1)
     start_date = start_datetime.date()
-    start_time = set_time_to_nearest_half_hour(start_datetime.time())
-    min_datetime = max(datetime.combine(start_date, start_time, tzinfo=UTC), datetime.combine(start_date, time(9), tzinfo=UTC))
-    max_datetime = datetime.combine(start_date, time(17), tzinfo=UTC)
-    time_blocks = []
-    for day in range(6):
-        if start_date.weekday() < 5:
-            while min_datetime < max_datetime:
-                end = min_datetime + timedelta(minutes=duration)
-                if end <= max_datetime:
-                    time_blocks.append({'start': min_datetime, 'end': end})
-                min_datetime += timedelta(minutes=30)
-        start_date += timedelta(days=1)
-        min_datetime = datetime.combine(start_date, time(9), tzinfo=UTC)
-        max_datetime += timedelta(days=1)
-    return time_blocks
-
-
-def get_time_blocks_from_busy_data(interviewers) -> list[list[dict[str, datetime]]]:
-    """
-    Gets all unavailable time blocks for the given interviewers.
+    min_minute = to_minutes(
+        datetime.combine(start_date, set_time_to_nearest_half_hour(start_datetime.time()), tzinfo=UTC)
+    )
+    start_ranges = []
+    for work_start, work_end in get_panel_working_hours(interviewers or [], start_date, days):
+        first_start = max(work_start, min_minute)
+        first_start += -first_start % 30
+        last_start = work_end - duration
+        if first_start <= last_start:
+            start_ranges.append((first_start, last_start - (last_start - first_start) % 30))
+    return start_ranges
+
+
+def iter_possible_time_blocks(duration, dt=None, days=DEFAULT_HORIZON_DAYS, interviewers=None):
+    """
+    Lazily generates the possible time blocks of get_all_possible_time_blocks in time order so callers that only need
+    the first few can stop early.
+    :param int duration: duration in minutes of interview
+    :param datetime dt: start date and time of interview week
+    :param int days: number of days in the horizon
+    :param list[dict] interviewers: dict of interviewers whose working hours the time blocks must fall in
+    :returns: generator of time blocks (start_minute, end_minute)
+    """
+    for first_start, last_start in get_possible_start_ranges(duration, dt=dt, days=days, interviewers=interviewers):
+        for start in range(first_start, last_start + 1, 30):
+            yield Slot(start, start + duration)
+
+
+def get_time_blocks_from_busy_data(interviewers, days=DEFAULT_HORIZON_DAYS, provider=None) -> list[list[Slot]]:
+    """
+    Gets all unavailable time blocks for the given interviewers. Busy data is read through the free/busy cache one
+    week window at a time until the horizon is covered.
     :param list[int] interviewers: list of interviewer ids
-    :returns: unavailable time blocks for the interview [{'start': start_datetime, 'end': end_datetime}, ...]
+    :param int days: number of days in the horizon after today
+    :param provider: free/busy provider called as provider(interviewer_ids, start_date=window_start) instead of the
+    cache, used by benchmarks and load tests
+    :returns: unavailable time blocks for the interview [(start_minute, end_minute), ...]
+    """
+    busy_data_windows = [
+        provider(interviewers, start_date=window_start) if provider
+        else free_busy_cache.get_free_busy_data(interviewers, window_start=window_start)
+        for window_start in get_horizon_window_starts(days)
+    ]
+    return get_time_blocks_from_busy_data_windows(busy_data_windows)
+
+
+def get_horizon_window_starts(days=DEFAULT_HORIZON_DAYS) -> list[date]:
+    """
+    Gets the start dates of the free/busy week windows that cover the horizon.
+    :param int days: number of days in the horizon after today
+    :returns: list of window start dates
+    """
+    window_start = datetime.now(UTC).date()
+    return [
+        window_start + timedelta(days=FREE_BUSY_WINDOW_DAYS * week)
+        for week in range(days // FREE_BUSY_WINDOW_DAYS + 1)
+    ]
+
+
+def get_time_blocks_from_busy_data_windows(busy_data_windows) -> list[list[Slot]]:
+    """
+    Parses free/busy data of one or more week windows into unavailable time blocks per interviewer.
+    :param list[list[dict]] busy_data_windows: free/busy data of each window in the same interviewer order
+    :returns: unavailable time blocks per interviewer sorted by start and end
     """
-    busy_data = get_free_busy_data(interviewers)
     unavailable_time_blocks = []
-    for data in busy_data:
+    for busy_data in zip(*busy_data_windows):
         slots = []
-        for slot in data.get('busy', []):
-            slots.append({'start': datetime.fromisoformat(slot['start']), 'end': datetime.fromisoformat(slot['end'])})
-        unavailable_time_blocks.append(sorted(slots, key=lambda x: (x['start'], x['end'])))
+        for data in busy_data:
+            slots.extend(time_blocks_from_json(data.get('busy', [])))
+        unavailable_time_blocks.append(sorted(slots))
     return unavailable_time_blocks
 
 
-def get_available_from_unavailable_time_block(possible_time_blocks, unavailable_time_blocks) -> list[dict[str, datetime]]:
+def get_time_blocks_by_interviewer(interviewers, days=DEFAULT_HORIZON_DAYS) -> dict[int, list[Slot]]:
+    """
+    Gets all unavailable time blocks for the given interviewers keyed by interviewer id.
+    :param list[int] interviewers: list of interviewer ids
+    :param int days: number of days in the horizon after today
+    :returns: unavailable time blocks by interviewer id {id: [(start_minute, end_minute), ...]}
+    """
+    return dict(zip(interviewers, get_time_blocks_from_busy_data(interviewers, days=days)))
+
+
+def get_panel_unavailable_time_blocks(interviewers, days=DEFAULT_HORIZON_DAYS) -> list[Slot]:
+    """
+    Gets the merged unavailable time blocks of a panel. Each week window's union is read from the panel union cache and
+    only the windows that miss are fetched and merged, so templates sharing a panel only pay for the window scan.
+    Cached unions are checked against the busy data versions every worker shares.
+    :param list[int] interviewers: list of interviewer ids
+    :param int days: number of days in the horizon after today
+    :returns: sorted non-overlapping unavailable time blocks [(start_minute, end_minute), ...]
     """
-    Removes unavailable time ranges from possible time blocks and returns that as a list of dicts
-    :param list[dict[str, datetime]] possible_time_blocks: list of available time blocks [{'start': start_datetime, 'end': end_datetime}, ...]
-    :param list[dict[str, datetime]] unavailable_time_blocks: list of unavailable time blocks [{'start': start_datetime, 'end': end_datetime}, ...]
-    :returns: list of available time blocks [{'start': start_datetime, 'end': end_datetime}, ...]
+    panel = sorted(set(interviewers))
+    # Read before the busy data so a change made while the union is computed makes the next read miss
+    versions = free_busy_cache.get_versions(panel)
+    unions = []
+    for window_start in get_horizon_window_starts(days):
+        union = panel_union_cache.get(panel, window_start, versions)
+        if union is None:
+            busy_data = free_busy_cache.get_free_busy_data(panel, window_start=window_start)
+            union = merge_unavailable_time_blocks(get_time_blocks_from_busy_data_windows([busy_data]))
+            panel_union_cache.set(panel, window_start, union, versions)
+        unions.append(union)
+    # Blocks running past the end of a window can overlap the next window's first blocks
+    return merge_unavailable_time_blocks(unions)
+
+
+def merge_unavailable_time_blocks(unavailable_time_blocks_list) -> list[Slot]:
+    """
+    Merges each interviewer's sorted unavailable time blocks in a single heap merge pass and coalesces overlapping or
+    touching blocks into one sorted union of unavailable time blocks.
+    :param list[list[Slot]] unavailable_time_blocks_list: list of lists of unavailable time blocks each sorted
+    :returns: sorted non-overlapping unavailable time blocks [(start_minute, end_minute), ...]
+    """
+    merged_time_blocks = []
+    for time_block in heapq.merge(*unavailable_time_blocks_list):
+        if merged_time_blocks and time_block[0] <= merged_time_blocks[-1][1]:
+            if time_block[1] > merged_time_blocks[-1][1]:
+                merged_time_blocks[-1] = Slot(merged_time_blocks[-1][0], time_block[1])
+        else:
+            merged_time_blocks.append(time_block)
+    return merged_time_blocks
+
+
+def get_available_from_unavailable_time_block(possible_time_blocks, unavailable_time_blocks) -> list[Slot]:
+    """
+    Removes unavailable time ranges from possible time blocks and returns that as a list of Slots
+    :param list[Slot] possible_time_blocks: list of available time blocks [(start_minute, end_minute), ...]
+    :param list[Slot] unavailable_time_blocks: list of unavailable time blocks [(start_minute, end_minute), ...]
+    :returns: list of available time blocks [(start_minute, end_minute), ...]
+    """
+    return list(iter_available_from_unavailable_time_block(possible_time_blocks, unavailable_time_blocks))
+
+
+def iter_available_from_unavailable_time_block(possible_time_blocks, unavailable_time_blocks):
+    """
+    Lazily removes unavailable time ranges from possible time blocks so the possible time blocks can be a generator.
+    :param iterable[Slot] possible_time_blocks: time blocks sorted by start [(start_minute, end_minute), ...]
+    :param list[Slot] unavailable_time_blocks: list of unavailable time blocks [(start_minute, end_minute), ...]
+    :returns: generator of available time blocks (start_minute, end_minute)
     """
-    possible_index = 0
-    possible_length = len(possible_time_blocks)
     unavailable_index = 0
     unavailable_length = len(unavailable_time_blocks)
-    available_time_blocks = []
-    while possible_index < possible_length:
-        if unavailable_index >= unavailable_length:
-            available_time_blocks.append(possible_time_blocks[possible_index])
-            possible_index += 1
-        elif possible_time_blocks[possible_index]['end'] <= unavailable_time_blocks[unavailable_index]['start']:
-            available_time_blocks.append(possible_time_blocks[possible_index])
-            possible_index += 1
-        elif possible_time_blocks[possible_index]['start'] >= unavailable_time_blocks[unavailable_index]['end']:
+    for possible_time_block in possible_time_blocks:
+        start, end = possible_time_block
+        while unavailable_index < unavailable_length and start >= unavailable_time_blocks[unavailable_index][1]:
             unavailable_index += 1
-        else:
-            possible_index += 1
-    return available_time_blocks
+        if unavailable_index >= unavailable_length or end <= unavailable_time_blocks[unavailable_index][0]:
+            yield possible_time_block
 
 
-def get_all_available_time_blocks(interviewers, duration, dt=None, unavailable_time_blocks_list=None) -> list[dict[str, datetime]]:
+def iter_available_time_blocks(interviewers, duration, dt=None, unavailable_time_blocks_list=None,
+                               days=DEFAULT_HORIZON_DAYS, after=None):
+    """
+    Lazily generates the available time blocks for the given interviewers in time order. Used to page or stream
+    long horizons without building the whole list.
+    :param list[dict] interviewers: dict of interviewers
+    :param int duration: duration in minutes of interview
+    :param datetime dt: start date and time of interview week
+    :param list[list[Slot]] unavailable_time_blocks_list: list of lists of unavailable time blocks each sorted
+    :param int days: number of days in the horizon
+    :param datetime after: only generate time blocks starting after this cursor
+    :returns: generator of available time blocks (start_minute, end_minute)
+    """
+    if unavailable_time_blocks_list:
+        unavailable_time_blocks = merge_unavailable_time_blocks(unavailable_time_blocks_list)
+    else:
+        unavailable_time_blocks = get_panel_unavailable_time_blocks(
+            [interviewer['id'] for interviewer in interviewers], days=days
+        )
+    possible_time_blocks = iter_possible_time_blocks(duration, dt=dt, days=days, interviewers=interviewers)
+    if after:
+        after_minute = to_minutes(after)
+        possible_time_blocks = dropwhile(lambda x: x[0] <= after_minute, possible_time_blocks)
+    return iter_available_from_unavailable_time_block(possible_time_blocks, unavailable_time_blocks)
+
+
+def get_all_available_time_blocks(interviewers, duration, dt=None, unavailable_time_blocks_list=None, backend=None,
+                                  limit=None, days=DEFAULT_HORIZON_DAYS) -> list[Slot]:
     """
     Gets all possible time blocks for a given interview duration for the next week for the given interviewers.
     :param list[dict] interviewers: dict of interviewers
     :param int duration: duration in minutes of interview
     :param datetime dt: start date and time of interview week
-    :param list[list[dict[str, datetime]]] unavailable_time_blocks_list: list of lists of unavailable time blocks
-    :returns: available time blocks for the interview [{'start': start_datetime, 'end': end_datetime}, ...]
+    :param list[list[Slot]] unavailable_time_blocks_list: list of lists of unavailable time blocks each sorted
+    :param str backend: 'python' merges busy data in Python, 'bitmask' uses NumPy bitmasks and 'postgres' runs one
+    query against stored BusyBlocks, defaults to INTERVIEWS_AVAILABILITY_BACKEND
+    :param int limit: only return the first limit time blocks, candidates stop being generated once they are found
+    :param int days: number of days in the horizon
+    :returns: available time blocks for the interview [(start_minute, end_minute), ...]
     Requirements:
         All interviewers must be available for the full slot duration
         All times must be in UTC in ISO 8601 format
     """
-    interviewer_ids = [interviewer['id'] for interviewer in interviewers]
-    if not unavailable_time_blocks_list:
-        unavailable_time_blocks_list = get_time_blocks_from_busy_data(interviewer_ids)
-    all_possible_time_blocks = get_all_possible_time_blocks(duration, dt=dt)
-    for unavailable_time_block in unavailable_time_blocks_list:
-        all_possible_time_blocks = get_available_from_unavailable_time_block(all_possible_time_blocks, unavailable_time_block)
-    return all_possible_time_blocks
+    backend = backend or settings.INTERVIEWS_AVAILABILITY_BACKEND
+    if backend == 'postgres' and not unavailable_time_blocks_list:
+        from interviews.db_slots import get_all_available_time_blocks_db
+        return get_all_available_time_blocks_db(interviewers, duration, dt=dt, days=days, limit=limit)
+    if backend == 'bitmask':
+        from interviews.bitmask import get_all_available_time_blocks_bitmask
+        if not unavailable_time_blocks_list:
+            # The panel's union masks the same cells as every member's busy blocks
+            unavailable_time_blocks_list = [get_panel_unavailable_time_blocks(
+                [interviewer['id'] for interviewer in interviewers], days=days
+            )]
+        return get_all_available_time_blocks_bitmask(
+            interviewers, duration, dt=dt, unavailable_time_blocks_list=unavailable_time_blocks_list, days=days,
+            limit=limit
+        )
+    return list(islice(
+        iter_available_time_blocks(
+            interviewers, duration, dt=dt, unavailable_time_blocks_list=unavailable_time_blocks_list, days=days
+        ),
+        limit
+    ))
+
+
+def get_batch_available_time_blocks(panels, dt=None, unavailable_time_blocks_by_interviewer=None) -> list[list[Slot]]:
+    """
+    Gets all available time blocks for many interviewer panels at once. Busy data is fetched once for every
+    interviewer across the panels, possible time blocks are generated once per duration and set of working hours and
+    busy unions are merged once per distinct panel.
+    :param list[dict] panels: list of panels [{'interviewers': [{'id': 1}, ...], 'duration': 60}, ...]
+    :param datetime dt: start date and time of interview week
+    :param dict[int, list[Slot]] unavailable_time_blocks_by_interviewer: unavailable time blocks by interviewer id
+    each sorted
+    :returns: available time blocks for each panel in the same order as panels
+    """
+    if not dt:
+        dt = datetime.now(UTC)
+    if unavailable_time_blocks_by_interviewer is None:
+        interviewer_ids = sorted({interviewer['id'] for panel in panels for interviewer in panel['interviewers']})
+        unavailable_time_blocks_by_interviewer = get_time_blocks_by_interviewer(interviewer_ids)
+    possible_time_blocks_by_key = {}
+    unavailable_time_blocks_by_panel = {}
+    available_time_blocks_list = []
+    for panel in panels:
+        duration = panel['duration']
+        possible_key = (duration, frozenset(get_working_hours_key(interviewer) for interviewer in panel['interviewers']))
+        if possible_key not in possible_time_blocks_by_key:
+            possible_time_blocks_by_key[possible_key] = get_all_possible_time_blocks(
+                duration, dt=dt, interviewers=panel['interviewers']
+            )
+        panel_key = tuple(sorted({interviewer['id'] for interviewer in panel['interviewers']}))
+        if panel_key not in unavailable_time_blocks_by_panel:
+            unavailable_time_blocks_by_panel[panel_key] = merge_unavailable_time_blocks(
+                [unavailable_time_blocks_by_interviewer.get(interviewer_id, []) for interviewer_id in panel_key]
+            )
+        available_time_blocks_list.append(get_available_from_unavailable_time_block(
+            possible_time_blocks_by_key[possible_key], unavailable_time_blocks_by_panel[panel_key]
+        ))
+    return available_time_blocks_list
+
+
+def get_overlapping_time_blocks(time_blocks, ranges) -> list[Slot]:
+    """
+    Gets the time blocks that overlap any of the given ranges.
+    :param list[Slot] time_blocks: list of time blocks [(start_minute, end_minute), ...]
+    :param list[Slot] ranges: list of ranges [(start_minute, end_minute), ...]
+    :returns: time blocks overlapping at least one range
+    """
+    return [
+        time_block for time_block in time_blocks
+        if any(time_block[0] < _range[1] and _range[0] < time_block[1] for _range in ranges)
+    ]
+
+
+def update_available_time_blocks(available_time_blocks, possible_time_blocks, added_time_blocks, removed_time_blocks,
+                                 unavailable_time_blocks) -> list[Slot]:
+    """
+    Updates already computed available time blocks after busy blocks were added or removed. Only the possible time
+    blocks overlapping a removed busy block are checked again, every other time block is kept or dropped as is.
+    :param list[Slot] available_time_blocks: previously computed available time blocks
+    :param list[Slot] possible_time_blocks: possible time blocks the available time blocks came from
+    :param list[Slot] added_time_blocks: busy blocks that were added
+    :param list[Slot] removed_time_blocks: busy blocks that were removed
+    :param list[Slot] unavailable_time_blocks: sorted union of the panel's current unavailable time blocks, only
+    needed when busy blocks were removed
+    :returns: available time blocks [(start_minute, end_minute), ...]
+    """
+    if removed_time_blocks:
+        freed_time_blocks = get_available_from_unavailable_time_block(
+            get_overlapping_time_blocks(possible_time_blocks, removed_time_blocks), unavailable_time_blocks
+        )
+        known_starts = {time_block[0] for time_block in available_time_blocks}
+        available_time_blocks = sorted(
+            available_time_blocks + [time_block for time_block in freed_time_blocks if time_block[0] not in known_starts]
+        )
+    if added_time_blocks:
+        blocked_starts = {
+            time_block[0] for time_block in get_overlapping_time_blocks(available_time_blocks, added_time_blocks)
+        }
+        available_time_blocks = [time_block for time_block in available_time_blocks if time_block[0] not in blocked_starts]
+    return available_time_blocks
@@ -0,0 +1,74 @@
+from datetime import date, datetime, UTC
+from functools import cache
+
+import httpx
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from interviews.free_busy_cache import FreeBusyProviderError
+
+
+@cache
+def get_http_client(max_connections:int, timeout:float) -> httpx.Client:
+    """
+    Gets the HTTP client shared by every request to the free/busy service in this process, so connections are kept
+    alive and reused across requests instead of opened for each one.
+    :param max_connections: most connections open at once
+    :param timeout: seconds each request may take
+    :returns: httpx.Client
+    """
+    return httpx.Client(limits=httpx.Limits(max_connections=max_connections), timeout=timeout)
+
+
+class FreeBusyHttpProvider:
+    """
+    Free/busy provider for a remote free/busy service answering
+    GET {base_url}/interviewers/{id}/free-busy?start=2025-01-22&days=7 with the same json get_free_busy_data returns
+    for a single interviewer, the sync counterpart of async_free_busy.HttpFreeBusyProvider.
+    """
+    def __init__(self, base_url:str, client:httpx.Client=None):
+        self.base_url = base_url.rstrip('/')
+        self.client = client or get_http_client(settings.FREE_BUSY_MAX_CONCURRENCY, settings.FREE_BUSY_TIMEOUT)
+
+    def get_interviewer_free_busy(self, interviewer_id:int, start_date:date, days:int) -> dict:
+        """
+        Gets the free/busy data of one interviewer.
+        :param interviewer_id: interviewer id
+        :param start_date: first day
+        :param days: number of days
+        :returns: free/busy data {'interviewerId': 1, 'busy': [{'start': '2025-01-22T10:00:00Z', 'end': ...}, ...]}
+        :raises FreeBusyProviderError: if the request fails or times out
+        """
+        try:
+            response = self.client.get(
+                f'{self.base_url}/interviewers/{interviewer_id}/free-busy',
+                params={'start': start_date.isoformat(), 'days': days}
+            )
+            response.raise_for_status()
+            return response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            raise FreeBusyProviderError(f'Free/busy provider failed for interviewer {interviewer_id}: {e}') from e
+
+    def __call__(self, interviewer_ids, start_date=None, days:int=7) -> list[dict]:
+        """
+        Gets the free/busy data of each interviewer over the pooled connections.
+        :param list[int] interviewer_ids: list of interviewer ids
+        :param date start_date: first day, defaults to today in UTC
+        :param days: number of days
+        :returns: free/busy data in the same order as interviewer_ids [{'interviewerId': 1, 'busy': [...]}, ...]
+        :raises FreeBusyProviderError: if any request fails or times out
+        """
+        if not start_date:
+            start_date = datetime.now(UTC).date()
+        return [self.get_interviewer_free_busy(interviewer_id, start_date, days) for interviewer_id in interviewer_ids]
+
+
+def get_provider() -> FreeBusyHttpProvider:
+    """
+    Gets the free/busy provider for FREE_BUSY_PROVIDER_URL, selected with FREE_BUSY_PROVIDER=http.
+    :returns: FreeBusyHttpProvider
+    :raises ImproperlyConfigured: if FREE_BUSY_PROVIDER_URL is not set
+    """
+    if not settings.FREE_BUSY_PROVIDER_URL:
+        raise ImproperlyConfigured('FREE_BUSY_PROVIDER=http needs FREE_BUSY_PROVIDER_URL')
+    return FreeBusyHttpProvider(settings.FREE_BUSY_PROVIDER_URL)
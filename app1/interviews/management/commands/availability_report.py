@@ -0,0 +1,91 @@
+import multiprocessing
+import os
+import sys
+import time as time_module
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, UTC
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from interviews.helpers import get_time_blocks_by_interviewer
+from interviews.models import InterviewTemplate
+from interviews.reports import REPORT_FORMATS, get_report_chunk, init_report_worker, iter_chunks
+
+
+class Command(BaseCommand):
+    help = (
+        'Writes the availability of every InterviewTemplate as CSV or NDJSON. Busy data is fetched once and templates '
+        'are computed in chunks across a process pool, rows are written as chunks finish.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help='path of the report, - for stdout')
+        parser.add_argument('--format', choices=REPORT_FORMATS, help='report format, defaults to the output extension')
+        parser.add_argument('--templates', nargs='*', type=int, help='interviewIds to report, defaults to every template')
+        parser.add_argument('--days', type=int, default=30, help='number of days in the horizon')
+        parser.add_argument('--workers', type=int, default=os.cpu_count(), help='worker processes, 1 runs in process')
+        parser.add_argument('--chunk-size', type=int, default=50, help='templates per task')
+        parser.add_argument('--backend', choices=['python', 'bitmask'], help='defaults to INTERVIEWS_AVAILABILITY_BACKEND')
+
+    def handle(self, *args, **options):
+        report_format = options['format'] or os.path.splitext(options['output'])[1].lstrip('.')
+        if report_format not in REPORT_FORMATS:
+            raise CommandError('Could not infer the report format, pass --format csv or --format ndjson')
+        if not 1 <= options['days'] <= settings.INTERVIEWS_MAX_HORIZON_DAYS:
+            raise CommandError(f'--days must be between 1 and {settings.INTERVIEWS_MAX_HORIZON_DAYS}')
+        backend = options['backend'] or settings.INTERVIEWS_AVAILABILITY_BACKEND
+        if backend not in ('python', 'bitmask'):
+            backend = 'python'
+
+        started = time_module.perf_counter()
+        interviews = list(InterviewTemplate.get_json_by_ids(options['templates']).values())
+        interviewer_ids = sorted({
+            interviewer['id'] for interview in interviews for interviewer in interview.get('interviewers') or []
+        })
+        initargs = (get_time_blocks_by_interviewer(interviewer_ids, days=options['days']), datetime.now(UTC),
+                    options['days'], backend, report_format)
+        fetched = time_module.perf_counter()
+
+        output = sys.stdout if options['output'] == '-' else open(options['output'], 'w', newline='')
+        try:
+            output.write(REPORT_FORMATS[report_format][0])
+            slot_count = 0
+            for text, _, chunk_slot_count in self.iter_chunks(interviews, initargs, options):
+                output.write(text)
+                slot_count += chunk_slot_count
+        finally:
+            if output is not sys.stdout:
+                output.close()
+
+        elapsed = time_module.perf_counter() - fetched
+        # Keep the summary out of a report written to stdout
+        (self.stderr if options['output'] == '-' else self.stdout).write(
+            f'Reported {len(interviews)} templates and {slot_count} slots with {options["workers"]} workers: busy data '
+            f'{fetched - started:.2f}s, availability {elapsed:.2f}s ({len(interviews) / max(elapsed, 1e-9):.1f} templates/s)'
+        )
+
+    def iter_chunks(self, interviews, initargs, options):
+        """
+        Computes the report's chunks in process or across a process pool.
+        :param list[dict] interviews: interview json of get_json_by_ids
+        :param tuple initargs: arguments of init_report_worker
+        :param dict options: command options
+        :returns: generator of get_report_chunk results in the order chunks finish
+        """
+        chunks = iter_chunks(interviews, max(options['chunk_size'], 1))
+        if options['workers'] <= 1:
+            init_report_worker(*initargs)
+            for chunk in chunks:
+                yield get_report_chunk(chunk)
+            return
+
+        # Forked workers never use the database and exit with os._exit, so the connections they inherit are never
+        # touched or closed from the child
+        mp_context = multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods() else None)
+        with ProcessPoolExecutor(
+            max_workers=options['workers'], mp_context=mp_context, initializer=init_report_worker, initargs=initargs
+        ) as executor:
+            futures = [executor.submit(get_report_chunk, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                yield future.result()
@@ -0,0 +1,79 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from interviews.benchmarks import BASE_CASE, BENCHMARKS, SWEEPS, compare_results, get_cases, run_benchmarks
+
+
+def parse_values(value:str, parameter:str) -> list:
+    """
+    Parses a comma separated list of sweep values.
+    :param value: comma separated values Ex: 1,10,100
+    :param parameter: swept parameter, density is a float and the rest are integers
+    :returns: list of values
+    """
+    cast = float if parameter == 'density' else int
+    try:
+        values = [cast(item) for item in value.split(',') if item]
+    except ValueError:
+        values = []
+    if not values:
+        raise CommandError(f'Invalid --{parameter} values: {value}')
+    return values
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks the interviews scheduling helpers on seeded synthetic busy data, sweeping one parameter at a time '
+        'around the base case, and optionally fails on slowdowns against a saved baseline.'
+    )
+
+    def add_arguments(self, parser):
+        for parameter, values in SWEEPS.items():
+            parser.add_argument(
+                f'--{parameter}', help=f'comma separated values to sweep, the first one is the base value '
+                f'(default {",".join(str(value) for value in values)} with base {BASE_CASE[parameter]})'
+            )
+        parser.add_argument('--benchmarks', nargs='*', choices=BENCHMARKS, default=BENCHMARKS, help='benchmarks to run')
+        parser.add_argument('--seed', type=int, default=0, help='random seed of the synthetic busy data')
+        parser.add_argument('--min-time', type=float, default=0.2, help='seconds each timed run lasts at least')
+        parser.add_argument('--repeat', type=int, default=3, help='number of timed runs, the best is reported')
+        parser.add_argument('--output', help='file to save the results to as JSON')
+        parser.add_argument('--baseline', help='JSON results to compare against')
+        parser.add_argument('--threshold', type=float, default=0.25, help='allowed slowdown against the baseline')
+
+    def handle(self, *args, **options):
+        # Given values replace the default sweep and the first one becomes the base value of the other sweeps
+        sweeps, base_case = dict(SWEEPS), dict(BASE_CASE)
+        for parameter in SWEEPS:
+            if options[parameter]:
+                sweeps[parameter] = parse_values(options[parameter], parameter)
+                base_case[parameter] = sweeps[parameter][0]
+        baseline = None
+        if options['baseline']:
+            try:
+                with open(options['baseline']) as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f'Could not read baseline {options["baseline"]}: {e}')
+
+        results = run_benchmarks(
+            get_cases(sweeps, base_case), benchmarks=options['benchmarks'], seed=options['seed'], min_time=options['min_time'],
+            repeat=options['repeat'], callback=lambda key, result: self.stdout.write(
+                f'{key:<80} {result["ops_per_sec"]:>12,.1f} ops/s {result["peak_memory_kib"]:>12,.1f} KiB peak'
+            )
+        )
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(f'Saved results to {options["output"]}')
+
+        if baseline is None:
+            return
+        regressions = compare_results(results, baseline, threshold=options['threshold'])
+        if regressions:
+            raise CommandError('Slower than the baseline:\n' + '\n'.join(
+                f'{regression["key"]}: {regression["ops_per_sec"]:,.1f} ops/s vs {regression["baseline"]:,.1f} ops/s '
+                f'({regression["ratio"]:.0%})' for regression in regressions
+            ))
+        self.stdout.write(self.style.SUCCESS(f'No benchmark is more than {options["threshold"]:.0%} slower than the baseline'))
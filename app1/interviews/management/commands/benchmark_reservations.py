@@ -0,0 +1,50 @@
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+
+from global_use.redis_client import get_redis_client
+from interviews.benchmarks import run_reservation_benchmark
+from interviews.reservations import ReservationHolds
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks reservation holds with hundreds of simultaneous requests for overlapping slots of the same panel '
+        'against redis1 and fails if two winning holds overlap.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000, help='number of hold requests')
+        parser.add_argument('--concurrency', type=int, default=200, help='number of simultaneous clients')
+        parser.add_argument('--panel-size', type=int, default=3, help='number of interviewers of the panel')
+        parser.add_argument('--slots', type=int, default=20, help='number of half hourly slots requests pick from')
+        parser.add_argument('--duration', type=int, default=60, help='duration in minutes of the slots')
+        parser.add_argument('--seed', type=int, default=0, help='random seed of the slots requested')
+
+    def handle(self, *args, **options):
+        client = get_redis_client()
+        if client is None:
+            raise CommandError('Reservation holds need Redis, set REDIS_HOST')
+        if min(options['requests'], options['concurrency'], options['panel_size'], options['slots']) < 1:
+            raise CommandError('--requests, --concurrency, --panel-size and --slots must be at least 1')
+        # Holds of the run are kept apart from real holds and removed afterwards
+        holds = ReservationHolds(ttl=600, key_prefix=f'benchmark_holds:{uuid.uuid4().hex}')
+        try:
+            result = run_reservation_benchmark(
+                holds, requests=options['requests'], concurrency=options['concurrency'],
+                panel_size=options['panel_size'], slots=options['slots'], duration=options['duration'],
+                seed=options['seed']
+            )
+        finally:
+            keys = list(client.scan_iter(match=f'{holds.key_prefix}:*'))
+            if keys:
+                client.delete(*keys)
+
+        self.stdout.write(
+            f'{result["requests"]} requests from {options["concurrency"]} clients: {result["held"]} held, '
+            f'{result["conflicts"]} conflicts, {result["errors"]} errors, {result["requests_per_sec"]:,.1f} requests/s, '
+            f'p50 {result["p50_ms"]:.2f} ms, p99 {result["p99_ms"]:.2f} ms'
+        )
+        if result['double_booked']:
+            raise CommandError(f'{result["double_booked"]} winning holds overlap')
+        self.stdout.write(self.style.SUCCESS('No slot was held twice'))
@@ -0,0 +1,53 @@
+import json
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from interviews.synthetic_availability import DEFAULT_MEETING_MINUTES, DEFAULT_MEETING_WEIGHTS, SyntheticCalendar
+
+
+class Command(BaseCommand):
+    help = (
+        'Writes seeded synthetic free/busy data as a JSON dump import_busy_blocks can load, for load testing with '
+        'production sized calendars.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help='path of the JSON file to write')
+        parser.add_argument('--interviewers', type=int, default=10000, help='number of interviewers, ids start at 1')
+        parser.add_argument('--start', type=date.fromisoformat, help='first day Ex: 2025-01-06, defaults to today')
+        parser.add_argument('--days', type=int, default=7, help='number of days')
+        parser.add_argument('--seed', type=int, default=0, help='random seed')
+        parser.add_argument('--density', type=float, default=2.0, help='busy blocks per interviewer per working day')
+        parser.add_argument('--timezones', default='UTC', help='comma separated time zones Ex: UTC,America/New_York')
+        parser.add_argument(
+            '--meetings', help='comma separated meeting minutes and weights Ex: 30:4,60:4,90:1, defaults to '
+            + ','.join(f'{minutes}:{weight}' for minutes, weight in zip(DEFAULT_MEETING_MINUTES, DEFAULT_MEETING_WEIGHTS))
+        )
+        parser.add_argument('--weekends', action='store_true', help='also generate busy blocks on weekends')
+
+    def handle(self, *args, **options):
+        meeting_minutes, meeting_weights = DEFAULT_MEETING_MINUTES, DEFAULT_MEETING_WEIGHTS
+        if options['meetings']:
+            try:
+                meetings = [meeting.split(':') for meeting in options['meetings'].split(',')]
+                meeting_minutes = [int(minutes) for minutes, _ in meetings]
+                meeting_weights = [float(weight) for _, weight in meetings]
+            except ValueError:
+                raise CommandError(f'Invalid --meetings: {options["meetings"]}')
+        try:
+            calendar = SyntheticCalendar(
+                seed=options['seed'], density=options['density'], timezones=options['timezones'].split(','),
+                meeting_minutes=meeting_minutes, meeting_weights=meeting_weights, weekends=options['weekends']
+            )
+        except (ValueError, KeyError) as e:
+            raise CommandError(e)
+        free_busy_data = calendar(
+            list(range(1, options['interviewers'] + 1)), start_date=options['start'], days=options['days']
+        )
+        with open(options['output'], 'w') as f:
+            json.dump(free_busy_data, f)
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {sum(len(data["busy"]) for data in free_busy_data)} busy blocks for {len(free_busy_data)} '
+            f'interviewers to {options["output"]}'
+        ))
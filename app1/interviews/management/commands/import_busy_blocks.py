@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from interviews.free_busy_files import load_free_busy_file
+from interviews.models import BusyBlock
+
+
+class Command(BaseCommand):
+    help = 'Bulk imports busy blocks from JSON free/busy dumps or ICS calendars into BusyBlock.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='.json free/busy dumps or .ics calendars named <interviewer id>.ics')
+        parser.add_argument('--interviewer', type=int, help='interviewer id of the ICS calendars')
+        parser.add_argument('--replace', action='store_true', help="replace the interviewers' stored busy blocks")
+        parser.add_argument('--batch-size', type=int, default=1000, help='number of rows per insert')
+
+    def handle(self, *args, **options):
+        free_busy_data = []
+        for path in options['paths']:
+            try:
+                free_busy_data.extend(load_free_busy_file(path, interviewer_id=options['interviewer']))
+            except (OSError, ValueError, KeyError) as e:
+                raise CommandError(f'Could not load {path}: {e}')
+        imported = BusyBlock.bulk_import(free_busy_data, replace=options['replace'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Imported {imported} busy blocks'))
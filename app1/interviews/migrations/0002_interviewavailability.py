@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InterviewAvailability',
+            fields=[
+                ('interview', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='availability', serialize=False, to='interviews.interviewtemplate')),
+                ('availableSlots', models.JSONField(default=list)),
+                ('computedAt', models.DateTimeField()),
+            ],
+        ),
+    ]
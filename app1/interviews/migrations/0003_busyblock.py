@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:51
+
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0002_interviewavailability'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusyBlock',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('period', django.contrib.postgres.fields.ranges.DateTimeRangeField()),
+                ('interviewer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='busy_blocks', to='interviews.interviewer')),
+            ],
+            options={
+                'indexes': [django.contrib.postgres.indexes.GistIndex(fields=['period'], name='busyblock_period_gist')],
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta, UTC
+
+from django.db import migrations
+
+# The conversions are copied from interviews.slots as they were when this migration was written, so later changes to
+# that module do not change what the migration does
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def to_minutes(iso:str, ceil:bool=False) -> int:
+    seconds = (datetime.fromisoformat(iso) - EPOCH) // timedelta(seconds=1)
+    return -(-seconds // 60) if ceil else seconds // 60
+
+
+def to_iso(minutes:int) -> str:
+    return (EPOCH + timedelta(minutes=minutes)).isoformat().removesuffix('+00:00') + 'Z'
+
+
+def slots_to_minutes(apps, schema_editor):
+    InterviewAvailability = apps.get_model('interviews', 'InterviewAvailability')
+    availabilities = list(InterviewAvailability.objects.all())
+    for availability in availabilities:
+        availability.availableSlots = [
+            [to_minutes(slot['start']), to_minutes(slot['end'], ceil=True)] for slot in availability.availableSlots
+        ]
+    InterviewAvailability.objects.bulk_update(availabilities, ['availableSlots'])
+
+
+def slots_to_iso(apps, schema_editor):
+    InterviewAvailability = apps.get_model('interviews', 'InterviewAvailability')
+    availabilities = list(InterviewAvailability.objects.all())
+    for availability in availabilities:
+        availability.availableSlots = [
+            {'start': to_iso(start), 'end': to_iso(end)} for start, end in availability.availableSlots
+        ]
+    InterviewAvailability.objects.bulk_update(availabilities, ['availableSlots'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0003_busyblock'),
+    ]
+
+    operations = [
+        migrations.RunPython(slots_to_minutes, slots_to_iso),
+    ]
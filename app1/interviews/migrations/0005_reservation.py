@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:23
+
+import django.contrib.postgres.fields.ranges
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0004_availableslots_minutes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Reservation',
+            fields=[
+                ('id', models.UUIDField(primary_key=True, serialize=False)),
+                ('candidate', models.CharField(max_length=100)),
+                ('period', django.contrib.postgres.fields.ranges.DateTimeRangeField()),
+                ('createdAt', models.DateTimeField(auto_now_add=True)),
+                ('interview', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservations', to='interviews.interviewtemplate')),
+            ],
+        ),
+    ]
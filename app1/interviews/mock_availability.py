@@ -9,7 +9,7 @@ Faker.seed(0)
 def generate_busy_blocks(start_date, days=7):
     busy_blocks = []
     work_hours = (9, 17)  # Work hours from 9 AM to 5 PM
-    
+
     # Generate 3-6 busy blocks
     for _ in range(random.randint(3, 6)):
         day_offset = random.randint(0, days - 1)
@@ -31,16 +31,25 @@ def generate_busy_blocks(start_date, days=7):
     return busy_blocks
 
 
-def get_free_busy_data(interviewer_ids: list[int]) -> list[dict]:
-    start_date = datetime.utcnow().date()
+def get_free_busy_data(interviewer_ids: list[int], start_date=None, days=7) -> list[dict]:
+    if not start_date:
+        start_date = datetime.utcnow().date()
     data = []
 
     for id_ in interviewer_ids:
         interviewer = {
             "interviewerId": id_,
             "name": fake.name(),
-            "busy": generate_busy_blocks(start_date)  # Changed from 'availability' to 'busy'
+            "busy": generate_busy_blocks(start_date, days=days)  # Changed from 'availability' to 'busy'
         }
         data.append(interviewer)
 
-    return data 
\ No newline at end of file
+    return data
+
+
+def get_provider():
+    """
+    Gets the mock free/busy provider, selected with FREE_BUSY_PROVIDER=mock.
+    :returns: get_free_busy_data
+    """
+    return get_free_busy_data
@@ -1,7 +1,28 @@
-from django.db import models
-from datetime import time, UTC
+from django.conf import settings
+from django.contrib.postgres.fields import DateTimeRangeField
+from django.contrib.postgres.indexes import GistIndex
+from django.db import models, transaction
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+from datetime import date, datetime, time, timedelta, UTC
+from itertools import islice
 
-from global_use.serializers import django_model_to_json
+from global_use.serializers import serialize_model, serialize_models
+from interviews.availability_events import publish_availability_diff
+from interviews.free_busy_cache import invalidate_free_busy_data
+from interviews.helpers import (
+    DEFAULT_HORIZON_DAYS,
+    get_all_available_time_blocks,
+    get_all_possible_time_blocks,
+    get_time_blocks_by_interviewer,
+    iter_available_time_blocks,
+    merge_unavailable_time_blocks,
+    update_available_time_blocks,
+    time_blocks_to_json,
+    time_blocks_from_json
+)
+from interviews.slots import Slot, time_block_to_slot, to_datetime, to_iso, to_minutes
+
+INTERVIEW_TEMPLATE_RELATED = ('interviewers',)
 
 
 class Interviewer(models.Model):
@@ -12,6 +33,113 @@ class Interviewer(models.Model):
     timezone = models.CharField(max_length=50, default='UTC')
 
 
+class BusyBlock(models.Model):
+    id = models.BigAutoField(primary_key=True)
+    interviewer = models.ForeignKey('Interviewer', on_delete=models.CASCADE, related_name='busy_blocks')
+    period = DateTimeRangeField()
+
+    class Meta:
+        indexes = [GistIndex(fields=['period'], name='busyblock_period_gist')]
+
+    @classmethod
+    def get_time_blocks_by_interviewer(cls, interviewer_ids:list[int], start:datetime, end:datetime) -> dict[int, list[Slot]]:
+        """
+        Gets the stored busy blocks of the given interviewers overlapping start to end with one range query.
+        :param interviewer_ids: list of interviewer ids
+        :param start: start of the window
+        :param end: end of the window
+        :returns: unavailable time blocks by interviewer id sorted by start and end {id: [(start_minute, end_minute), ...]}
+        """
+        unavailable_time_blocks_by_interviewer = {interviewer_id: [] for interviewer_id in interviewer_ids}
+        busy_blocks = (
+            cls.objects.filter(interviewer_id__in=interviewer_ids, period__overlap=DateTimeTZRange(start, end, '[)'))
+            .order_by('interviewer_id', 'period')
+            .values_list('interviewer_id', 'period')
+        )
+        for interviewer_id, period in busy_blocks:
+            unavailable_time_blocks_by_interviewer[interviewer_id].append(time_block_to_slot(period.lower, period.upper))
+        return unavailable_time_blocks_by_interviewer
+
+    @classmethod
+    def get_free_busy_data(cls, interviewer_ids:list[int], start_date:date=None, days:int=7) -> list[dict]:
+        """
+        Gets stored busy blocks in the same format as get_free_busy_data so they can stand in for the provider.
+        :param interviewer_ids: list of interviewer ids
+        :param start_date: first day of the window, defaults to today in UTC
+        :param days: number of days in the window
+        :returns: free/busy data [{'interviewerId': 1, 'busy': [{'start': '2025-01-22T10:00:00Z', 'end': ...}, ...]}, ...]
+        """
+        if not start_date:
+            start_date = datetime.now(UTC).date()
+        start = datetime.combine(start_date, time(0), tzinfo=UTC)
+        end = start + timedelta(days=days)
+        unavailable_time_blocks_by_interviewer = cls.get_time_blocks_by_interviewer(interviewer_ids, start, end)
+        return [
+            {'interviewerId': interviewer_id, 'busy': time_blocks_to_json(unavailable_time_blocks_by_interviewer[interviewer_id])}
+            for interviewer_id in interviewer_ids
+        ]
+
+    @classmethod
+    def get_free_interviewer_ids(cls, start:datetime, end:datetime, interviewer_ids:list[int]=None) -> list[int]:
+        """
+        Gets the interviewers with no busy block overlapping start to end with one anti-join query.
+        :param start: start of the window
+        :param end: end of the window
+        :param interviewer_ids: only check these interviewers, defaults to every interviewer
+        :returns: sorted list of free interviewer ids
+        """
+        interviewers = Interviewer.objects.all()
+        if interviewer_ids is not None:
+            interviewers = interviewers.filter(id__in=interviewer_ids)
+        busy_interviewer_ids = cls.objects.filter(period__overlap=DateTimeTZRange(start, end, '[)')).values('interviewer_id')
+        return list(interviewers.exclude(id__in=busy_interviewer_ids).order_by('id').values_list('id', flat=True))
+
+    @classmethod
+    def bulk_import(cls, free_busy_data:list[dict], replace:bool=False, batch_size:int=1000) -> int:
+        """
+        Inserts busy blocks from free/busy data in batches. Interviewers that do not exist are skipped.
+        :param free_busy_data: free/busy data [{'interviewerId': 1, 'busy': [{'start': '2025-01-22T10:00:00Z', 'end': ...}, ...]}, ...]
+        :param replace: remove the interviewers' stored busy blocks first
+        :param batch_size: number of rows per insert
+        :returns: number of busy blocks inserted
+        """
+        interviewer_ids = set(
+            Interviewer.objects.filter(id__in=[data['interviewerId'] for data in free_busy_data]).values_list('id', flat=True)
+        )
+        busy_blocks = [
+            cls(interviewer_id=data['interviewerId'], period=DateTimeTZRange(
+                datetime.fromisoformat(slot['start']), datetime.fromisoformat(slot['end']), '[)'
+            ))
+            for data in free_busy_data if data['interviewerId'] in interviewer_ids
+            for slot in data.get('busy', [])
+        ]
+        with transaction.atomic():
+            if replace:
+                cls.objects.filter(interviewer_id__in=interviewer_ids).delete()
+            cls.objects.bulk_create(busy_blocks, batch_size=batch_size)
+        invalidate_free_busy_data(sorted(interviewer_ids))
+        return len(busy_blocks)
+
+    @classmethod
+    def apply_events(cls, interviewer_id:int, events:list[dict]) -> None:
+        """
+        Stores busy block events of an interviewer's calendar so every later recompute of their availability sees
+        them. Added busy blocks are stored as BusyBlocks and removed busy blocks delete the stored BusyBlocks they
+        contain, events are applied in order.
+        :param interviewer_id: id of Interviewer whose calendar changed
+        :param events: busy block events [{'action': 'add', 'start': '2025-01-22T10:00:00Z', 'end': '2025-01-22T11:00:00Z'}, ...]
+        """
+        with transaction.atomic():
+            for event in events:
+                period = DateTimeTZRange(
+                    datetime.fromisoformat(event['start']), datetime.fromisoformat(event['end']), '[)'
+                )
+                if event['action'] == 'add':
+                    cls.objects.create(interviewer_id=interviewer_id, period=period)
+                else:
+                    cls.objects.filter(interviewer_id=interviewer_id, period__contained_by=period).delete()
+
+
 class InterviewTemplate(models.Model):
     interviewId = models.AutoField(primary_key=True)
     name = models.CharField(max_length=100)
@@ -25,5 +153,265 @@ class InterviewTemplate(models.Model):
         :param _id: interviewId of InterviewTemplate
         :returns: json object of InterviewTemplate
         """
-        interview = InterviewTemplate.objects.get(interviewId=_id)
-        return django_model_to_json(interview)
+        interview = InterviewTemplate.objects.prefetch_related(*INTERVIEW_TEMPLATE_RELATED).get(interviewId=_id)
+        return serialize_model(interview, related=INTERVIEW_TEMPLATE_RELATED)
+
+    @classmethod
+    def get_json_by_ids(cls, ids:list[int]=None) -> dict[int, dict]:
+        """
+        Gets the json representation of many interviews with their interviewers in two queries no matter how many
+        interviews or interviewers there are.
+        :param ids: interviewIds of InterviewTemplates, defaults to every InterviewTemplate
+        :returns: json objects of the InterviewTemplates found keyed by interviewId
+        """
+        interviews = cls.objects.prefetch_related(*INTERVIEW_TEMPLATE_RELATED).order_by('interviewId')
+        if ids is not None:
+            interviews = interviews.filter(interviewId__in=ids)
+        return {
+            interview['interviewId']: interview
+            for interview in serialize_models(interviews, related=INTERVIEW_TEMPLATE_RELATED)
+        }
+
+
+class InterviewAvailability(models.Model):
+    interview = models.OneToOneField('InterviewTemplate', on_delete=models.CASCADE, primary_key=True,
+                                     related_name='availability')
+    # Slots as [start_minute, end_minute] pairs in minutes since the Unix epoch, see interviews.slots
+    availableSlots = models.JSONField(default=list)
+    computedAt = models.DateTimeField()
+
+    def is_stale(self, max_age=None) -> bool:
+        """
+        Checks if the stored slots are older than max_age.
+        :param int max_age: seconds stored slots stay fresh, defaults to INTERVIEWS_AVAILABILITY_MAX_AGE
+        :returns: True if the slots need to be recomputed
+        """
+        if max_age is None:
+            max_age = settings.INTERVIEWS_AVAILABILITY_MAX_AGE
+        return datetime.now(UTC) - self.computedAt > timedelta(seconds=max_age)
+
+    def get_slots(self) -> list[Slot]:
+        """
+        Gets every stored slot.
+        :returns: list of time blocks [(start_minute, end_minute), ...]
+        """
+        return [Slot(start, end) for start, end in self.availableSlots]
+
+    def get_upcoming_slots(self, limit:int=None) -> list[Slot]:
+        """
+        Gets the stored slots that still begin at least 24 hours in the future.
+        :param limit: only return the first limit slots
+        :returns: list of time blocks [(start_minute, end_minute), ...]
+        """
+        return list(islice(self.iter_upcoming_slots(), limit))
+
+    def iter_upcoming_slots(self, after:datetime=None):
+        """
+        Lazily generates the stored slots that still begin at least 24 hours in the future.
+        :param after: only generate slots starting after this cursor
+        :returns: generator of time blocks (start_minute, end_minute)
+        """
+        min_minute = to_minutes(datetime.now(UTC) + timedelta(days=1), ceil=True)
+        if after is not None:
+            min_minute = max(min_minute, to_minutes(after) + 1)
+        for start, end in self.availableSlots:
+            if start >= min_minute:
+                yield Slot(start, end)
+
+    @classmethod
+    def save_available_slots(cls, _id:int, available_time_blocks) -> "InterviewAvailability":
+        """
+        Stores the available time blocks of an InterviewTemplate with the time they were computed and publishes the
+        slots that changed to its availability event streams.
+        :param _id: interviewId of InterviewTemplate
+        :param list[Slot] available_time_blocks: available time blocks for the interview
+        :returns: stored InterviewAvailability
+        """
+        previous_slots = cls.objects.filter(interview_id=_id).values_list('availableSlots', flat=True).first() or []
+        availability, _ = cls.objects.update_or_create(
+            interview_id=_id,
+            defaults={'availableSlots': list(available_time_blocks), 'computedAt': datetime.now(UTC)}
+        )
+        publish_availability_diff(_id, previous_slots, availability.availableSlots)
+        return availability
+
+    @classmethod
+    def get_available_slots(cls, interview:dict, limit:int=None) -> list[Slot]:
+        """
+        Gets the stored available slots of an interview and only recomputes them when they are missing or stale. When
+        only the first limit slots are needed a stale interview computes just those and leaves the stored row for
+        celery-beat to refresh.
+        :param interview: json object of InterviewTemplate
+        :param limit: only return the first limit slots
+        :returns: list of time blocks [(start_minute, end_minute), ...]
+        """
+        availability = cls.objects.filter(interview_id=interview['interviewId']).first()
+        if availability is None or availability.is_stale():
+            if limit is not None:
+                return get_all_available_time_blocks(
+                    interview.get('interviewers'), interview['durationMinutes'], limit=limit
+                )
+            availability = cls.save_available_slots(
+                interview['interviewId'],
+                get_all_available_time_blocks(interview.get('interviewers'), interview['durationMinutes'])
+            )
+        return availability.get_upcoming_slots(limit=limit)
+
+    @classmethod
+    def iter_available_slots(cls, interview:dict, days:int=None, after:datetime=None):
+        """
+        Lazily generates the available slots of an interview in time order. The default horizon is served from the
+        stored slots like get_available_slots, longer or shorter horizons are computed on the fly by
+        INTERVIEWS_AVAILABILITY_BACKEND and the python backend generates them lazily so they are never held in memory.
+        :param interview: json object of InterviewTemplate
+        :param days: number of days in the horizon, defaults to the stored horizon
+        :param after: only generate slots starting after this cursor
+        :returns: generator of time blocks (start_minute, end_minute)
+        """
+        if days is None or days == DEFAULT_HORIZON_DAYS:
+            availability = cls.objects.filter(interview_id=interview['interviewId']).first()
+            if availability is None or availability.is_stale():
+                availability = cls.save_available_slots(
+                    interview['interviewId'],
+                    get_all_available_time_blocks(interview.get('interviewers'), interview['durationMinutes'])
+                )
+            return availability.iter_upcoming_slots(after=after)
+        if settings.INTERVIEWS_AVAILABILITY_BACKEND in ('bitmask', 'postgres'):
+            # These backends compute the whole horizon in one pass, the cursor is applied to their result
+            available_time_blocks = get_all_available_time_blocks(
+                interview.get('interviewers'), interview['durationMinutes'], days=days
+            )
+            after_minute = to_minutes(after) if after is not None else None
+            return (
+                time_block for time_block in available_time_blocks if after_minute is None or time_block[0] > after_minute
+            )
+        return iter_available_time_blocks(
+            interview.get('interviewers'), interview['durationMinutes'], days=days, after=after
+        )
+
+    @classmethod
+    def apply_busy_block_events(cls, interviewer_id:int, events:list[dict]) -> int:
+        """
+        Stores busy blocks added to or removed from an interviewer's calendar as BusyBlocks, so recomputes keep them,
+        and updates the stored available slots of every InterviewTemplate that includes the interviewer.
+        :param interviewer_id: id of Interviewer whose calendar changed
+        :param events: busy block events [{'action': 'add', 'start': '2025-01-22T10:00:00Z', 'end': '2025-01-22T11:00:00Z'}, ...]
+        :returns: number of InterviewAvailability rows updated
+        """
+        BusyBlock.apply_events(interviewer_id, events)
+        return cls.update_available_slots([interviewer_id], events)
+
+    @classmethod
+    def update_available_slots(cls, interviewer_ids:list[int], events:list[dict]) -> int:
+        """
+        Updates the stored available slots of every InterviewTemplate that includes any of the interviewers after the
+        same busy blocks were added or removed from their calendars and stored. Added busy blocks only drop the slots
+        they overlap and removed busy blocks only recheck the slots they overlap against the panel's current busy data.
+        Each template is updated and its changed slots published to its availability event streams once, however many
+        of the interviewers are on its panel.
+        :param interviewer_ids: ids of Interviewers whose calendars changed
+        :param events: busy block events [{'action': 'add', 'start': '2025-01-22T10:00:00Z', 'end': '2025-01-22T11:00:00Z'}, ...]
+        :returns: number of InterviewAvailability rows updated
+        """
+        invalidate_free_busy_data(sorted(interviewer_ids))
+        added_time_blocks = time_blocks_from_json([event for event in events if event['action'] == 'add'])
+        removed_time_blocks = time_blocks_from_json([event for event in events if event['action'] == 'remove'])
+        availabilities = list(
+            cls.objects.filter(interview__interviewers__id__in=interviewer_ids)
+            .distinct()
+            .select_related('interview')
+            .prefetch_related('interview__interviewers')
+        )
+        unavailable_time_blocks_by_interviewer, unavailable_time_blocks_by_panel = {}, {}
+        if removed_time_blocks:
+            unavailable_time_blocks_by_interviewer = get_time_blocks_by_interviewer(sorted({
+                interviewer.id for availability in availabilities for interviewer in availability.interview.interviewers.all()
+            }))
+        previous_slots = {}
+        for availability in availabilities:
+            previous_slots[availability.interview_id] = availability.get_slots()
+            possible_time_blocks, unavailable_time_blocks = [], []
+            if removed_time_blocks:
+                possible_time_blocks = get_all_possible_time_blocks(
+                    availability.interview.durationMinutes, dt=availability.computedAt,
+                    interviewers=serialize_models(availability.interview.interviewers.all())
+                )
+                panel_key = tuple(sorted({interviewer.id for interviewer in availability.interview.interviewers.all()}))
+                if panel_key not in unavailable_time_blocks_by_panel:
+                    unavailable_time_blocks_by_panel[panel_key] = merge_unavailable_time_blocks([
+                        unavailable_time_blocks_by_interviewer.get(interviewer_id, []) for interviewer_id in panel_key
+                    ])
+                unavailable_time_blocks = unavailable_time_blocks_by_panel[panel_key]
+            availability.availableSlots = update_available_time_blocks(
+                availability.get_slots(),
+                possible_time_blocks,
+                added_time_blocks,
+                removed_time_blocks,
+                unavailable_time_blocks
+            )
+        cls.objects.bulk_update(availabilities, ['availableSlots'])
+        for availability in availabilities:
+            publish_availability_diff(
+                availability.interview_id, previous_slots[availability.interview_id], availability.availableSlots
+            )
+        return len(availabilities)
+
+
+class Reservation(models.Model):
+    # holdId of the Redis hold the reservation was confirmed from
+    id = models.UUIDField(primary_key=True)
+    interview = models.ForeignKey('InterviewTemplate', on_delete=models.CASCADE, related_name='reservations')
+    candidate = models.CharField(max_length=100)
+    period = DateTimeRangeField()
+    createdAt = models.DateTimeField(auto_now_add=True)
+
+    @classmethod
+    def is_booked(cls, interviewer_ids:list[int], start:datetime, end:datetime) -> bool:
+        """
+        Checks whether a confirmed Reservation books any of the given interviewers for part of start to end. The
+        Reservations are the record of truth when Redis lost a booking, e.g. after a restart.
+        :param interviewer_ids: list of interviewer ids
+        :param start: start datetime
+        :param end: end datetime
+        :returns: True if an interviewer is booked
+        """
+        return cls.objects.filter(
+            interview__interviewers__id__in=interviewer_ids, period__overlap=DateTimeTZRange(start, end, '[)')
+        ).exists()
+
+    @classmethod
+    def confirm_hold(cls, hold:dict) -> "Reservation | None":
+        """
+        Stores a confirmed hold as a Reservation with a BusyBlock for every interviewer of the panel. The interviewers'
+        rows are locked while the panel is checked against the confirmed Reservations, so two holds Redis let through
+        can not both be stored. Once the transaction commits the slot is removed from the stored availability of every
+        InterviewTemplate that includes them, a failure there is logged and leaves the reservation in place.
+        :param hold: hold of ReservationHolds
+        :returns: stored Reservation or None if a confirmed Reservation already books an interviewer of the panel
+        """
+        period = DateTimeTZRange(to_datetime(hold['start']), to_datetime(hold['end']), '[)')
+        with transaction.atomic():
+            list(Interviewer.objects.select_for_update().filter(id__in=hold['interviewerIds']).order_by('id'))
+            reservation = cls.objects.filter(id=hold['holdId']).first()
+            if reservation is not None:
+                return reservation
+            if cls.is_booked(hold['interviewerIds'], period.lower, period.upper):
+                return None
+            reservation = cls.objects.create(
+                id=hold['holdId'], interview_id=hold['interviewId'], candidate=hold['candidate'], period=period
+            )
+            BusyBlock.objects.bulk_create([
+                BusyBlock(interviewer_id=interviewer_id, period=period) for interviewer_id in hold['interviewerIds']
+            ])
+            transaction.on_commit(lambda: cls.update_available_slots(hold), robust=True)
+        return reservation
+
+    @staticmethod
+    def update_available_slots(hold:dict) -> None:
+        """
+        Removes the slot of a confirmed hold from the stored availability of every InterviewTemplate that includes its
+        interviewers, updating and publishing each template once.
+        :param hold: hold of ReservationHolds
+        """
+        events = [{'action': 'add', 'start': to_iso(hold['start']), 'end': to_iso(hold['end'])}]
+        InterviewAvailability.update_available_slots(hold['interviewerIds'], events)
@@ -0,0 +1,134 @@
+import threading
+import time as time_module
+from collections import OrderedDict, defaultdict
+from datetime import date
+
+from django.conf import settings
+
+
+class PanelUnionCache:
+    """
+    In-process LRU cache of a panel's merged busy union keyed by the sorted interviewer ids and the start date of the
+    week window. Templates sharing a panel reuse one union whatever their duration. Size is the number of busy blocks
+    held so a few large panels cannot crowd out many small ones. Each entry stores the busy data versions its members
+    had when it was computed, shared by every worker through the free/busy cache, and a get with other versions is a
+    miss, so a worker never serves a union another worker invalidated. Entries are also dropped when this process
+    invalidates a member and expire with the free/busy cache.
+    """
+    def __init__(self, max_size:int=None, ttl:int=None):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        self._keys_by_interviewer = defaultdict(set)
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_size(self) -> int:
+        return settings.INTERVIEWS_PANEL_CACHE_SIZE if self._max_size is None else self._max_size
+
+    @property
+    def ttl(self) -> int:
+        return self._ttl or settings.FREE_BUSY_CACHE_TTL
+
+    @staticmethod
+    def get_key(interviewer_ids, window_start:date) -> tuple:
+        """
+        Gets the cache key of a panel's week window.
+        :param list[int] interviewer_ids: interviewer ids in any order
+        :param window_start: start date of the week window
+        :returns: (sorted interviewer ids, window_start)
+        """
+        return tuple(sorted(set(interviewer_ids))), window_start
+
+    def get(self, interviewer_ids, window_start:date, versions=()) -> tuple | None:
+        """
+        Gets a panel's cached busy union and marks it as recently used.
+        :param list[int] interviewer_ids: interviewer ids in any order
+        :param window_start: start date of the week window
+        :param list[int] versions: current busy data versions of the sorted interviewer ids
+        :returns: sorted non-overlapping unavailable time blocks or None on a miss
+        """
+        key = self.get_key(interviewer_ids, window_start)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] < time_module.monotonic() or entry[3] != tuple(versions)):
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, interviewer_ids, window_start:date, unavailable_time_blocks, versions=()) -> None:
+        """
+        Caches a panel's busy union, evicting the least recently used panels until it fits.
+        :param list[int] interviewer_ids: interviewer ids in any order
+        :param window_start: start date of the week window
+        :param list[Slot] unavailable_time_blocks: sorted non-overlapping unavailable time blocks
+        :param list[int] versions: busy data versions of the sorted interviewer ids read before the busy data
+        """
+        key = self.get_key(interviewer_ids, window_start)
+        unavailable_time_blocks = tuple(unavailable_time_blocks)
+        size = len(unavailable_time_blocks) + 1
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_size:
+                return
+            while self._size + size > self.max_size:
+                self._remove(next(iter(self._entries)))
+            self._entries[key] = (time_module.monotonic() + self.ttl, unavailable_time_blocks, size, tuple(versions))
+            self._size += size
+            for interviewer_id in key[0]:
+                self._keys_by_interviewer[interviewer_id].add(key)
+
+    def invalidate(self, interviewer_ids, window_start:date=None) -> int:
+        """
+        Removes every cached panel that includes any of the given interviewers.
+        :param list[int] interviewer_ids: interviewer ids whose busy data changed
+        :param window_start: start date of the week window to remove, defaults to every window
+        :returns: number of panels removed
+        """
+        with self._lock:
+            keys = {
+                key for interviewer_id in interviewer_ids for key in self._keys_by_interviewer.get(interviewer_id, ())
+                if window_start is None or key[1] == window_start
+            }
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        """
+        Removes every cached panel and resets the hit and miss counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_interviewer.clear()
+            self._size = 0
+            self.hits = self.misses = 0
+
+    def get_stats(self) -> dict[str, int]:
+        """
+        Gets this process's cache counters.
+        :returns: {'hits': hits, 'misses': misses, 'panels': panels, 'size': busy blocks held}
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'panels': len(self._entries), 'size': self._size}
+
+    def _remove(self, key) -> None:
+        size = self._entries.pop(key)[2]
+        self._size -= size
+        for interviewer_id in key[0]:
+            keys = self._keys_by_interviewer[interviewer_id]
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_interviewer[interviewer_id]
+
+
+panel_union_cache = PanelUnionCache()
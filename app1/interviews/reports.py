@@ -0,0 +1,103 @@
+import csv
+import io
+import json
+from itertools import islice
+
+from interviews.helpers import get_all_available_time_blocks, time_block_to_json
+
+# Read-only busy data and settings of a report, set once per worker process by init_report_worker
+_report_context = {}
+
+
+def init_report_worker(unavailable_time_blocks_by_interviewer:dict, dt, days:int, backend:str,
+                       report_format:str) -> None:
+    """
+    Initializes a report worker process. The busy data is handed over once per worker instead of once per chunk, and
+    with the fork start method it is inherited from the parent without being pickled at all.
+    :param unavailable_time_blocks_by_interviewer: unavailable time blocks by interviewer id each sorted
+    :param datetime dt: start date and time of the report
+    :param days: number of days in the horizon
+    :param backend: availability backend, python or bitmask
+    :param report_format: key of REPORT_FORMATS
+    """
+    _report_context.update(
+        unavailable_time_blocks_by_interviewer=unavailable_time_blocks_by_interviewer, dt=dt, days=days, backend=backend,
+        render=REPORT_FORMATS[report_format][1]
+    )
+
+
+def get_report_chunk(interviews:list[dict]) -> tuple[str, int, int]:
+    """
+    Computes and renders the availability of a chunk of interviews in a worker from the busy data it was initialized
+    with. Rendering happens in the worker so the parent only writes text.
+    :param interviews: interview json of get_json_by_ids
+    :returns: (rendered report lines, number of interviews, number of available time blocks)
+    """
+    unavailable_time_blocks_by_interviewer = _report_context['unavailable_time_blocks_by_interviewer']
+    render = _report_context['render']
+    lines, slot_count = [], 0
+    for interview in interviews:
+        interviewers = interview.get('interviewers') or []
+        unavailable_time_blocks_list = [
+            unavailable_time_blocks_by_interviewer.get(interviewer['id'], []) for interviewer in interviewers
+        ] or [[]]
+        available_time_blocks = get_all_available_time_blocks(
+            interviewers, interview['durationMinutes'], dt=_report_context['dt'],
+            unavailable_time_blocks_list=unavailable_time_blocks_list, backend=_report_context['backend'],
+            days=_report_context['days']
+        )
+        lines.append(render(interview, available_time_blocks))
+        slot_count += len(available_time_blocks)
+    return ''.join(lines), len(interviews), slot_count
+
+
+def iter_chunks(items:list, chunk_size:int):
+    """
+    Splits items into lists of chunk_size.
+    :param items: list to split
+    :param chunk_size: number of items per chunk
+    :returns: generator of lists
+    """
+    iterator = iter(items)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def render_csv(interview:dict, available_time_blocks:list) -> str:
+    """
+    Renders one CSV row per available time block.
+    :param interview: interview json
+    :param available_time_blocks: available time blocks [(start_minute, end_minute), ...]
+    :returns: CSV rows
+    """
+    rows = io.StringIO()
+    writer = csv.writer(rows)
+    for time_block in available_time_blocks:
+        time_block_json = time_block_to_json(time_block)
+        writer.writerow([
+            interview['interviewId'], interview['name'], interview['durationMinutes'],
+            time_block_json['start'], time_block_json['end']
+        ])
+    return rows.getvalue()
+
+
+def render_ndjson(interview:dict, available_time_blocks:list) -> str:
+    """
+    Renders one JSON line for the interview with its available time blocks.
+    :param interview: interview json
+    :param available_time_blocks: available time blocks [(start_minute, end_minute), ...]
+    :returns: JSON line
+    """
+    return json.dumps({
+        'interviewId': interview['interviewId'],
+        'name': interview['name'],
+        'durationMinutes': interview['durationMinutes'],
+        'availableSlots': [time_block_to_json(time_block) for time_block in available_time_blocks],
+    }) + '\n'
+
+
+# Header and renderer of each report format
+REPORT_FORMATS = {
+    'csv': ('interviewId,name,durationMinutes,start,end\r\n', render_csv),
+    'ndjson': ('', render_ndjson),
+}
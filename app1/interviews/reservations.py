@@ -0,0 +1,205 @@
+import json
+import logging
+import time as time_module
+import uuid
+
+import redis
+from django.conf import settings
+
+from global_use.redis_client import get_redis_client
+from interviews.helpers import merge_unavailable_time_blocks
+from interviews.slots import Slot
+
+logger = logging.getLogger(__name__)
+
+# Places a hold only if no hold or booking of any interviewer of the panel overlaps the slot. Holds sets are scored by
+# the time their entries expire in milliseconds and entries are "start:end:holdId" in minutes since the Unix epoch.
+# KEYS: hold key, holds set of every interviewer
+# ARGV: now in milliseconds, expiry in milliseconds, ttl in milliseconds, start minute, end minute, entry, hold json
+HOLD_SCRIPT = """
+local now, expires_at, ttl = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local start_minute, end_minute = tonumber(ARGV[4]), tonumber(ARGV[5])
+for i = 2, #KEYS do
+    redis.call('ZREMRANGEBYSCORE', KEYS[i], '-inf', now)
+    for _, entry in ipairs(redis.call('ZRANGE', KEYS[i], 0, -1)) do
+        local held_start, held_end = string.match(entry, '^(%d+):(%d+):')
+        if tonumber(held_start) < end_minute and tonumber(held_end) > start_minute then
+            return 0
+        end
+    end
+end
+for i = 2, #KEYS do
+    redis.call('ZADD', KEYS[i], expires_at, ARGV[6])
+    if redis.call('PTTL', KEYS[i]) < ttl then
+        redis.call('PEXPIRE', KEYS[i], ttl)
+    end
+end
+redis.call('SET', KEYS[1], ARGV[7], 'PX', ttl)
+return 1
+"""
+
+# Turns a hold that has not expired into a booking kept until the slot ends, the hold itself is kept for another ttl
+# so its status can be read until the reservation is stored
+# KEYS: hold key, holds set of every interviewer
+# ARGV: entry, end of the slot in milliseconds, milliseconds until the slot ends, ttl in milliseconds
+CONFIRM_SCRIPT = """
+local hold = redis.call('GET', KEYS[1])
+if not hold then
+    return false
+end
+local booked_until, booked_ttl = tonumber(ARGV[2]), tonumber(ARGV[3])
+for i = 2, #KEYS do
+    redis.call('ZADD', KEYS[i], booked_until, ARGV[1])
+    if redis.call('PTTL', KEYS[i]) < booked_ttl then
+        redis.call('PEXPIRE', KEYS[i], booked_ttl)
+    end
+end
+redis.call('PEXPIRE', KEYS[1], ARGV[4])
+return hold
+"""
+
+
+class ReservationHolds:
+    """
+    Places short lived holds on slots in Redis so candidates can claim them without locking rows in Postgres. Each
+    interviewer has a sorted set of the slots held or booked on their calendar and a Lua script checks every set of
+    the panel and adds the hold in one atomic step, so concurrent requests for overlapping slots get exactly one
+    winner. Holds expire after ttl seconds unless they are confirmed into a booking.
+    """
+    def __init__(self, client=None, ttl=None, key_prefix='holds'):
+        self._client = client
+        self._ttl = ttl
+        self.key_prefix = key_prefix
+
+    @property
+    def client(self) -> redis.Redis | None:
+        return self._client or get_redis_client()
+
+    @property
+    def ttl(self) -> int:
+        return self._ttl or settings.INTERVIEWS_RESERVATION_HOLD_TTL
+
+    def get_hold_key(self, hold_id:str) -> str:
+        return f'{self.key_prefix}:hold:{hold_id}'
+
+    def get_interviewer_key(self, interviewer_id:int) -> str:
+        return f'{self.key_prefix}:interviewer:{interviewer_id}'
+
+    @staticmethod
+    def get_entry(hold:dict) -> str:
+        return f'{hold["start"]}:{hold["end"]}:{hold["holdId"]}'
+
+    def get_keys(self, hold:dict) -> list[str]:
+        return [self.get_hold_key(hold['holdId'])] + [
+            self.get_interviewer_key(interviewer_id) for interviewer_id in hold['interviewerIds']
+        ]
+
+    def hold(self, interview_id:int, interviewer_ids:list[int], slot:Slot, candidate:str) -> dict | None:
+        """
+        Holds a slot for a candidate if no interviewer of the panel has an overlapping hold or booking.
+        :param interview_id: interviewId of InterviewTemplate
+        :param interviewer_ids: ids of the interviewers of the panel
+        :param slot: slot to hold (start_minute, end_minute)
+        :param candidate: name of the candidate
+        :returns: hold {'holdId': ..., 'interviewId': 1, 'interviewerIds': [1, 2], 'start': ..., 'end': ...,
+            'candidate': ..., 'expiresAt': milliseconds since the Unix epoch} or None if the slot is taken
+        :raises redis.RedisError: if Redis is unreachable
+        """
+        now = int(time_module.time() * 1000)
+        ttl = self.ttl * 1000
+        hold = {
+            'holdId': str(uuid.uuid4()), 'interviewId': interview_id, 'interviewerIds': sorted(set(interviewer_ids)),
+            'start': slot.start, 'end': slot.end, 'candidate': candidate, 'expiresAt': now + ttl,
+        }
+        held = self.client.register_script(HOLD_SCRIPT)(keys=self.get_keys(hold), args=[
+            now, hold['expiresAt'], ttl, slot.start, slot.end, self.get_entry(hold), json.dumps(hold)
+        ])
+        return hold if held else None
+
+    def get(self, hold_id:str) -> dict | None:
+        """
+        Gets a hold that has not expired.
+        :param hold_id: holdId of the hold
+        :returns: hold or None
+        """
+        hold = self.client.get(self.get_hold_key(hold_id))
+        return json.loads(hold) if hold else None
+
+    def confirm(self, hold_id:str) -> dict | None:
+        """
+        Turns a hold into a booking that blocks the slot until it ends, call before the reservation is stored.
+        :param hold_id: holdId of the hold
+        :returns: hold or None if it expired
+        """
+        hold = self.get(hold_id)
+        if hold is None:
+            return None
+        now = int(time_module.time() * 1000)
+        booked_until = hold['end'] * 60 * 1000
+        hold = self.client.register_script(CONFIRM_SCRIPT)(keys=self.get_keys(hold), args=[
+            self.get_entry(hold), booked_until, max(booked_until - now, 1), self.ttl * 1000
+        ])
+        return json.loads(hold) if hold else None
+
+    def release(self, hold:dict) -> None:
+        """
+        Removes a hold or booking so the slot can be held again.
+        :param hold: hold returned by hold or confirm
+        """
+        pipeline = self.client.pipeline()
+        for key in self.get_keys(hold)[1:]:
+            pipeline.zrem(key, self.get_entry(hold))
+        pipeline.delete(self.get_hold_key(hold['holdId']))
+        pipeline.execute()
+
+    def get_held_time_blocks_by_interviewer(self, interviewer_ids) -> dict[int, list[Slot]]:
+        """
+        Gets the slots held or booked on each interviewer's calendar with one round trip.
+        :param list[int] interviewer_ids: list of interviewer ids
+        :returns: held time blocks by interviewer id each sorted {id: [(start_minute, end_minute), ...]}
+        """
+        interviewer_ids = list(interviewer_ids)
+        client = self.client
+        if client is None or not interviewer_ids:
+            return {interviewer_id: [] for interviewer_id in interviewer_ids}
+        now = int(time_module.time() * 1000)
+        try:
+            pipeline = client.pipeline(transaction=False)
+            for interviewer_id in interviewer_ids:
+                pipeline.zrangebyscore(self.get_interviewer_key(interviewer_id), f'({now}', '+inf')
+            entries_list = pipeline.execute()
+        except redis.RedisError:
+            logger.warning('Reservation holds unavailable, serving availability without holds', exc_info=True)
+            return {interviewer_id: [] for interviewer_id in interviewer_ids}
+        held_time_blocks_by_interviewer = {}
+        for interviewer_id, entries in zip(interviewer_ids, entries_list):
+            held_time_blocks_by_interviewer[interviewer_id] = sorted(
+                Slot(int(start), int(end)) for start, end, _ in (entry.decode().split(':') for entry in entries)
+            )
+        return held_time_blocks_by_interviewer
+
+    def get_held_time_blocks(self, interviewer_ids) -> list[Slot]:
+        """
+        Gets the slots held or booked on the calendar of any interviewer of a panel.
+        :param list[int] interviewer_ids: list of interviewer ids
+        :returns: sorted non-overlapping held time blocks [(start_minute, end_minute), ...]
+        """
+        return merge_unavailable_time_blocks(list(self.get_held_time_blocks_by_interviewer(interviewer_ids).values()))
+
+
+reservation_holds = ReservationHolds()
+
+
+def iter_unheld_time_blocks(time_blocks, held_time_blocks:list[Slot]):
+    """
+    Lazily leaves out time blocks overlapping a held time block.
+    :param time_blocks: iterable of time blocks sorted by start and end
+    :param held_time_blocks: sorted non-overlapping held time blocks
+    :returns: generator of time blocks (start_minute, end_minute)
+    """
+    index = 0
+    for time_block in time_blocks:
+        while index < len(held_time_blocks) and held_time_blocks[index][1] <= time_block[0]:
+            index += 1
+        if index == len(held_time_blocks) or held_time_blocks[index][0] >= time_block[1]:
+            yield time_block
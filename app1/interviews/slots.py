@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta, UTC
+from typing import NamedTuple
+
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+class Slot(NamedTuple):
+    """
+    Time block stored as whole minutes since the Unix epoch in UTC. A tuple with no per instance dict, sorts by start
+    then end and compares with plain integer arithmetic.
+    """
+    start: int
+    end: int
+
+
+def to_minutes(dt:datetime, ceil:bool=False) -> int:
+    """
+    Converts a tz-aware datetime to whole minutes since the Unix epoch.
+    :param dt: tz-aware datetime
+    :param ceil: round partial minutes up instead of down, used for the end of busy blocks so they are never shortened
+    :returns: minutes since the Unix epoch
+    """
+    seconds = (dt - EPOCH) // timedelta(seconds=1)
+    return -(-seconds // 60) if ceil else seconds // 60
+
+
+def to_datetime(minutes:int) -> datetime:
+    """
+    Converts minutes since the Unix epoch to a UTC datetime.
+    :param minutes: minutes since the Unix epoch
+    :returns: UTC datetime
+    """
+    return EPOCH + timedelta(minutes=minutes)
+
+
+def to_iso(minutes:int) -> str:
+    """
+    Converts minutes since the Unix epoch to a UTC ISO 8601 string the same way JsonResponse encodes datetimes.
+    :param minutes: minutes since the Unix epoch
+    :returns: ISO 8601 string Ex: 2025-01-22T10:00:00Z
+    """
+    return to_datetime(minutes).isoformat().removesuffix('+00:00') + 'Z'
+
+
+def time_block_to_slot(start:datetime, end:datetime) -> Slot:
+    """
+    Converts a time block given as datetimes to a Slot, partial minutes round outward.
+    :param start: start datetime
+    :param end: end datetime
+    :returns: Slot
+    """
+    return Slot(to_minutes(start), to_minutes(end, ceil=True))
@@ -0,0 +1,184 @@
+from datetime import date, datetime, time, timedelta, UTC
+from functools import cache
+from zoneinfo import ZoneInfo
+
+import numpy as np
+from django.conf import settings
+
+from interviews.slots import Slot, to_minutes
+
+DEFAULT_MEETING_MINUTES = (15, 30, 45, 60, 90, 120)
+DEFAULT_MEETING_WEIGHTS = (1, 4, 2, 4, 1, 1)
+
+# Fields hashed per busy block candidate
+INCLUDE, START, LENGTH = range(3)
+FIELDS = 3
+
+
+def mix(values:np.ndarray) -> np.ndarray:
+    """
+    Hashes uint64 values with the splitmix64 finalizer so every busy block is derived from its coordinates instead of
+    a shared random state.
+    :param values: uint64 array
+    :returns: uint64 array of hashes
+    """
+    with np.errstate(over='ignore'):
+        values = values + np.uint64(0x9E3779B97F4A7C15)
+        values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def to_unit(values:np.ndarray) -> np.ndarray:
+    """
+    Maps uint64 hashes to floats in [0, 1).
+    :param values: uint64 array
+    :returns: float64 array
+    """
+    return (values >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+class SyntheticCalendar:
+    """
+    Seeded synthetic free/busy provider for load tests and benchmarks. Every busy block is a hash of the seed, the
+    interviewer id, the date and its index, so an interviewer's calendar is the same in every process and for every
+    panel it is requested with, and a whole panel is generated with numpy in a handful of array operations.
+
+    Each interviewer works work_hours in one of timezones, each working day has density busy blocks on average that
+    start on a quarter hour within work hours and last one of meeting_minutes picked with meeting_weights.
+    """
+    def __init__(self, seed:int=0, density:float=2.0, timezones=('UTC',), meeting_minutes=DEFAULT_MEETING_MINUTES,
+                 meeting_weights=DEFAULT_MEETING_WEIGHTS, work_hours=(9, 17), weekends:bool=False):
+        if density < 0:
+            raise ValueError('density must not be negative')
+        if len(meeting_minutes) != len(meeting_weights) or not meeting_minutes:
+            raise ValueError('meeting_minutes and meeting_weights must have the same non zero length')
+        self.seed = seed
+        self.density = density
+        self.timezones = tuple(timezones)
+        self.zones = [ZoneInfo(timezone) for timezone in self.timezones]
+        self.meeting_minutes = np.asarray(meeting_minutes, dtype=np.int64)
+        self.meeting_cumulative_weights = np.cumsum(meeting_weights, dtype=np.float64) / sum(meeting_weights)
+        self.work_hours = work_hours
+        self.weekends = weekends
+        # Candidates per day, each kept with probability density / candidates so the mean is density
+        self.candidates = max(1, int(np.ceil(density * 2)))
+
+    def get_timezone_indexes(self, interviewer_ids:np.ndarray) -> np.ndarray:
+        """
+        Gets the index in timezones of each interviewer's time zone.
+        :param interviewer_ids: uint64 array of interviewer ids
+        :returns: int array of indexes into timezones
+        """
+        hashes = mix(mix(np.uint64(self.seed) ^ interviewer_ids) ^ np.uint64(0xC0FFEE))
+        return (hashes % np.uint64(len(self.timezones))).astype(np.int64)
+
+    def get_day_offsets(self, start_date:date, days:int) -> np.ndarray:
+        """
+        Gets the minutes to add to a local minute of day to get minutes since the Unix epoch for every time zone and
+        day, using each zone's UTC offset at noon so DST changes apply from the day they happen.
+        :param start_date: first day
+        :param days: number of days
+        :returns: int array of shape (len(timezones), days)
+        """
+        offsets = np.empty((len(self.zones), days), dtype=np.int64)
+        for zone_index, zone in enumerate(self.zones):
+            for day in range(days):
+                local_noon = datetime.combine(start_date + timedelta(days=day), time(12), tzinfo=zone)
+                offsets[zone_index, day] = to_minutes(local_noon) - 12 * 60
+        return offsets
+
+    def get_busy_minutes(self, interviewer_ids, start_date:date=None, days:int=7):
+        """
+        Generates the busy blocks of every interviewer as parallel arrays sorted by interviewer then start.
+        :param list[int] interviewer_ids: list of interviewer ids
+        :param start_date: first day, defaults to today in UTC
+        :param days: number of days
+        :returns: (interviewer_indexes, starts, ends) int arrays, starts and ends in minutes since the Unix epoch
+        """
+        start_date = start_date or datetime.now(UTC).date()
+        ids = np.asarray(interviewer_ids, dtype=np.uint64)
+        ordinals = np.arange(start_date.toordinal(), start_date.toordinal() + days, dtype=np.uint64)
+        candidates = np.arange(self.candidates * FIELDS, dtype=np.uint64).reshape(self.candidates, FIELDS)
+        # (interviewers, days, candidates, fields)
+        hashes = mix(mix(mix(np.uint64(self.seed) ^ ids)[:, None] ^ ordinals[None, :])[:, :, None, None] ^ candidates)
+        include = to_unit(hashes[..., INCLUDE]) < self.density / self.candidates
+        if not self.weekends:
+            weekdays = (np.arange(days) + start_date.weekday()) % 7
+            include &= (weekdays < 5)[None, :, None]
+
+        work_start, work_end = self.work_hours
+        quarters = (work_end - work_start) * 4
+        local_starts = work_start * 60 + (to_unit(hashes[..., START]) * quarters).astype(np.int64) * 15
+        lengths = self.meeting_minutes[np.searchsorted(
+            self.meeting_cumulative_weights, to_unit(hashes[..., LENGTH]), side='right'
+        ).clip(max=len(self.meeting_minutes) - 1)]
+        day_offsets = self.get_day_offsets(start_date, days)[self.get_timezone_indexes(ids)]
+
+        interviewer_indexes, day_indexes, _ = np.nonzero(include)
+        starts = local_starts[include] + day_offsets[interviewer_indexes, day_indexes]
+        ends = starts + lengths[include]
+        order = np.lexsort((ends, starts, interviewer_indexes))
+        return interviewer_indexes[order], starts[order], ends[order]
+
+    def get_time_blocks(self, interviewer_ids, start_date:date=None, days:int=7) -> list[list[Slot]]:
+        """
+        Generates the busy blocks of every interviewer as Slots, skipping the JSON round trip.
+        :param list[int] interviewer_ids: list of interviewer ids
+        :param start_date: first day, defaults to today in UTC
+        :param days: number of days
+        :returns: unavailable time blocks per interviewer [[(start_minute, end_minute), ...], ...]
+        """
+        interviewer_indexes, starts, ends = self.get_busy_minutes(interviewer_ids, start_date=start_date, days=days)
+        bounds = np.searchsorted(interviewer_indexes, np.arange(len(interviewer_ids) + 1))
+        starts, ends = starts.tolist(), ends.tolist()
+        return [
+            [Slot(start, end) for start, end in zip(starts[low:high], ends[low:high])]
+            for low, high in zip(bounds[:-1].tolist(), bounds[1:].tolist())
+        ]
+
+    def get_free_busy_data(self, interviewer_ids, start_date:date=None, days:int=7) -> list[dict]:
+        """
+        Generates free/busy data in the same format as mock_availability.get_free_busy_data.
+        :param list[int] interviewer_ids: list of interviewer ids
+        :param start_date: first day, defaults to today in UTC
+        :param days: number of days
+        :returns: free/busy data [{'interviewerId': 1, 'busy': [{'start': '2025-01-22T10:00:00Z', 'end': ...}, ...]}, ...]
+        """
+        interviewer_indexes, starts, ends = self.get_busy_minutes(interviewer_ids, start_date=start_date, days=days)
+        bounds = np.searchsorted(interviewer_indexes, np.arange(len(interviewer_ids) + 1))
+        iso_starts = np.char.add(np.datetime_as_string(starts.astype('datetime64[m]'), unit='s'), 'Z').tolist()
+        iso_ends = np.char.add(np.datetime_as_string(ends.astype('datetime64[m]'), unit='s'), 'Z').tolist()
+        return [
+            {
+                'interviewerId': interviewer_id,
+                'busy': [{'start': start, 'end': end} for start, end in zip(iso_starts[low:high], iso_ends[low:high])]
+            }
+            for interviewer_id, low, high in zip(interviewer_ids, bounds[:-1].tolist(), bounds[1:].tolist())
+        ]
+
+    __call__ = get_free_busy_data
+
+
+@cache
+def get_synthetic_calendar(seed:int, density:float, timezones:tuple) -> SyntheticCalendar:
+    """
+    Gets a shared SyntheticCalendar for the given settings.
+    :param seed: random seed
+    :param density: average busy blocks per interviewer per working day
+    :param timezones: time zone names interviewers are spread across
+    :returns: SyntheticCalendar
+    """
+    return SyntheticCalendar(seed=seed, density=density, timezones=timezones)
+
+
+def get_provider() -> SyntheticCalendar:
+    """
+    Gets the synthetic free/busy provider, selected with FREE_BUSY_PROVIDER=synthetic or by setting
+    FREE_BUSY_SYNTHETIC_SEED.
+    :returns: SyntheticCalendar of the FREE_BUSY_SYNTHETIC_* settings
+    """
+    return get_synthetic_calendar(
+        settings.FREE_BUSY_SYNTHETIC_SEED or 0, settings.FREE_BUSY_SYNTHETIC_DENSITY,
+        tuple(settings.FREE_BUSY_SYNTHETIC_TIMEZONES)
+    )
@@ -0,0 +1,79 @@
+import logging
+
+from celery import shared_task
+
+from interviews.free_busy_cache import FreeBusyProviderError
+from interviews.helpers import get_batch_available_time_blocks
+from interviews.models import InterviewTemplate, InterviewAvailability, Reservation
+from interviews.reservations import reservation_holds
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(time_limit=600)
+def precompute_availability() -> int:
+    """
+    Precomputes and stores the available slots of every InterviewTemplate. Busy data is fetched once for every
+    interviewer across the templates. When the free/busy provider fails the templates are computed one at a time and
+    the ones it fails for are logged and keep their stored availability.
+    :returns: number of InterviewTemplates precomputed
+    """
+    interviews = list(InterviewTemplate.get_json_by_ids().values())
+    availability_requests = [
+        {'interviewers': interview.get('interviewers'), 'duration': interview['durationMinutes']} for interview in interviews
+    ]
+    try:
+        available_time_blocks_list = get_batch_available_time_blocks(availability_requests)
+    except FreeBusyProviderError:
+        logger.warning('Free/busy provider failed, precomputing templates one at a time', exc_info=True)
+        available_time_blocks_list = []
+        for interview, availability_request in zip(interviews, availability_requests):
+            try:
+                available_time_blocks_list.append(get_batch_available_time_blocks([availability_request])[0])
+            except FreeBusyProviderError:
+                logger.warning('Free/busy provider failed, availability of %s not precomputed',
+                               interview['interviewId'], exc_info=True)
+                available_time_blocks_list.append(None)
+    precomputed = 0
+    for interview, available_time_blocks in zip(interviews, available_time_blocks_list):
+        if available_time_blocks is not None:
+            InterviewAvailability.save_available_slots(interview['interviewId'], available_time_blocks)
+            precomputed += 1
+    return precomputed
+
+
+@shared_task(time_limit=60)
+def apply_busy_block_events(interviewer_id:int, events:list[dict]) -> int:
+    """
+    Updates stored availability after busy blocks were added to or removed from an interviewer's calendar.
+    :param interviewer_id: id of Interviewer whose calendar changed
+    :param events: busy block events [{'action': 'add', 'start': '2025-01-22T10:00:00Z', 'end': '2025-01-22T11:00:00Z'}, ...]
+    :returns: number of InterviewAvailability rows updated
+    """
+    return InterviewAvailability.apply_busy_block_events(interviewer_id, events)
+
+
+@shared_task(time_limit=60)
+def confirm_reservation(hold_id:str) -> bool:
+    """
+    Confirms a slot held in Redis into a Reservation. The hold becomes a booking in Redis first so the slot can not be
+    held again while the reservation is stored, and is released again if nothing could be stored. Once the
+    reservation is committed the booking is kept whatever happens to the availability update.
+    :param hold_id: holdId of the hold
+    :returns: True if the reservation is stored, False if the hold expired first or the slot is already booked
+    """
+    if Reservation.objects.filter(id=hold_id).exists():
+        return True
+    hold = reservation_holds.confirm(hold_id)
+    if hold is None:
+        return False
+    try:
+        reservation = Reservation.confirm_hold(hold)
+    except Exception:
+        reservation_holds.release(hold)
+        raise
+    if reservation is None:
+        # A reservation Redis no longer knew about books an interviewer of the panel
+        reservation_holds.release(hold)
+        return False
+    return True
@@ -1,14 +1,89 @@
-from datetime import datetime, time, UTC, date
-from django.test import TestCase
+import asyncio
+import io
+import json
+import os
+import random
+import re
+import redis
+import subprocess
+import sys
+import tempfile
+import threading
+import time as time_module
+import uuid
+from datetime import datetime, time, timedelta, UTC, date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+from zoneinfo import ZoneInfo
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
 from faker import Faker
 
-from interviews.models import InterviewTemplate, Interviewer
+from global_use.serializers import serialize_model
+from interviews.models import InterviewTemplate, Interviewer, InterviewAvailability, BusyBlock, Reservation
+from interviews.free_busy_files import FreeBusyDirectoryProvider, parse_ics_busy_blocks
+from interviews.tasks import confirm_reservation, precompute_availability
 from interviews.helpers import (
     set_time_to_nearest_half_hour,
     get_all_possible_time_blocks,
     get_time_blocks_from_busy_data,
-    get_all_available_time_blocks
+    get_time_blocks_from_busy_data_windows,
+    get_panel_unavailable_time_blocks,
+    merge_unavailable_time_blocks,
+    get_all_available_time_blocks,
+    get_batch_available_time_blocks,
+    iter_available_time_blocks,
+    update_available_time_blocks,
+    time_blocks_to_json,
+    time_blocks_from_json
 )
+from interviews.slots import Slot, time_block_to_slot, to_datetime
+from asgiref.sync import sync_to_async
+from interviews.availability_events import diff_slots, get_channel, get_event_hub, publish_availability_diff
+from interviews.async_free_busy import (
+    AsyncFreeBusyProvider,
+    FreeBusyProviderError,
+    HttpFreeBusyProvider,
+    MockAsyncFreeBusyProvider,
+    get_free_busy_data_async
+)
+from interviews.benchmarks import compare_results, get_cases, run_benchmarks, run_reservation_benchmark
+from interviews.bitmask import get_all_available_time_blocks_bitmask
+from interviews.db_slots import get_all_available_time_blocks_db
+from interviews.free_busy_cache import FreeBusyCache, free_busy_cache, get_free_busy_provider, invalidate_free_busy_data
+from interviews.http_free_busy import FreeBusyHttpProvider
+from interviews.mock_availability import get_free_busy_data
+from interviews.panel_cache import PanelUnionCache, panel_union_cache
+from interviews.reservations import ReservationHolds, iter_unheld_time_blocks, reservation_holds
+from interviews.synthetic_availability import SyntheticCalendar
+from interviews.working_hours import (
+    get_panel_working_hours, get_week_working_hours, get_working_hours_intersection, intersect_working_hours
+)
+from global_use.redis_client import get_redis_client
+
+
+def setUpModule():
+    # Keep the keys tests write apart from the ones the app uses when the tests run against redis1
+    free_busy_cache.key_prefix = 'test_free_busy_shared'
+    reservation_holds.key_prefix = 'test_holds_shared'
+
+
+def tearDownModule():
+    free_busy_cache.key_prefix = 'free_busy'
+    reservation_holds.key_prefix = 'holds'
+
+
+def get_test_redis_client():
+    """Gets the redis1 client or None when Redis is not configured or reachable so Redis tests can be skipped."""
+    client = get_redis_client()
+    try:
+        return client if client and client.ping() else None
+    except redis.RedisError:
+        return None
 
 
 interviewer_name_1 = Faker().name()
@@ -17,31 +92,52 @@ interviewer_name_2 = Faker().name()
 class InterviewsModelsTestCase(TestCase):
     @classmethod
     def setUpTestData(cls):
-        interviewer_1 = Interviewer.objects.create(name=interviewer_name_1)
-        interviewer_2 = Interviewer.objects.create(name=interviewer_name_2)
-        interview = InterviewTemplate.objects.create(name='technical', durationMinutes=60)
-        interview.interviewers.add(interviewer_1)
-        interview.interviewers.add(interviewer_2)
+        cls.interviewer_1 = Interviewer.objects.create(name=interviewer_name_1)
+        cls.interviewer_2 = Interviewer.objects.create(name=interviewer_name_2)
+        cls.interview = InterviewTemplate.objects.create(name='technical', durationMinutes=60)
+        cls.interview.interviewers.add(cls.interviewer_1)
+        cls.interview.interviewers.add(cls.interviewer_2)
 
     def test_interview_created(self):
-        interview = InterviewTemplate.objects.get(interviewId=1)
+        interview = InterviewTemplate.objects.get(interviewId=self.interview.interviewId)
         self.assertIsInstance(interview, InterviewTemplate)
         self.assertEqual(interview.name, 'technical')
         self.assertEqual(interview.durationMinutes, 60)
 
     def test_interviewers_created(self):
-        interviewer_1 = Interviewer.objects.get(id=1)
+        interviewer_1 = Interviewer.objects.get(id=self.interviewer_1.id)
         self.assertIsInstance(interviewer_1, Interviewer)
         self.assertEqual(interviewer_1.name, interviewer_name_1)
-        interviewer_2 = Interviewer.objects.get(id=2)
+        interviewer_2 = Interviewer.objects.get(id=self.interviewer_2.id)
         self.assertIsInstance(interviewer_2, Interviewer)
         self.assertEqual(interviewer_2.name, interviewer_name_2)
 
     def test_interview_get_json_by_id(self):
-        interview = InterviewTemplate.get_json_by_id(1)
-        self.assertEqual(interview['interviewId'], 1)
+        interview = InterviewTemplate.get_json_by_id(self.interview.interviewId)
+        self.assertEqual(interview['interviewId'], self.interview.interviewId)
         self.assertIsInstance(interview, dict)
 
+    def test_interview_get_json_by_id_queries(self):
+        with self.assertNumQueries(2):
+            interview = InterviewTemplate.get_json_by_id(self.interview.interviewId)
+        self.assertEqual({interviewer['name'] for interviewer in interview['interviewers']},
+                         {interviewer_name_1, interviewer_name_2})
+        self.assertEqual(interview['interviewers'][0]['start_time'], time(hour=9))
+
+    def test_interview_get_json_by_ids(self):
+        interviewers = list(Interviewer.objects.all())
+        for index in range(5):
+            InterviewTemplate.objects.create(name=f'panel {index}', durationMinutes=30).interviewers.add(*interviewers)
+        ids = list(InterviewTemplate.objects.values_list('interviewId', flat=True))
+        with self.assertNumQueries(2):
+            interviews = InterviewTemplate.get_json_by_ids(ids + [0])
+        self.assertEqual(sorted(interviews), sorted(ids))
+        self.assertTrue(all(len(interview['interviewers']) == 2 for interview in interviews.values()))
+        self.assertEqual(
+            InterviewTemplate.get_json_by_ids()[self.interview.interviewId],
+            InterviewTemplate.get_json_by_id(self.interview.interviewId)
+        )
+
 
 class InterviewsHelpersTestCase(TestCase):
     def test_set_time_to_nearest_half_hour(self):
@@ -88,30 +184,1331 @@ class InterviewsHelpersTestCase(TestCase):
         )
         time_blocks = get_all_possible_time_blocks(45)
         self.assertTrue(
-            all([time_block['start'].minute == 30 or time_block['start'].minute == 0 for time_block in time_blocks])
+            all([to_datetime(time_block.start).minute in (0, 30) for time_block in time_blocks])
         )
         self.assertTrue(
-            all([time_block['start'].time() >= time(hour=9) for time_block in time_blocks])
+            all([to_datetime(time_block.start).time() >= time(hour=9) for time_block in time_blocks])
         )
         self.assertTrue(
-            all([time_block['end'].time() <= time(hour=17) for time_block in time_blocks])
+            all([to_datetime(time_block.end).time() <= time(hour=17) for time_block in time_blocks])
+        )
+
+    def test_get_all_possible_time_blocks_horizon(self):
+        dt = datetime(year=2025, month=1, day=1, hour=9, minute=0, tzinfo=UTC)
+        time_blocks = get_all_possible_time_blocks(60 * 8, dt, days=14)
+        self.assertEqual(len(time_blocks), 10)
+        self.assertEqual(to_datetime(time_blocks[-1].start), datetime(year=2025, month=1, day=15, hour=9, tzinfo=UTC))
+
+    def test_iter_available_time_blocks_after(self):
+        dt = datetime(year=2025, month=1, day=1, hour=9, minute=0, tzinfo=UTC)
+        unavailable_time_blocks_list = [[time_block_to_slot(
+            datetime(year=2025, month=1, day=2, hour=9, tzinfo=UTC),
+            datetime(year=2025, month=1, day=2, hour=12, tzinfo=UTC))]]
+        time_blocks = list(iter_available_time_blocks(
+            [{'id': 1}], 60, dt=dt, unavailable_time_blocks_list=unavailable_time_blocks_list, days=14
+        ))
+        self.assertEqual(to_datetime(time_blocks[0].start), datetime(year=2025, month=1, day=2, hour=12, tzinfo=UTC))
+        after = to_datetime(time_blocks[20].start)
+        self.assertEqual(
+            list(iter_available_time_blocks(
+                [{'id': 1}], 60, dt=dt, unavailable_time_blocks_list=unavailable_time_blocks_list, days=14, after=after
+            )),
+            time_blocks[21:]
         )
 
     def test_get_time_blocks_from_busy_data(self):
         list_of_time_blocks = get_time_blocks_from_busy_data([1, 2])
         for time_blocks in list_of_time_blocks:
             for index in range(1, len(time_blocks)):
-                self.assertGreaterEqual(time_blocks[index]['start'], time_blocks[index - 1]['start'])
-                self.assertGreaterEqual(time_blocks[index]['end'], time_blocks[index - 1]['end'])
+                self.assertGreaterEqual(time_blocks[index].start, time_blocks[index - 1].start)
+                self.assertGreaterEqual(time_blocks[index].end, time_blocks[index - 1].end)
+
+    def test_merge_unavailable_time_blocks(self):
+        def block(start_hour, end_hour):
+            return time_block_to_slot(
+                datetime(year=2025, month=1, day=2, hour=start_hour, tzinfo=UTC),
+                datetime(year=2025, month=1, day=2, hour=end_hour, tzinfo=UTC))
+        self.assertEqual(
+            merge_unavailable_time_blocks([
+                [block(9, 10), block(14, 15)],
+                [block(9, 11), block(16, 17)],
+                [block(11, 12), block(14, 16)],
+            ]),
+            [block(9, 12), block(14, 17)]
+        )
+        self.assertEqual(merge_unavailable_time_blocks([[], []]), [])
 
     def test_get_all_available_time_blocks(self):
-        unavailable_time_blocks = [[{
-            'start': datetime(year=2025, month=1, day=2, hour=9, tzinfo=UTC),
-            'end': datetime(year=2025, month=1, day=2, hour=17, tzinfo=UTC)
-        }]]
+        unavailable_time_blocks = [[time_block_to_slot(
+            datetime(year=2025, month=1, day=2, hour=9, tzinfo=UTC),
+            datetime(year=2025, month=1, day=2, hour=17, tzinfo=UTC))]]
         self.assertEqual(
             len(get_all_available_time_blocks(
                 [dict(id=1)], 60*8, dt=datetime(year=2025, month=1, day=1, hour=9, tzinfo=UTC), unavailable_time_blocks_list=unavailable_time_blocks
             )),
             3
         )
+
+    def test_get_batch_available_time_blocks(self):
+        dt = datetime(year=2025, month=1, day=1, hour=9, tzinfo=UTC)
+        unavailable_time_blocks_by_interviewer = {
+            1: [time_block_to_slot(
+                datetime(year=2025, month=1, day=2, hour=9, tzinfo=UTC),
+                datetime(year=2025, month=1, day=2, hour=17, tzinfo=UTC))],
+            2: [time_block_to_slot(
+                datetime(year=2025, month=1, day=3, hour=9, tzinfo=UTC),
+                datetime(year=2025, month=1, day=3, hour=10, tzinfo=UTC))],
+        }
+        panels = [
+            {'interviewers': [dict(id=1)], 'duration': 60 * 8},
+            {'interviewers': [dict(id=1), dict(id=2)], 'duration': 60 * 8},
+            {'interviewers': [dict(id=2)], 'duration': 60},
+        ]
+        available_time_blocks_list = get_batch_available_time_blocks(
+            panels, dt=dt, unavailable_time_blocks_by_interviewer=unavailable_time_blocks_by_interviewer
+        )
+        self.assertEqual([len(available_time_blocks) for available_time_blocks in available_time_blocks_list], [3, 2, 58])
+        for panel, available_time_blocks in zip(panels, available_time_blocks_list):
+            self.assertEqual(
+                available_time_blocks,
+                get_all_available_time_blocks(
+                    panel['interviewers'], panel['duration'], dt=dt,
+                    unavailable_time_blocks_list=[unavailable_time_blocks_by_interviewer[interviewer['id']] for interviewer in panel['interviewers']]
+                )
+            )
+
+    def test_get_all_available_time_blocks_limit(self):
+        dt = datetime(year=2025, month=1, day=1, hour=9, tzinfo=UTC)
+        unavailable_time_blocks = [[time_block_to_slot(
+            datetime(year=2025, month=1, day=2, hour=10, tzinfo=UTC),
+            datetime(year=2025, month=1, day=2, hour=16, tzinfo=UTC))]]
+        available_time_blocks = get_all_available_time_blocks(
+            [dict(id=1)], 60, dt=dt, unavailable_time_blocks_list=unavailable_time_blocks
+        )
+        for backend in ['python', 'bitmask']:
+            for limit in [0, 1, 3, len(available_time_blocks) + 1]:
+                self.assertEqual(
+                    get_all_available_time_blocks(
+                        [dict(id=1)], 60, dt=dt, unavailable_time_blocks_list=unavailable_time_blocks,
+                        backend=backend, limit=limit
+                    ),
+                    available_time_blocks[:limit]
+                )
+        self.assertEqual(
+            [to_datetime(time_block.start).hour for time_block in available_time_blocks[:3]], [9, 16, 9]
+        )
+
+    def test_update_available_time_blocks(self):
+        dt = datetime(year=2025, month=1, day=1, hour=9, tzinfo=UTC)
+        busy_day = time_block_to_slot(
+            datetime(year=2025, month=1, day=2, hour=9, tzinfo=UTC),
+            datetime(year=2025, month=1, day=2, hour=17, tzinfo=UTC))
+        busy_hour = time_block_to_slot(
+            datetime(year=2025, month=1, day=3, hour=10, tzinfo=UTC),
+            datetime(year=2025, month=1, day=3, hour=11, tzinfo=UTC))
+        possible_time_blocks = get_all_possible_time_blocks(60, dt=dt)
+        available_time_blocks = get_all_available_time_blocks(
+            [dict(id=1)], 60, dt=dt, unavailable_time_blocks_list=[[busy_day]]
+        )
+        self.assertEqual(
+            update_available_time_blocks(available_time_blocks, possible_time_blocks, [], [busy_day], []),
+            possible_time_blocks
+        )
+        self.assertEqual(
+            update_available_time_blocks(available_time_blocks, possible_time_blocks, [busy_hour], [busy_day], [busy_hour]),
+            get_all_available_time_blocks([dict(id=1)], 60, dt=dt, unavailable_time_blocks_list=[[busy_hour]])
+        )
+        self.assertEqual(
+            len(update_available_time_blocks(available_time_blocks, possible_time_blocks, [busy_hour], [], [])),
+            len(available_time_blocks) - 3
+        )
+
+
+class InterviewsViewsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        interviewer_1 = Interviewer.objects.create(name=interviewer_name_1)
+        interviewer_2 = Interviewer.objects.create(name=interviewer_name_2)
+        cls.interview = InterviewTemplate.objects.create(name='technical', durationMinutes=60)
+        cls.interview.interviewers.add(interviewer_1, interviewer_2)
+        cls.interviewer_ids = [interviewer_1.id, interviewer_2.id]
+
+    def test_interviews_availability_batch(self):
+        response = self.client.post(
+            '/interviews/availability',
+            data={
+                'templates': [self.interview.interviewId],
+                'panels': [{'interviewer_ids': self.interviewer_ids, 'duration': 30}]
+            },
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body['templates'][0]['interviewId'], self.interview.interviewId)
+        self.assertIn('availableSlots', body['templates'][0])
+        self.assertEqual(body['panels'][0]['interviewer_ids'], self.interviewer_ids)
+        self.assertIn('availableSlots', body['panels'][0])
+
+    def test_free_busy_provider_errors(self):
+        url = f'/interviews/{self.interview.interviewId}/availability'
+        invalidate_free_busy_data(self.interviewer_ids)
+        error = FreeBusyProviderError(f'Free/busy provider failed for interviewer {self.interviewer_ids[0]}')
+        with patch.object(free_busy_cache, 'fetch', side_effect=error):
+            for query in ['', '?days=14', '?days=14&stream=1']:
+                response = self.client.get(f'{url}{query}')
+                self.assertEqual(response.status_code, 502)
+                self.assertEqual(response.json(), {'message': str(error)})
+            response = self.client.post(
+                '/interviews/availability', data={'templates': [self.interview.interviewId]},
+                content_type='application/json'
+            )
+            self.assertEqual(response.status_code, 502)
+
+    def test_interviews_availability_batch_invalid(self):
+        response = self.client.post('/interviews/availability', data='not json', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(
+            '/interviews/availability', data={'templates': [self.interview.interviewId + 100]},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get('/interviews/availability')
+        self.assertEqual(response.status_code, 405)
+
+    def test_interviews_availability_serves_stored_slots(self):
+        start = (datetime.now(UTC) + timedelta(days=2)).replace(second=0, microsecond=0)
+        slot = time_block_to_slot(start, start + timedelta(hours=1))
+        expired_slot = time_block_to_slot(
+            datetime(year=2025, month=1, day=1, hour=9, tzinfo=UTC), datetime(year=2025, month=1, day=1, hour=10, tzinfo=UTC)
+        )
+        InterviewAvailability.objects.create(
+            interview=self.interview, availableSlots=[expired_slot, slot], computedAt=datetime.now(UTC)
+        )
+        response = self.client.get(f'/interviews/{self.interview.interviewId}/availability')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['availableSlots'], [
+            {'start': start.isoformat().removesuffix('+00:00') + 'Z',
+             'end': (start + timedelta(hours=1)).isoformat().removesuffix('+00:00') + 'Z'}
+        ])
+
+    def test_interviews_availability_limit(self):
+        start = (datetime.now(UTC) + timedelta(days=2)).replace(minute=0, second=0, microsecond=0)
+        slots = [time_block_to_slot(start + timedelta(hours=hour), start + timedelta(hours=hour + 1)) for hour in range(3)]
+        InterviewAvailability.save_available_slots(self.interview.interviewId, slots)
+        response = self.client.get(f'/interviews/{self.interview.interviewId}/availability?limit=2')
+        self.assertEqual(response.json()['availableSlots'], time_blocks_to_json(slots[:2]))
+        InterviewAvailability.objects.all().delete()
+        response = self.client.get(f'/interviews/{self.interview.interviewId}/availability?limit=1')
+        self.assertLessEqual(len(response.json()['availableSlots']), 1)
+        self.assertFalse(InterviewAvailability.objects.exists())
+        for limit in ['a', '-1']:
+            response = self.client.get(f'/interviews/{self.interview.interviewId}/availability?limit={limit}')
+            self.assertEqual(response.status_code, 400)
+
+    def test_interviews_availability_pagination(self):
+        url = f'/interviews/{self.interview.interviewId}/availability'
+        with patch('interviews.helpers.get_time_blocks_from_busy_data', return_value=[[], []]):
+            slots = self.client.get(f'{url}?days=28').json()['availableSlots']
+            pages, cursor = [], ''
+            while cursor is not None:
+                body = self.client.get(f'{url}?days=28&page_size=25&after={cursor}').json()
+                self.assertLessEqual(len(body['availableSlots']), 25)
+                # The streamed page carries the same cursor
+                response = self.client.get(f'{url}?days=28&page_size=25&after={cursor}&stream=1')
+                self.assertEqual(json.loads(b''.join(response.streaming_content)), body)
+                pages.extend(body['availableSlots'])
+                cursor = body['next']
+        self.assertGreater(len(slots), 25)
+        self.assertEqual(pages, slots)
+        for query in ['days=0', 'days=1000', 'page_size=0', 'weeks=a', 'after=2025-01-01T09:00:00']:
+            self.assertEqual(self.client.get(f'{url}?{query}').status_code, 400)
+
+    def test_interviews_availability_stream(self):
+        url = f'/interviews/{self.interview.interviewId}/availability'
+        with patch('interviews.helpers.get_time_blocks_from_busy_data', return_value=[[], []]):
+            expected = self.client.get(f'{url}?weeks=2').json()
+            response = self.client.get(f'{url}?weeks=2&stream=1')
+        self.assertTrue(response.streaming)
+        self.assertEqual(json.loads(b''.join(response.streaming_content)), expected)
+
+    async def test_interviews_availability_stream_asgi(self):
+        url = f'/interviews/{self.interview.interviewId}/availability'
+        with patch('interviews.helpers.get_time_blocks_from_busy_data', return_value=[[], []]):
+            expected = (await self.async_client.get(f'{url}?weeks=2')).json()
+            response = await self.async_client.get(f'{url}?weeks=2&stream=1')
+            # An async iterator is streamed by the ASGI server instead of buffered into a list
+            self.assertTrue(response.is_async)
+            content = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(json.loads(content), expected)
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://127.0.0.1:1',
+    }})
+    def test_interviews_availability_cache_unavailable(self):
+        with self.assertLogs('global_use.cache', 'WARNING'):
+            response = self.client.get(f'/interviews/{self.interview.interviewId}/availability')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('availableSlots', response.json())
+
+    def test_interviews_availability_recomputes_stale_slots(self):
+        computed_at = datetime.now(UTC) - timedelta(days=1)
+        InterviewAvailability.objects.create(interview=self.interview, availableSlots=[], computedAt=computed_at)
+        response = self.client.get(f'/interviews/{self.interview.interviewId}/availability')
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(InterviewAvailability.objects.get(interview=self.interview).computedAt, computed_at)
+
+    def test_interviews_availability_etag(self):
+        url = f'/interviews/{self.interview.interviewId}/availability'
+        # Storing the availability computed by the first request changes the ETag
+        self.client.get(url)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers['ETag']
+        self.assertIn('no-cache', response.headers['Cache-Control'])
+        with patch.object(InterviewAvailability, 'get_available_slots', side_effect=AssertionError('slots computed')):
+            response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response.headers['ETag'], etag)
+
+        self.assertNotEqual(self.client.get(f'{url}?limit=3').headers['ETag'], etag)
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': '"stale"'}).status_code, 200)
+        invalidate_free_busy_data([self.interviewer_ids[1]])
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        etag = response.headers['ETag']
+        InterviewTemplate.objects.filter(interviewId=self.interview.interviewId).update(durationMinutes=30)
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': etag}).status_code, 200)
+
+        with override_settings(FREE_BUSY_CACHE_TTL=0):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ETag', response.headers)
+
+    def test_interviews_availability_cache(self):
+        url = f'/interviews/{self.interview.interviewId}/availability?limit=5'
+        self.client.get(url)
+        response = self.client.get(url)
+        # Every request with the same ETag is served from the shared cache
+        with patch.object(InterviewAvailability, 'get_available_slots', side_effect=AssertionError('slots computed')):
+            cached_response = self.client.get(url)
+        self.assertEqual(cached_response.status_code, 200)
+        self.assertEqual(cached_response.content, response.content)
+        self.assertEqual(cached_response.headers['ETag'], response.headers['ETag'])
+
+    def test_interviewer_busy_blocks(self):
+        start = (datetime.now(UTC) + timedelta(days=2)).replace(minute=0, second=0, microsecond=0)
+        slots = [time_block_to_slot(start + timedelta(hours=hour), start + timedelta(hours=hour + 1)) for hour in range(3)]
+        InterviewAvailability.save_available_slots(self.interview.interviewId, slots)
+        response = self.client.post(
+            f'/interviews/interviewers/{self.interviewer_ids[0]}/busy',
+            data={'events': [{
+                'action': 'add',
+                'start': (start + timedelta(minutes=90)).isoformat(),
+                'end': (start + timedelta(minutes=120)).isoformat()
+            }]},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'interviewerId': self.interviewer_ids[0], 'updated': 1})
+        self.assertEqual(InterviewAvailability.objects.get(interview=self.interview).get_slots(), [slots[0], slots[2]])
+
+    def test_interviewer_busy_blocks_survive_recompute(self):
+        day = datetime.now(UTC).date() + timedelta(days=2)
+        while day.weekday() >= 5:
+            day += timedelta(days=1)
+        start = datetime.combine(day, time(0), tzinfo=UTC)
+        event = {'action': 'add', 'start': start.isoformat(), 'end': (start + timedelta(days=1)).isoformat()}
+        url = f'/interviews/interviewers/{self.interviewer_ids[0]}/busy'
+        self.client.post(url, data={'events': [event]}, content_type='application/json')
+        self.assertEqual(BusyBlock.objects.filter(interviewer_id=self.interviewer_ids[0]).count(), 1)
+        precompute_availability()
+        busy_slot = time_block_to_slot(start, start + timedelta(days=1))
+        slots = InterviewAvailability.objects.get(interview=self.interview).get_slots()
+        self.assertTrue(slots)
+        self.assertFalse([slot for slot in slots if slot.start < busy_slot.end and slot.end > busy_slot.start])
+        self.client.post(url, data={'events': [dict(event, action='remove')]}, content_type='application/json')
+        self.assertFalse(BusyBlock.objects.filter(interviewer_id=self.interviewer_ids[0]).exists())
+
+    def test_interviewer_busy_blocks_invalid(self):
+        event = {'action': 'add', 'start': '2025-01-22T10:00:00Z', 'end': '2025-01-22T11:00:00Z'}
+        for events in [[dict(event, action='move')], [dict(event, start='2025-01-22T10:00:00')], [dict(event, end=event['start'])]]:
+            response = self.client.post(
+                f'/interviews/interviewers/{self.interviewer_ids[0]}/busy', data={'events': events},
+                content_type='application/json'
+            )
+            self.assertEqual(response.status_code, 400)
+        response = self.client.post(
+            '/interviews/interviewers/0/busy', data={'events': [event]}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+class InterviewsTasksTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        interviewer = Interviewer.objects.create(name=interviewer_name_1)
+        for duration in [30, 60]:
+            interview = InterviewTemplate.objects.create(name='technical', durationMinutes=duration)
+            interview.interviewers.add(interviewer)
+
+    def test_precompute_availability(self):
+        self.assertEqual(precompute_availability(), 2)
+        self.assertEqual(InterviewAvailability.objects.count(), 2)
+        for availability in InterviewAvailability.objects.all():
+            self.assertFalse(availability.is_stale())
+            for slot in availability.get_slots():
+                self.assertEqual(slot.end - slot.start, availability.interview.durationMinutes)
+
+    def test_precompute_availability_provider_errors(self):
+        failing_interviewer = Interviewer.objects.create(name=interviewer_name_2)
+        InterviewTemplate.objects.create(name='culture', durationMinutes=60).interviewers.add(failing_interviewer)
+        fetch = free_busy_cache.fetch
+
+        def fetch_or_fail(interviewer_ids, window_start):
+            if failing_interviewer.id in interviewer_ids:
+                raise FreeBusyProviderError(f'Free/busy provider failed for interviewer {failing_interviewer.id}')
+            return fetch(interviewer_ids, window_start)
+
+        invalidate_free_busy_data([failing_interviewer.id])
+        with patch.object(free_busy_cache, 'fetch', side_effect=fetch_or_fail):
+            with self.assertLogs('interviews.tasks', 'WARNING'):
+                self.assertEqual(precompute_availability(), 2)
+        self.assertEqual(InterviewAvailability.objects.count(), 2)
+
+
+class InterviewsBitmaskTestCase(TestCase):
+    def test_get_all_available_time_blocks_bitmask(self):
+        unavailable_time_blocks = [[time_block_to_slot(
+            datetime(year=2025, month=1, day=2, hour=9, tzinfo=UTC),
+            datetime(year=2025, month=1, day=2, hour=17, tzinfo=UTC))]]
+        self.assertEqual(
+            len(get_all_available_time_blocks_bitmask(
+                [dict(id=1)], 60*8, dt=datetime(year=2025, month=1, day=1, hour=9, tzinfo=UTC), unavailable_time_blocks_list=unavailable_time_blocks
+            )),
+            3
+        )
+
+    def test_get_all_available_time_blocks_bitmask_matches_merge(self):
+        rng = random.Random(0)
+        for _ in range(100):
+            dt = datetime(year=2025, month=1, day=1, tzinfo=UTC) + timedelta(minutes=rng.randint(0, 60 * 24 * 14))
+            duration = rng.choice([15, 30, 45, 60, 90, 480])
+            unavailable_time_blocks_list = []
+            for _ in range(rng.randint(1, 5)):
+                time_blocks = []
+                for _ in range(rng.randint(1, 8)):
+                    start = dt.replace(second=0, microsecond=0) + timedelta(minutes=rng.randint(0, 60 * 24 * 8))
+                    time_blocks.append(time_block_to_slot(start, start + timedelta(minutes=rng.randint(1, 180))))
+                unavailable_time_blocks_list.append(sorted(time_blocks))
+            interviewers = [dict(id=index) for index in range(len(unavailable_time_blocks_list))]
+            self.assertEqual(
+                get_all_available_time_blocks_bitmask(
+                    interviewers, duration, dt=dt, unavailable_time_blocks_list=unavailable_time_blocks_list
+                ),
+                get_all_available_time_blocks(
+                    interviewers, duration, dt=dt, unavailable_time_blocks_list=unavailable_time_blocks_list
+                )
+            )
+
+    def test_bitmask_matches_merge_across_time_zones(self):
+        # Overnight and 24 hour shifts in time zones with quarter and half hour offsets
+        panel = [
+            {'id': 1, 'timezone': 'Asia/Kolkata', 'start_time': time(6), 'end_time': time(15)},
+            {'id': 2, 'timezone': 'Australia/Lord_Howe', 'start_time': time(5, 45), 'end_time': time(23, 15)},
+            {'id': 3, 'timezone': 'Asia/Kolkata', 'start_time': time(12, 15), 'end_time': time(12, 15)},
+        ]
+        cases = [(panel, 90, datetime(2025, 11, 9, 6, tzinfo=UTC), [[], [], []])]
+        rng = random.Random(2)
+        timezones = ['UTC', 'America/New_York', 'Asia/Kolkata', 'Asia/Kathmandu', 'Australia/Lord_Howe', 'Pacific/Chatham']
+        for _ in range(50):
+            dt = datetime(year=2025, month=1, day=1, tzinfo=UTC) + timedelta(minutes=rng.randint(0, 60 * 24 * 365))
+            interviewers, unavailable_time_blocks_list = [], []
+            for index in range(rng.randint(1, 3)):
+                start_time = time(rng.randint(0, 23), rng.choice([0, 15, 30, 45]))
+                end_time = rng.choice([start_time, time(rng.randint(0, 23), rng.choice([0, 15, 30, 45]))])
+                interviewers.append(
+                    {'id': index, 'timezone': rng.choice(timezones), 'start_time': start_time, 'end_time': end_time}
+                )
+                start = dt.replace(second=0, microsecond=0) + timedelta(minutes=rng.randint(0, 60 * 24 * 8))
+                unavailable_time_blocks_list.append(
+                    [time_block_to_slot(start, start + timedelta(minutes=rng.randint(1, 600)))]
+                )
+            cases.append((interviewers, rng.choice([30, 45, 90, 480]), dt, unavailable_time_blocks_list))
+        for interviewers, duration, dt, unavailable_time_blocks_list in cases:
+            self.assertEqual(
+                get_all_available_time_blocks_bitmask(
+                    interviewers, duration, dt=dt, unavailable_time_blocks_list=unavailable_time_blocks_list
+                ),
+                get_all_available_time_blocks(
+                    interviewers, duration, dt=dt, unavailable_time_blocks_list=unavailable_time_blocks_list
+                )
+            )
+
+
+class InterviewsFreeBusyCacheTestCase(TestCase):
+    def setUp(self):
+        self.client = get_test_redis_client()
+        if not self.client:
+            self.skipTest('Redis is not available')
+        self.provider_calls = []
+        self.cache = FreeBusyCache(provider=self.provider, key_prefix='test_free_busy')
+        self.window_start = date(year=2025, month=1, day=1)
+
+    def tearDown(self):
+        self.cache.invalidate([1, 2, 3])
+        self.cache.reset_stats()
+
+    def provider(self, interviewer_ids, start_date=None):
+        self.provider_calls.append(list(interviewer_ids))
+        return get_free_busy_data(interviewer_ids, start_date=start_date)
+
+    def test_get_free_busy_data(self):
+        first = self.cache.get_free_busy_data([1, 2], window_start=self.window_start)
+        second = self.cache.get_free_busy_data([2, 1, 3], window_start=self.window_start)
+        self.assertEqual([data['interviewerId'] for data in second], [2, 1, 3])
+        self.assertEqual(second[:2], first[::-1])
+        self.assertEqual(self.provider_calls, [[1, 2], [3]])
+        self.assertEqual(self.cache.get_stats(), {'hits': 2, 'misses': 3})
+
+    def test_redis_errors(self):
+        cache = FreeBusyCache(provider=self.provider, client=redis.Redis(host='127.0.0.1', port=1))
+        with self.assertLogs('interviews.free_busy_cache', 'WARNING'):
+            self.assertEqual(cache.invalidate([1, 2]), 0)
+            self.assertEqual(len(cache.get_free_busy_data([1, 2], window_start=self.window_start)), 2)
+
+    def test_invalidate(self):
+        self.cache.get_free_busy_data([1, 2], window_start=self.window_start)
+        self.assertEqual(self.cache.invalidate([1], window_start=self.window_start), 1)
+        self.cache.get_free_busy_data([1, 2], window_start=self.window_start)
+        self.assertEqual(self.provider_calls, [[1, 2], [1]])
+        self.assertEqual(self.cache.invalidate([1, 2]), 2)
+        self.assertEqual(self.cache.invalidate([1, 2]), 0)
+
+
+class InterviewsStoredBusyBlocksTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.interviewer_1 = Interviewer.objects.create(name=interviewer_name_1)
+        cls.interviewer_2 = Interviewer.objects.create(name=interviewer_name_2)
+        BusyBlock.bulk_import([
+            {'interviewerId': cls.interviewer_1.id, 'busy': [
+                {'start': '2025-01-02T13:00:00Z', 'end': '2025-01-02T14:00:00Z'},
+                {'start': '2025-01-02T09:00:00Z', 'end': '2025-01-02T10:00:00Z'},
+            ]},
+            {'interviewerId': cls.interviewer_2.id, 'busy': [
+                {'start': '2025-01-02T10:00:00Z', 'end': '2025-01-02T11:00:00Z'},
+            ]},
+            {'interviewerId': 0, 'busy': [{'start': '2025-01-02T10:00:00Z', 'end': '2025-01-02T11:00:00Z'}]},
+        ])
+
+    def test_bulk_import(self):
+        self.assertEqual(BusyBlock.objects.count(), 3)
+        self.assertEqual(
+            BusyBlock.bulk_import([{'interviewerId': self.interviewer_2.id, 'busy': []}], replace=True), 0
+        )
+        self.assertEqual(BusyBlock.objects.count(), 2)
+
+    def test_get_time_blocks_by_interviewer(self):
+        unavailable_time_blocks_by_interviewer = BusyBlock.get_time_blocks_by_interviewer(
+            [self.interviewer_1.id, self.interviewer_2.id],
+            datetime(year=2025, month=1, day=2, hour=9, minute=30, tzinfo=UTC),
+            datetime(year=2025, month=1, day=2, hour=17, tzinfo=UTC)
+        )
+        self.assertEqual(unavailable_time_blocks_by_interviewer[self.interviewer_1.id], [
+            time_block_to_slot(
+                datetime(year=2025, month=1, day=2, hour=9, tzinfo=UTC),
+                datetime(year=2025, month=1, day=2, hour=10, tzinfo=UTC)),
+            time_block_to_slot(
+                datetime(year=2025, month=1, day=2, hour=13, tzinfo=UTC),
+                datetime(year=2025, month=1, day=2, hour=14, tzinfo=UTC)),
+        ])
+        self.assertEqual(len(unavailable_time_blocks_by_interviewer[self.interviewer_2.id]), 1)
+        free_busy_data = BusyBlock.get_free_busy_data(
+            [self.interviewer_2.id], start_date=date(year=2025, month=1, day=1)
+        )
+        self.assertEqual(free_busy_data, [{'interviewerId': self.interviewer_2.id, 'busy': [
+            {'start': '2025-01-02T10:00:00Z', 'end': '2025-01-02T11:00:00Z'}
+        ]}])
+
+    def test_get_free_interviewer_ids(self):
+        def free_between(start_hour, end_hour):
+            return BusyBlock.get_free_interviewer_ids(
+                datetime(year=2025, month=1, day=2, hour=start_hour, tzinfo=UTC),
+                datetime(year=2025, month=1, day=2, hour=end_hour, tzinfo=UTC),
+                interviewer_ids=[self.interviewer_1.id, self.interviewer_2.id]
+            )
+        self.assertEqual(free_between(9, 10), [self.interviewer_2.id])
+        self.assertEqual(free_between(10, 11), [self.interviewer_1.id])
+        self.assertEqual(free_between(9, 11), [])
+        self.assertEqual(free_between(11, 13), [self.interviewer_1.id, self.interviewer_2.id])
+
+    def test_iter_available_slots_backend(self):
+        interview = InterviewTemplate.objects.create(name='technical', durationMinutes=60)
+        interview.interviewers.add(self.interviewer_1)
+        interview_json = InterviewTemplate.get_json_by_id(interview.interviewId)
+        expected = get_all_available_time_blocks_db(interview_json['interviewers'], 60, days=14)
+        # Horizons other than the stored one are computed by the configured backend, not from the provider
+        with override_settings(INTERVIEWS_AVAILABILITY_BACKEND='postgres'), \
+                patch.object(free_busy_cache, 'get_free_busy_data', side_effect=AssertionError('provider read')):
+            self.assertEqual(list(InterviewAvailability.iter_available_slots(interview_json, days=14)), expected)
+            self.assertEqual(list(InterviewAvailability.iter_available_slots(
+                interview_json, days=14, after=to_datetime(expected[2].start)
+            )), expected[3:])
+
+    def test_get_all_available_time_blocks_db(self):
+        rng = random.Random(0)
+        dt = datetime(year=2025, month=1, day=1, hour=10, minute=17, tzinfo=UTC)
+        interviewers = [dict(id=self.interviewer_1.id), dict(id=self.interviewer_2.id)]
+        free_busy_data = []
+        for interviewer in interviewers:
+            busy = []
+            for _ in range(10):
+                start = datetime(year=2025, month=1, day=2, hour=9, tzinfo=UTC) + timedelta(minutes=15 * rng.randint(0, 4 * 24 * 7))
+                busy.append({'start': start.isoformat(), 'end': (start + timedelta(minutes=15 * rng.randint(1, 8))).isoformat()})
+            free_busy_data.append({'interviewerId': interviewer['id'], 'busy': busy})
+        BusyBlock.bulk_import(free_busy_data, replace=True)
+        unavailable_time_blocks_by_interviewer = BusyBlock.get_time_blocks_by_interviewer(
+            [interviewer['id'] for interviewer in interviewers], dt, dt + timedelta(days=8)
+        )
+        for duration in [30, 45, 60, 60 * 8]:
+            self.assertEqual(
+                get_all_available_time_blocks_db(interviewers, duration, dt=dt),
+                get_all_available_time_blocks(
+                    interviewers, duration, dt=dt,
+                    unavailable_time_blocks_list=list(unavailable_time_blocks_by_interviewer.values())
+                )
+            )
+        self.assertEqual(
+            get_all_available_time_blocks(interviewers, 60, dt=dt, backend='postgres'),
+            get_all_available_time_blocks_db(interviewers, 60, dt=dt)
+        )
+
+    def test_import_busy_blocks_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = os.path.join(directory, 'busy.json')
+            with open(json_path, 'w') as file:
+                json.dump([{'interviewerId': self.interviewer_1.id, 'busy': [
+                    {'start': '2025-01-03T09:00:00Z', 'end': '2025-01-03T10:00:00Z'}
+                ]}], file)
+            ics_path = os.path.join(directory, f'{self.interviewer_2.id}.ics')
+            with open(ics_path, 'w') as file:
+                file.write(
+                    'BEGIN:VCALENDAR\r\nBEGIN:VFREEBUSY\r\n'
+                    'FREEBUSY:20250103T090000Z/20250103T100000Z,20250103T110000Z/PT30M\r\n'
+                    'END:VFREEBUSY\r\nEND:VCALENDAR\r\n'
+                )
+            call_command('import_busy_blocks', json_path, ics_path, '--replace', stdout=io.StringIO())
+        self.assertEqual(BusyBlock.objects.filter(interviewer=self.interviewer_1).count(), 1)
+        self.assertEqual(BusyBlock.objects.filter(interviewer=self.interviewer_2).count(), 2)
+
+    def test_parse_ics_busy_blocks(self):
+        self.assertEqual(parse_ics_busy_blocks(
+            'BEGIN:VCALENDAR\n'
+            'BEGIN:VEVENT\nDTSTART;TZID=America/New_York:20250102T090000\nDTEND;TZID=America/New_York:\n 20250102T100000\nEND:VEVENT\n'
+            'BEGIN:VEVENT\nDTSTART:20250103T090000Z\nDURATION:PT1H30M\nEND:VEVENT\n'
+            'BEGIN:VEVENT\nDTSTART:20250104T090000Z\nDTEND:20250104T100000Z\nTRANSP:TRANSPARENT\nEND:VEVENT\n'
+            'BEGIN:VEVENT\nDTSTART;VALUE=DATE:20250105\nEND:VEVENT\n'
+            # The alarm's DURATION is how long apart its repeats are, not the event's duration
+            'BEGIN:VEVENT\nDTSTART:20250106T090000Z\nDURATION:PT1H\n'
+            'BEGIN:VALARM\nACTION:DISPLAY\nTRIGGER:-PT15M\nDURATION:PT5M\nREPEAT:2\nEND:VALARM\nEND:VEVENT\n'
+            'END:VCALENDAR\n'
+        ), [
+            {'start': '2025-01-02T14:00:00Z', 'end': '2025-01-02T15:00:00Z'},
+            {'start': '2025-01-03T09:00:00Z', 'end': '2025-01-03T10:30:00Z'},
+            {'start': '2025-01-05T00:00:00Z', 'end': '2025-01-06T00:00:00Z'},
+            {'start': '2025-01-06T09:00:00Z', 'end': '2025-01-06T10:00:00Z'},
+        ])
+
+    def test_parse_ics_recurring_busy_blocks(self):
+        text = (
+            'BEGIN:VCALENDAR\n'
+            'BEGIN:VEVENT\nUID:standup\nDTSTART;TZID=America/New_York:20250303T090000\n'
+            'DTEND;TZID=America/New_York:20250303T093000\nRRULE:FREQ=WEEKLY;COUNT=4\n'
+            'EXDATE;TZID=America/New_York:20250317T090000\nEND:VEVENT\n'
+            'BEGIN:VEVENT\nUID:standup\nRECURRENCE-ID;TZID=America/New_York:20250324T090000\n'
+            'DTSTART;TZID=America/New_York:20250324T150000\nDTEND;TZID=America/New_York:20250324T153000\nEND:VEVENT\n'
+            'BEGIN:VEVENT\nDTSTART;VALUE=DATE:20250228\nRRULE:FREQ=DAILY;UNTIL=20250301\nEND:VEVENT\n'
+            'END:VCALENDAR\n'
+        )
+        # The weekly meeting keeps its New York time across the daylight saving time change on March 9th
+        self.assertEqual(parse_ics_busy_blocks(
+            text, since=datetime(2025, 3, 1, tzinfo=UTC), until=datetime(2025, 4, 1, tzinfo=UTC)
+        ), [
+            {'start': '2025-03-03T14:00:00Z', 'end': '2025-03-03T14:30:00Z'},
+            {'start': '2025-03-10T13:00:00Z', 'end': '2025-03-10T13:30:00Z'},
+            {'start': '2025-03-24T19:00:00Z', 'end': '2025-03-24T19:30:00Z'},
+            {'start': '2025-03-01T00:00:00Z', 'end': '2025-03-02T00:00:00Z'},
+        ])
+        # Only recurring events are limited to the window
+        self.assertEqual([busy_block['start'] for busy_block in parse_ics_busy_blocks(
+            text, since=datetime(2025, 3, 5, tzinfo=UTC), until=datetime(2025, 3, 12, tzinfo=UTC)
+        )], ['2025-03-10T13:00:00Z', '2025-03-24T19:00:00Z'])
+        with self.assertRaises(ValueError):
+            parse_ics_busy_blocks(
+                'BEGIN:VEVENT\nDTSTART:20250303T090000Z\nDURATION:PT1H\nRRULE:FREQ=SOMETIMES\nEND:VEVENT\n'
+            )
+
+
+class StubFreeBusyHandler(BaseHTTPRequestHandler):
+    """Stands in for a remote free/busy provider, see HttpFreeBusyProvider."""
+    delay = 0
+    in_flight = 0
+    max_in_flight = 0
+    requests = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.requests += 1
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            time_module.sleep(cls.delay)
+            match = re.fullmatch(r'/interviewers/(\d+)/free-busy', urlparse(self.path).path)
+            start = date.fromisoformat(parse_qs(urlparse(self.path).query)['start'][0])
+            if not match or match.group(1) == '0':
+                self.send_response(500)
+                self.end_headers()
+                return
+            busy_start = datetime.combine(start + timedelta(days=2), time(hour=9))
+            body = json.dumps({'interviewerId': int(match.group(1)), 'busy': [
+                {'start': busy_start.isoformat() + 'Z', 'end': (busy_start + timedelta(hours=8)).isoformat() + 'Z'}
+            ]}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up waiting, expected in the timeout tests
+            pass
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+class InterviewsRemoteFreeBusyTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubFreeBusyHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.provider_url = f'http://127.0.0.1:{cls.server.server_port}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.interviewer = Interviewer.objects.create(name=interviewer_name_1)
+        cls.interview = InterviewTemplate.objects.create(name='technical', durationMinutes=60)
+        cls.interview.interviewers.add(cls.interviewer)
+
+    def setUp(self):
+        StubFreeBusyHandler.delay = 0
+        StubFreeBusyHandler.max_in_flight = 0
+
+    def get_free_busy_data(self, interviewer_ids, **kwargs):
+        async def fetch():
+            provider = HttpFreeBusyProvider(self.provider_url)
+            try:
+                return await get_free_busy_data_async(interviewer_ids, provider=provider, **kwargs)
+            finally:
+                await provider.aclose()
+        return asyncio.run(fetch())
+
+    def test_get_free_busy_data_async(self):
+        StubFreeBusyHandler.delay = 0.05
+        busy_data = self.get_free_busy_data([3, 1, 2, 6, 5, 4], max_concurrency=3)
+        self.assertEqual([data['interviewerId'] for data in busy_data], [3, 1, 2, 6, 5, 4])
+        self.assertGreater(StubFreeBusyHandler.max_in_flight, 1)
+        self.assertLessEqual(StubFreeBusyHandler.max_in_flight, 3)
+
+    def test_get_free_busy_data_async_errors(self):
+        StubFreeBusyHandler.delay = 0.5
+        with self.assertRaises(FreeBusyProviderError):
+            self.get_free_busy_data([1], timeout=0.1)
+        StubFreeBusyHandler.delay = 0
+        with self.assertRaises(FreeBusyProviderError):
+            self.get_free_busy_data([1, 0])
+        # The sync providers run in a worker thread, so they do not block the event loop past the timeout either
+        def slow_provider(interviewer_ids, **kwargs):
+            time_module.sleep(0.5)
+            return [{'interviewerId': interviewer_id, 'busy': []} for interviewer_id in interviewer_ids]
+        with patch('interviews.async_free_busy.get_free_busy_provider', return_value=slow_provider):
+            with self.assertRaises(FreeBusyProviderError):
+                asyncio.run(get_free_busy_data_async([1], provider=MockAsyncFreeBusyProvider(), timeout=0.1))
+
+    def test_interviews_availability_async(self):
+        url = f'/interviews/{self.interview.interviewId}/availability/async'
+        invalidate_free_busy_data([self.interviewer.id])
+        with override_settings(FREE_BUSY_PROVIDER_URL=self.provider_url):
+            response = self.client.get(f'{url}?days=14')
+            requests = StubFreeBusyHandler.requests
+            self.assertEqual(self.client.get(f'{url}?days=14').json(), response.json())
+        self.assertEqual(response.status_code, 200)
+        slots = time_blocks_from_json(response.json()['availableSlots'])
+        self.assertTrue(slots)
+        busy_dates = {datetime.now(UTC).date() + timedelta(days=2), datetime.now(UTC).date() + timedelta(days=9)}
+        self.assertFalse([slot for slot in slots if to_datetime(slot.start).date() in busy_dates])
+        if get_test_redis_client():
+            # The second request was answered from the shared free/busy cache
+            self.assertEqual(StubFreeBusyHandler.requests, requests)
+        invalidate_free_busy_data([self.interviewer.id])
+        with override_settings(FREE_BUSY_PROVIDER_URL=self.provider_url, FREE_BUSY_TIMEOUT=0.1):
+            StubFreeBusyHandler.delay = 0.5
+            self.assertEqual(self.client.get(url).status_code, 502)
+
+    def test_http_free_busy_provider_client(self):
+        async def get_clients():
+            provider = HttpFreeBusyProvider(self.provider_url)
+            await provider.aclose()
+            return provider.client, HttpFreeBusyProvider(self.provider_url).client
+        client, other_client = asyncio.run(get_clients())
+        self.assertIs(client, other_client)
+        self.assertFalse(client.is_closed)
+        with self.assertRaises(TypeError):
+            AsyncFreeBusyProvider()
+
+    def test_free_busy_http_provider(self):
+        with override_settings(FREE_BUSY_PROVIDER='http', FREE_BUSY_PROVIDER_URL=self.provider_url):
+            provider = get_free_busy_provider()
+        self.assertIsInstance(provider, FreeBusyHttpProvider)
+        self.assertIs(provider.client, FreeBusyHttpProvider(self.provider_url).client)
+        busy_data = provider([2, 1], start_date=date(2025, 1, 6))
+        self.assertEqual(busy_data, self.get_free_busy_data([2, 1], start_date=date(2025, 1, 6)))
+        with self.assertRaises(FreeBusyProviderError):
+            provider([1, 0])
+
+
+class InterviewsBenchmarksTestCase(TestCase):
+    def test_run_benchmarks(self):
+        cases = get_cases({'interviewers': [1, 3], 'days': [6, 8]})
+        self.assertEqual(len(cases), 4)
+        results = run_benchmarks(cases, min_time=0.001, repeat=1)
+        self.assertIn('possible[duration=60,days=8]', results)
+        self.assertIn('all_available_bitmask[interviewers=3,density=2.0,duration=60,days=6]', results)
+        # possible only depends on duration and days so the interviewers sweep does not run it again
+        self.assertEqual(len([key for key in results if key.startswith('possible[')]), 2)
+        for result in results.values():
+            self.assertGreater(result['ops_per_sec'], 0)
+            self.assertGreaterEqual(result['peak_memory_kib'], 0)
+
+        self.assertEqual(compare_results(results, results), [])
+        baseline = {key: {'ops_per_sec': result['ops_per_sec'] * 2} for key, result in results.items()}
+        self.assertEqual(len(compare_results(results, baseline, threshold=0.25)), len(results))
+        self.assertEqual(compare_results(results, baseline, threshold=0.6), [])
+
+    def test_benchmark_availability_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'results.json')
+            options = ['--interviewers', '2', '--density', '1', '--duration', '60', '--days', '6', '--min-time', '0.001',
+                       '--repeat', '1', '--benchmarks', 'possible', 'all_available_python']
+            call_command('benchmark_availability', *options, '--output', output, stdout=io.StringIO())
+            with open(output) as f:
+                results = json.load(f)
+            self.assertEqual(
+                sorted(results),
+                ['all_available_python[interviewers=2,density=1.0,duration=60,days=6]', 'possible[duration=60,days=6]']
+            )
+            for result in results.values():
+                result['ops_per_sec'] *= 1000
+            with open(output, 'w') as f:
+                json.dump(results, f)
+            with self.assertRaises(CommandError):
+                call_command('benchmark_availability', *options, '--baseline', output, stdout=io.StringIO())
+
+
+class InterviewsSyntheticAvailabilityTestCase(TestCase):
+    def test_synthetic_calendar_is_deterministic(self):
+        calendar = SyntheticCalendar(seed=3, density=2, timezones=('UTC', 'America/New_York', 'Asia/Kolkata'))
+        busy_data = calendar([1, 2, 3], start_date=date(2025, 1, 6), days=14)
+        self.assertEqual(busy_data, SyntheticCalendar(seed=3, density=2, timezones=('UTC', 'America/New_York', 'Asia/Kolkata'))(
+            [1, 2, 3], start_date=date(2025, 1, 6), days=14
+        ))
+        # An interviewer's calendar does not depend on the panel or the window it is requested with
+        self.assertEqual(calendar([3], start_date=date(2025, 1, 6), days=14), busy_data[2:])
+        self.assertEqual(
+            calendar([2], start_date=date(2025, 1, 13))[0]['busy'],
+            [block for block in busy_data[1]['busy'] if block['start'] >= '2025-01-13']
+        )
+        self.assertNotEqual(SyntheticCalendar(seed=4, density=2)([1], start_date=date(2025, 1, 6)), busy_data[:1])
+        self.assertEqual(
+            calendar.get_time_blocks([1, 2, 3], start_date=date(2025, 1, 6), days=14),
+            get_time_blocks_from_busy_data_windows([busy_data])
+        )
+
+    def test_synthetic_calendar_distribution(self):
+        calendar = SyntheticCalendar(
+            seed=0, density=3, timezones=('America/New_York',), meeting_minutes=(30, 90), meeting_weights=(3, 1)
+        )
+        interviewer_indexes, starts, ends = calendar.get_busy_minutes(list(range(1, 2001)), start_date=date(2025, 1, 6))
+        self.assertTrue((interviewer_indexes[:-1] <= interviewer_indexes[1:]).all())
+        # 5 working days of 3 busy blocks for 2000 interviewers
+        self.assertAlmostEqual(len(starts) / (2000 * 5 * 3), 1, delta=0.05)
+        self.assertEqual(set((ends - starts).tolist()), {30, 90})
+        self.assertAlmostEqual(((ends - starts) == 30).mean(), 0.75, delta=0.05)
+        local_starts = [to_datetime(start).astimezone(ZoneInfo('America/New_York')) for start in starts[:500].tolist()]
+        self.assertTrue(all(time(9) <= local_start.time() < time(17) for local_start in local_starts))
+        self.assertTrue(all(local_start.weekday() < 5 for local_start in local_starts))
+
+    def test_get_free_busy_provider(self):
+        self.assertIs(get_free_busy_provider(), get_free_busy_data)
+        with override_settings(FREE_BUSY_SYNTHETIC_SEED=1, FREE_BUSY_SYNTHETIC_DENSITY=2, FREE_BUSY_SYNTHETIC_TIMEZONES=['UTC']):
+            provider = get_free_busy_provider()
+            invalidate_free_busy_data([1, 2])
+            self.assertIsInstance(provider, SyntheticCalendar)
+            self.assertEqual(
+                get_time_blocks_from_busy_data([1, 2], days=6),
+                get_time_blocks_from_busy_data([1, 2], days=6, provider=provider)
+            )
+            invalidate_free_busy_data([1, 2])
+
+    def test_generate_free_busy_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'free_busy.json')
+            call_command(
+                'generate_free_busy', path, '--interviewers', '50', '--start', '2025-01-06', '--meetings', '30:1,60:1',
+                stdout=io.StringIO()
+            )
+            with open(path) as f:
+                free_busy_data = json.load(f)
+            self.assertEqual(free_busy_data, SyntheticCalendar(meeting_minutes=(30, 60), meeting_weights=(1, 1))(
+                list(range(1, 51)), start_date=date(2025, 1, 6)
+            ))
+            with self.assertRaises(CommandError):
+                call_command('generate_free_busy', path, '--timezones', 'Nowhere/Nothing', stdout=io.StringIO())
+
+
+class InterviewsFreeBusyProvidersTestCase(TestCase):
+    def test_get_free_busy_provider_registry(self):
+        with override_settings(FREE_BUSY_PROVIDER='synthetic', FREE_BUSY_SYNTHETIC_SEED=None):
+            self.assertIsInstance(get_free_busy_provider(), SyntheticCalendar)
+        with override_settings(FREE_BUSY_PROVIDER='interviews.mock_availability.get_provider'):
+            self.assertIs(get_free_busy_provider(), get_free_busy_data)
+        for name in ('calendar', 'interviews.calendar.get_provider', 'directory', 'http'):
+            with override_settings(FREE_BUSY_PROVIDER=name, FREE_BUSY_PROVIDER_DIRECTORY=None, FREE_BUSY_PROVIDER_URL=None):
+                with self.assertRaises(ImproperlyConfigured):
+                    get_free_busy_provider()
+
+    def test_free_busy_directory_provider(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, '1.json'), 'w') as f:
+                json.dump({'interviewerId': 1, 'busy': [
+                    {'start': '2025-01-03T10:00:00Z', 'end': '2025-01-03T11:00:00Z'},
+                    {'start': '2025-01-07T09:00:00+01:00', 'end': '2025-01-07T10:30:00+01:00'},
+                    {'start': '2025-01-12T23:00:00', 'end': '2025-01-13T01:00:00'},
+                ]}, f)
+            with open(os.path.join(directory, '2.ics'), 'w') as f:
+                f.write('BEGIN:VCALENDAR\nBEGIN:VEVENT\nDTSTART:20250108T140000Z\nDTEND:20250108T150000Z\n'
+                        'END:VEVENT\nEND:VCALENDAR\n')
+            with override_settings(FREE_BUSY_PROVIDER='directory', FREE_BUSY_PROVIDER_DIRECTORY=directory):
+                provider = get_free_busy_provider()
+            self.assertIsInstance(provider, FreeBusyDirectoryProvider)
+            self.assertEqual(provider([1, 2, 3], start_date=date(2025, 1, 6)), [
+                {'interviewerId': 1, 'busy': [
+                    {'start': '2025-01-07T08:00:00Z', 'end': '2025-01-07T09:30:00Z'},
+                    {'start': '2025-01-12T23:00:00Z', 'end': '2025-01-13T01:00:00Z'},
+                ]},
+                {'interviewerId': 2, 'busy': [{'start': '2025-01-08T14:00:00Z', 'end': '2025-01-08T15:00:00Z'}]},
+                {'interviewerId': 3, 'busy': []},
+            ])
+            # Changed files are parsed again
+            with open(os.path.join(directory, '1.json'), 'w') as f:
+                json.dump([{'interviewerId': 1, 'busy': []}], f)
+            os.utime(os.path.join(directory, '1.json'), ns=(0, 0))
+            self.assertEqual(provider([1], start_date=date(2025, 1, 6)), [{'interviewerId': 1, 'busy': []}])
+
+    def test_free_busy_providers_are_imported_lazily(self):
+        modules = subprocess.run(
+            [sys.executable, '-c', 'import sys, django; django.setup(); import app1.urls, interviews.tasks; '
+                                   'print(" ".join(sorted({"faker", "httpx", "numpy"} & set(sys.modules))))'],
+            cwd=settings.BASE_DIR, env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'app1.settings'},
+            capture_output=True, text=True, check=True
+        ).stdout.split()
+        self.assertEqual(modules, [])
+
+
+class InterviewsPanelCacheTestCase(TestCase):
+    def setUp(self):
+        panel_union_cache.clear()
+        self.calendar = SyntheticCalendar(seed=5, density=3)
+        self.provider_calls = []
+
+    def tearDown(self):
+        panel_union_cache.clear()
+
+    def get_free_busy_data(self, interviewer_ids, window_start=None):
+        self.provider_calls.append(list(interviewer_ids))
+        return self.calendar(interviewer_ids, start_date=window_start)
+
+    def test_panel_union_cache(self):
+        cache = PanelUnionCache(max_size=10, ttl=60)
+        window_start = date(2025, 1, 6)
+        self.assertIsNone(cache.get([1, 2], window_start))
+        cache.set([2, 1], window_start, [time_block_to_slot(datetime(2025, 1, 6, 9, tzinfo=UTC), datetime(2025, 1, 6, 10, tzinfo=UTC))] * 4)
+        cache.set([3], window_start, [])
+        self.assertEqual(len(cache.get([1, 2, 2], window_start)), 4)
+        self.assertIsNone(cache.get([1, 2], window_start + timedelta(days=7)))
+        # 5 + 1 + 5 blocks is over the size so the least recently used panel [3] is evicted
+        cache.set([4], window_start, [time_block_to_slot(datetime(2025, 1, 6, 9, tzinfo=UTC), datetime(2025, 1, 6, 10, tzinfo=UTC))] * 4)
+        self.assertIsNone(cache.get([3], window_start))
+        self.assertIsNotNone(cache.get([1, 2], window_start))
+        cache.set([5], window_start, [time_block_to_slot(datetime(2025, 1, 6, 9, tzinfo=UTC), datetime(2025, 1, 6, 10, tzinfo=UTC))] * 20)
+        self.assertIsNone(cache.get([5], window_start))
+        self.assertEqual(cache.invalidate([2, 3]), 1)
+        self.assertIsNone(cache.get([1, 2], window_start))
+        self.assertEqual(cache.get_stats(), {'hits': 2, 'misses': 5, 'panels': 1, 'size': 5})
+        # A union computed before another worker changed a member's busy data is a miss
+        cache.set([1, 2], window_start, [], versions=[3, 1])
+        self.assertEqual(cache.get([2, 1], window_start, versions=[3, 1]), ())
+        self.assertIsNone(cache.get([2, 1], window_start, versions=[3, 2]))
+        with patch('interviews.panel_cache.time_module.monotonic', return_value=time_module.monotonic() + 61):
+            self.assertIsNone(cache.get([4], window_start))
+
+    def test_get_panel_unavailable_time_blocks(self):
+        with patch.object(free_busy_cache, 'get_free_busy_data', side_effect=self.get_free_busy_data):
+            unavailable_time_blocks = get_panel_unavailable_time_blocks([1, 2, 3], days=13)
+            self.assertEqual(len(self.provider_calls), 2)
+            self.assertEqual(unavailable_time_blocks, merge_unavailable_time_blocks(
+                get_time_blocks_from_busy_data([1, 2, 3], days=13, provider=self.calendar)
+            ))
+            self.assertEqual(get_panel_unavailable_time_blocks([3, 1, 2], days=13), unavailable_time_blocks)
+            self.assertEqual(len(self.provider_calls), 2)
+            invalidate_free_busy_data([2])
+            self.assertEqual(get_panel_unavailable_time_blocks([1, 2, 3], days=13), unavailable_time_blocks)
+            self.assertEqual(len(self.provider_calls), 4)
+            # Another worker invalidating only bumps the shared versions, this process's unions are left in place
+            free_busy_cache.bump_versions([3])
+            self.assertEqual(get_panel_unavailable_time_blocks([1, 2, 3], days=13), unavailable_time_blocks)
+            self.assertEqual(len(self.provider_calls), 6)
+
+    def test_templates_sharing_a_panel_reuse_the_union(self):
+        interviewers = [dict(id=1), dict(id=2)]
+        with patch.object(free_busy_cache, 'get_free_busy_data', side_effect=self.get_free_busy_data):
+            for duration in (30, 60, 90):
+                self.assertEqual(
+                    get_all_available_time_blocks(interviewers, duration, backend='python', days=13),
+                    get_all_available_time_blocks(interviewers, duration, backend='bitmask', days=13)
+                )
+        self.assertEqual(len(self.provider_calls), 2)
+        self.assertEqual(panel_union_cache.get_stats()['panels'], 2)
+
+
+class InterviewsWorkingHoursTestCase(TestCase):
+    new_york = {'id': 1, 'start_time': time(9), 'end_time': time(17), 'timezone': 'America/New_York'}
+    berlin = {'id': 2, 'start_time': '09:00:00', 'end_time': '17:00:00', 'timezone': 'Europe/Berlin'}
+    # Thursday before the US switches to daylight saving time on Sunday 2025-03-09
+    dt = datetime(year=2025, month=3, day=6, hour=8, tzinfo=UTC)
+
+    def get_starts(self, time_blocks) -> list[datetime]:
+        return [to_datetime(time_block.start) for time_block in time_blocks]
+
+    def test_default_working_hours(self):
+        self.assertEqual(
+            get_panel_working_hours([dict(id=1)], date(2025, 3, 7), 3),
+            (time_block_to_slot(datetime(2025, 3, 7, 9, tzinfo=UTC), datetime(2025, 3, 7, 17, tzinfo=UTC)),)
+        )
+        self.assertEqual(
+            get_all_possible_time_blocks(60, dt=self.dt, interviewers=[dict(id=1), {'id': 2, 'timezone': 'UTC'}]),
+            get_all_possible_time_blocks(60, dt=self.dt)
+        )
+
+    def test_interviewer_working_hours(self):
+        starts = self.get_starts(get_all_possible_time_blocks(60, dt=self.dt, interviewers=[self.new_york]))
+        self.assertEqual(starts[0], datetime(2025, 3, 7, 14, tzinfo=UTC))
+        self.assertEqual(max(start for start in starts if start.day == 7), datetime(2025, 3, 7, 21, tzinfo=UTC))
+        # Monday is in daylight saving time so the same local hours start an hour earlier in UTC
+        self.assertEqual(min(start for start in starts if start.day == 10), datetime(2025, 3, 10, 13, tzinfo=UTC))
+        self.assertFalse([start for start in starts if start.astimezone(ZoneInfo('America/New_York')).weekday() >= 5])
+
+        starts = self.get_starts(get_all_possible_time_blocks(60, dt=self.dt, interviewers=[self.new_york, self.berlin]))
+        self.assertEqual(
+            [start for start in starts if start.day == 7],
+            [datetime(2025, 3, 7, 14, tzinfo=UTC), datetime(2025, 3, 7, 14, 30, tzinfo=UTC), datetime(2025, 3, 7, 15, tzinfo=UTC)]
+        )
+
+        night_shift = {'id': 3, 'start_time': time(22), 'end_time': time(6), 'timezone': 'UTC'}
+        self.assertEqual(get_all_possible_time_blocks(60, dt=self.dt, interviewers=[self.new_york, night_shift]), [])
+        starts = self.get_starts(get_all_possible_time_blocks(480, dt=self.dt, interviewers=[night_shift]))
+        self.assertEqual(starts[0], datetime(2025, 3, 7, 22, tzinfo=UTC))
+
+    def test_touching_working_hours_are_coalesced(self):
+        # A 24 hour shift runs from Monday to the end of Friday without a break at midnight
+        all_day = {'id': 1, 'start_time': time(22), 'end_time': time(22), 'timezone': 'UTC'}
+        self.assertEqual(
+            get_panel_working_hours([all_day], date(2025, 3, 11), 3),
+            (time_block_to_slot(datetime(2025, 3, 11, tzinfo=UTC), datetime(2025, 3, 14, tzinfo=UTC)),)
+        )
+        starts = self.get_starts(get_all_possible_time_blocks(120, dt=self.dt, interviewers=[all_day], days=6))
+        self.assertIn(datetime(2025, 3, 11, 21, tzinfo=UTC), starts)
+        # Intersections that abut are coalesced too
+        self.assertEqual(
+            intersect_working_hours([[Slot(0, 60), Slot(60, 120), Slot(180, 240)], [Slot(30, 200)]]),
+            [Slot(30, 120), Slot(180, 200)]
+        )
+
+    def test_working_hours_are_cached_per_combination(self):
+        get_week_working_hours.cache_clear()
+        get_working_hours_intersection.cache_clear()
+        interviewers = [dict(self.new_york, id=index) for index in range(100)]
+        get_all_possible_time_blocks(60, dt=self.dt, interviewers=interviewers)
+        misses = get_week_working_hours.cache_info().misses
+        self.assertLessEqual(misses, 3)
+        get_all_possible_time_blocks(30, dt=self.dt, interviewers=interviewers + [dict(self.new_york, id=100)])
+        self.assertEqual(get_week_working_hours.cache_info().misses, misses)
+
+    def test_backends_honor_working_hours(self):
+        rng = random.Random(1)
+        timezones = ['UTC', 'America/New_York', 'Europe/Berlin', 'Asia/Kolkata', 'Asia/Kathmandu']
+        for _ in range(30):
+            interviewers = [
+                {'id': index, 'timezone': rng.choice(timezones), 'start_time': time(rng.randint(6, 11), rng.choice([0, 30])),
+                 'end_time': time(rng.randint(15, 20))}
+                for index in range(rng.randint(1, 3))
+            ]
+            duration = rng.choice([30, 45, 60])
+            unavailable_time_blocks_list = [[time_block_to_slot(
+                self.dt + timedelta(days=2, hours=rng.randint(0, 23)), self.dt + timedelta(days=2, hours=24)
+            )] for _ in interviewers]
+            expected = get_all_available_time_blocks(
+                interviewers, duration, dt=self.dt, unavailable_time_blocks_list=unavailable_time_blocks_list,
+                backend='python', days=13
+            )
+            self.assertEqual(get_all_available_time_blocks(
+                interviewers, duration, dt=self.dt, unavailable_time_blocks_list=unavailable_time_blocks_list,
+                backend='bitmask', days=13
+            ), expected)
+            self.assertEqual(
+                get_all_available_time_blocks(interviewers, duration, dt=self.dt, backend='postgres', days=13),
+                get_all_possible_time_blocks(duration, dt=self.dt, days=13, interviewers=interviewers)
+            )
+
+
+class InterviewsReportTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        interviewers = [
+            Interviewer.objects.create(name=f'interviewer {index}', timezone=timezone)
+            for index, timezone in enumerate(['UTC', 'America/New_York', 'Europe/Berlin'])
+        ]
+        for index in range(7):
+            interview = InterviewTemplate.objects.create(name=f'template {index}', durationMinutes=[30, 60][index % 2])
+            interview.interviewers.add(*interviewers[:index % 3 + 1])
+        cls.interviewer_ids = [interviewer.id for interviewer in interviewers]
+
+    def call_report(self, directory, name, *options) -> str:
+        path = os.path.join(directory, name)
+        with override_settings(FREE_BUSY_SYNTHETIC_SEED=2):
+            invalidate_free_busy_data(self.interviewer_ids)
+            call_command('availability_report', path, '--days', '13', *options, stdout=io.StringIO())
+        invalidate_free_busy_data(self.interviewer_ids)
+        with open(path) as f:
+            return f.read()
+
+    def test_availability_report(self):
+        with tempfile.TemporaryDirectory() as directory:
+            serial = self.call_report(directory, 'serial.csv', '--workers', '1')
+            parallel = self.call_report(directory, 'parallel.csv', '--workers', '2', '--chunk-size', '2')
+            serial_rows, parallel_rows = serial.splitlines(), parallel.splitlines()
+            self.assertEqual(serial_rows[0], 'interviewId,name,durationMinutes,start,end')
+            self.assertEqual(parallel_rows[0], serial_rows[0])
+            self.assertGreater(len(serial_rows), 7)
+            self.assertEqual(sorted(parallel_rows[1:]), sorted(serial_rows[1:]))
+
+            lines = self.call_report(directory, 'report.ndjson', '--workers', '2', '--backend', 'bitmask').splitlines()
+            self.assertEqual(len(lines), 7)
+            ndjson_rows = [
+                f'{report["interviewId"]},{report["name"]},{report["durationMinutes"]},{slot["start"]},{slot["end"]}'
+                for report in map(json.loads, lines) for slot in report['availableSlots']
+            ]
+            self.assertEqual(sorted(ndjson_rows), sorted(serial_rows[1:]))
+            with self.assertRaises(CommandError):
+                self.call_report(directory, 'report.txt')
+
+
+class InterviewsServerSentEventsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.interviewer = Interviewer.objects.create(name=interviewer_name_1)
+        cls.interview = InterviewTemplate.objects.create(name='technical', durationMinutes=60)
+        cls.interview.interviewers.add(cls.interviewer)
+        cls.slots = get_all_available_time_blocks([serialize_model(cls.interviewer)], 60)
+        InterviewAvailability.save_available_slots(cls.interview.interviewId, cls.slots)
+        cls.url = f'/interviews/{cls.interview.interviewId}/availability/events'
+
+    def test_diff_slots(self):
+        past_slot = time_block_to_slot(datetime.now(UTC), datetime.now(UTC) + timedelta(hours=1))
+        added, removed = diff_slots([past_slot] + self.slots[:3], self.slots[1:4])
+        self.assertEqual(added, [self.slots[3]])
+        self.assertEqual(removed, [self.slots[0]])
+        self.assertEqual(diff_slots(self.slots, [past_slot] + self.slots), ([], []))
+
+    def test_interviews_availability_events_needs_asgi(self):
+        self.assertEqual(self.client.get(self.url).status_code, 501)
+
+    async def test_interviews_availability_events(self):
+        if not await sync_to_async(get_test_redis_client)():
+            self.skipTest('Redis is not available')
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Type'], 'text/event-stream')
+        events = response.streaming_content
+
+        async def next_event():
+            return (await asyncio.wait_for(anext(events), timeout=5)).decode()
+
+        self.assertTrue((await next_event()).startswith('retry: '))
+        event, data = (await next_event()).split('\n')[:2]
+        self.assertEqual(event, 'event: snapshot')
+        self.assertEqual(json.loads(data[len('data: '):])['availableSlots'], time_blocks_to_json(self.slots))
+
+        await sync_to_async(InterviewAvailability.save_available_slots)(
+            self.interview.interviewId, self.slots[1:] + [Slot(self.slots[-1].start + 1440, self.slots[-1].end + 1440)]
+        )
+        event, data = (await next_event()).split('\n')[:2]
+        self.assertEqual(event, 'event: diff')
+        self.assertEqual(json.loads(data[len('data: '):]), {
+            'interviewId': self.interview.interviewId,
+            'added': time_blocks_to_json([Slot(self.slots[-1].start + 1440, self.slots[-1].end + 1440)]),
+            'removed': time_blocks_to_json(self.slots[:1]),
+        })
+        # The ASGI handler cancels the stream when the client disconnects
+        pending = asyncio.ensure_future(anext(events))
+        await asyncio.sleep(0.1)
+        pending.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await pending
+        self.assertNotIn(get_channel(self.interview.interviewId), get_event_hub().queues)
+
+
+class InterviewsReservationsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.interviewer_1 = Interviewer.objects.create(name=interviewer_name_1)
+        cls.interviewer_2 = Interviewer.objects.create(name=interviewer_name_2)
+        cls.interview = InterviewTemplate.objects.create(name='technical', durationMinutes=60)
+        cls.interview.interviewers.add(cls.interviewer_1, cls.interviewer_2)
+        cls.other_interview = InterviewTemplate.objects.create(name='culture', durationMinutes=60)
+        cls.other_interview.interviewers.add(cls.interviewer_2)
+        precompute_availability()
+        cls.slots = InterviewAvailability.objects.get(interview=cls.interview).get_upcoming_slots()
+
+    def setUp(self):
+        self.redis_client = get_test_redis_client()
+        if not self.redis_client:
+            self.skipTest('Redis is not available')
+        self.holds = ReservationHolds(key_prefix='test_holds')
+        self.interviewer_ids = [self.interviewer_1.id, self.interviewer_2.id]
+
+    def tearDown(self):
+        # Holds expire on their own, the interviewers' holds sets are what later tests would see
+        self.redis_client.delete(*[
+            holds.get_interviewer_key(interviewer_id)
+            for holds in (self.holds, reservation_holds) for interviewer_id in self.interviewer_ids
+        ])
+
+    def test_hold(self):
+        start = self.slots[0].start
+        slot, overlapping_slot, next_slot = Slot(start, start + 60), Slot(start + 30, start + 90), Slot(start + 60, start + 120)
+        hold = self.holds.hold(1, self.interviewer_ids, slot, 'Carol')
+        self.assertEqual(self.holds.get(hold['holdId']), hold)
+        self.assertIsNone(self.holds.hold(2, [self.interviewer_2.id], overlapping_slot, 'Dan'))
+        self.assertIsNotNone(self.holds.hold(2, [self.interviewer_2.id], next_slot, 'Dan'))
+        self.assertEqual(self.holds.get_held_time_blocks(self.interviewer_ids), [Slot(start, start + 120)])
+        self.assertEqual(list(iter_unheld_time_blocks(
+            [Slot(start - 60, start), overlapping_slot, Slot(start + 120, start + 180)], [Slot(start, start + 120)]
+        )), [Slot(start - 60, start), Slot(start + 120, start + 180)])
+
+        self.holds.release(hold)
+        self.assertIsNone(self.holds.get(hold['holdId']))
+        self.assertIsNone(self.holds.confirm(hold['holdId']))
+        hold = self.holds.hold(1, self.interviewer_ids, slot, 'Carol')
+        self.assertEqual(self.holds.confirm(hold['holdId']), hold)
+        self.assertIsNone(self.holds.hold(1, [self.interviewer_1.id], overlapping_slot, 'Erin'))
+
+    def test_interviews_reservations(self):
+        url = f'/interviews/{self.interview.interviewId}/reservations'
+        slot = self.slots[2]
+        body = json.dumps({'start': to_datetime(slot.start).isoformat(), 'candidate': 'Carol'})
+        with patch.object(confirm_reservation, 'delay') as delay:
+            response = self.client.post(url, body, content_type='application/json')
+            self.assertEqual(response.status_code, 202)
+            reservation_id = response.json()['reservationId']
+            delay.assert_called_once_with(reservation_id)
+            self.assertEqual(self.client.post(url, body, content_type='application/json').status_code, 409)
+        self.assertEqual(self.client.get(f'/interviews/reservations/{reservation_id}').json()['status'], 'held')
+
+        # Held slots drop out of every availability response right away
+        for interview in (self.interview, self.other_interview):
+            response = self.client.get(f'/interviews/{interview.interviewId}/availability')
+            self.assertNotIn(time_blocks_to_json([slot])[0], response.json()['availableSlots'])
+        self.assertIn(time_blocks_to_json([self.slots[0]])[0], response.json()['availableSlots'])
+
+        # Each template is updated and published once, however many of its interviewers the reservation books
+        with patch('interviews.models.publish_availability_diff', wraps=publish_availability_diff) as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertTrue(confirm_reservation(reservation_id))
+        self.assertCountEqual(
+            [call.args[0] for call in publish.call_args_list], [self.interview.interviewId, self.other_interview.interviewId]
+        )
+        response = self.client.get(f'/interviews/reservations/{reservation_id}')
+        self.assertEqual(response.json()['status'], 'confirmed')
+        self.assertEqual(response.json()['start'], time_blocks_to_json([slot])[0]['start'])
+        self.assertEqual(BusyBlock.objects.filter(interviewer__in=self.interviewer_ids).count(), 2)
+        self.assertNotIn(slot, InterviewAvailability.objects.get(interview=self.other_interview).get_slots())
+        self.assertTrue(confirm_reservation(reservation_id))
+        self.assertEqual(Reservation.objects.count(), 1)
+
+    def test_confirm_reservation_keeps_booking(self):
+        slot = self.slots[3]
+        hold = reservation_holds.hold(self.interview.interviewId, self.interviewer_ids, slot, 'Carol')
+        # The reservation is committed before the availability update runs, so its failure must not release the slot
+        with patch.object(InterviewAvailability, 'update_available_slots', side_effect=RuntimeError('update failed')):
+            with self.assertLogs('django.test', 'ERROR'), self.captureOnCommitCallbacks(execute=True):
+                self.assertTrue(confirm_reservation(hold['holdId']))
+        self.assertEqual(reservation_holds.get_held_time_blocks(self.interviewer_ids), [slot])
+
+        # Redis lost the booking, e.g. after a restart without persistence, the confirmed reservation still holds
+        reservation_holds.release(hold)
+        url = f'/interviews/{self.interview.interviewId}/reservations'
+        body = json.dumps({'start': to_datetime(slot.start).isoformat(), 'candidate': 'Dan'})
+        with patch.object(confirm_reservation, 'delay') as delay:
+            self.assertEqual(self.client.post(url, body, content_type='application/json').status_code, 409)
+        delay.assert_not_called()
+        self.assertEqual(reservation_holds.get_held_time_blocks(self.interviewer_ids), [])
+        hold = reservation_holds.hold(self.other_interview.interviewId, [self.interviewer_2.id], slot, 'Dan')
+        self.assertFalse(confirm_reservation(hold['holdId']))
+        self.assertEqual(reservation_holds.get_held_time_blocks(self.interviewer_ids), [])
+        self.assertEqual(Reservation.objects.count(), 1)
+
+    def test_interviews_reservations_errors(self):
+        url = f'/interviews/{self.interview.interviewId}/reservations'
+        start = to_datetime(self.slots[0].start + 15).isoformat()
+        response = self.client.post(url, json.dumps({'start': start, 'candidate': 'Carol'}), content_type='application/json')
+        self.assertEqual(response.status_code, 409)
+        response = self.client.post(url, json.dumps({'start': '2025-01-22T10:00:00'}), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        with patch('interviews.reservations.get_redis_client', return_value=None):
+            response = self.client.post(url, json.dumps({'start': start, 'candidate': 'Carol'}), content_type='application/json')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(self.client.get(f'/interviews/reservations/{uuid.uuid4()}').status_code, 404)
+
+    def test_run_reservation_benchmark(self):
+        holds = ReservationHolds(key_prefix='test_benchmark_holds')
+        result = run_reservation_benchmark(holds, requests=60, concurrency=12, panel_size=2, slots=6)
+        self.redis_client.delete(*self.redis_client.scan_iter(match='test_benchmark_holds:*'))
+        self.assertEqual(result['double_booked'], 0)
+        self.assertEqual(result['errors'], 0)
+        self.assertEqual(result['held'] + result['conflicts'], 60)
+        # Which holds win depends on thread timing, winners at 30 and 120 minutes already overlap every other slot
+        self.assertGreaterEqual(result['held'], 2)
@@ -1,9 +1,23 @@
 from django.urls import path
 
-from interviews.views import interviews_availability
+from interviews.views import (
+    interviews_availability,
+    interviews_availability_async,
+    interviews_availability_batch,
+    interviews_availability_events,
+    interviews_reservations,
+    reservation_status,
+    interviewer_busy_blocks
+)
 
 
 app_name = "interviews"
 urlpatterns = [
     path("<int:id>/availability", interviews_availability),
+    path("<int:id>/availability/async", interviews_availability_async),
+    path("<int:id>/availability/events", interviews_availability_events),
+    path("<int:id>/reservations", interviews_reservations),
+    path("availability", interviews_availability_batch),
+    path("reservations/<uuid:id>", reservation_status),
+    path("interviewers/<int:id>/busy", interviewer_busy_blocks),
 ]
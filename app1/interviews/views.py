@@ -1,15 +1,152 @@
+import asyncio
+import hashlib
+import json
+import logging
+import redis
+from datetime import datetime, timedelta, UTC
+from itertools import chain, islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from global_use.cache import single_flight_cache
+from interviews.availability_events import RESYNC, get_event_hub
+from interviews.async_free_busy import FreeBusyProviderError, get_time_blocks_from_busy_data_async
+from interviews.free_busy_cache import get_busy_data_versions
+from interviews.helpers import (
+    DEFAULT_HORIZON_DAYS,
+    get_all_available_time_blocks,
+    get_batch_available_time_blocks,
+    merge_unavailable_time_blocks,
+    time_block_to_json,
+    time_blocks_to_json
+)
+from interviews.models import InterviewTemplate, Interviewer, InterviewAvailability, Reservation
+from interviews.reservations import iter_unheld_time_blocks, reservation_holds
+from interviews.slots import Slot, to_datetime, to_iso, to_minutes
+from interviews.tasks import confirm_reservation
 
-from interviews.helpers import get_all_available_time_blocks
-from interviews.models import InterviewTemplate
+logger = logging.getLogger(__name__)
 # Create your views here.
 
+def get_query_int(request, name:str, minimum:int=0, maximum:int=None) -> int | None:
+    """
+    Gets an integer query parameter.
+    :param request: request of the view
+    :param name: name of the query parameter
+    :param minimum: smallest allowed value
+    :param maximum: largest allowed value
+    :returns: value of the query parameter or None if it is not given
+    :raises ValueError: if the value is not an integer in [minimum, maximum]
+    """
+    if not request.GET.get(name):
+        return None
+    try:
+        value = int(request.GET[name])
+    except ValueError:
+        raise ValueError(f'{name} must be an integer')
+    if value < minimum:
+        raise ValueError(f'{name} must be at least {minimum}')
+    if maximum is not None and value > maximum:
+        raise ValueError(f'{name} must be at most {maximum}')
+    return value
+
+
+def get_availability_etag(request, interview:dict, held_time_blocks:list[Slot]) -> str:
+    """
+    Gets a strong ETag of an availability response without computing its slots. It covers the template with its
+    interviewers and their working hours, when its stored availability was computed, the busy data version of every
+    interviewer, the slots held on their calendars, the window start and the query parameters. Busy data changes the
+    provider makes without an invalidation are picked up once the free/busy cache expires, so the free/busy cache TTL
+    period is part of the tag too.
+    :param request: request of the view
+    :param interview: json object of InterviewTemplate
+    :param held_time_blocks: time blocks held on the interviewers' calendars
+    :returns: quoted ETag
+    """
+    interviewer_ids = sorted(interviewer['id'] for interviewer in interview.get('interviewers') or [])
+    now = datetime.now(UTC)
+    # Slots start on half hours at least 24 hours ahead so the slots served only change when that cutoff passes one
+    cutoff = -(-to_minutes(now + timedelta(days=1), ceil=True) // 30)
+    tag = json.dumps([
+        interview,
+        interviewer_ids,
+        InterviewAvailability.objects.filter(interview_id=interview['interviewId']).values_list(
+            'computedAt', flat=True
+        ).first(),
+        get_busy_data_versions(interviewer_ids),
+        held_time_blocks,
+        now.date(),
+        cutoff,
+        # A TTL of 0 disables the free/busy cache, the tag then changes every second
+        int(now.timestamp()) // max(settings.FREE_BUSY_CACHE_TTL, 1),
+        sorted(request.GET.lists()),
+    ], cls=DjangoJSONEncoder, sort_keys=True)
+    return quote_etag(hashlib.sha256(tag.encode()).hexdigest())
+
+
+def stream_interview_json(interview:dict, slots, page_size:int=None):
+    """
+    Encodes an interview as JSON one available slot at a time so the slots never have to be held in memory.
+    :param interview: json object of InterviewTemplate without availableSlots
+    :param slots: iterable of time blocks (start_minute, end_minute)
+    :param page_size: only encode the first page_size slots followed by the cursor of the next page in "next"
+    :returns: generator of JSON chunks
+    """
+    head = json.dumps(interview, cls=DjangoJSONEncoder)
+    yield head[:-1] + (', ' if interview else '') + '"availableSlots": ['
+    slots = iter(slots)
+    count, slot = 0, None
+    for slot in islice(slots, page_size):
+        yield (', ' if count else '') + json.dumps(time_block_to_json(slot))
+        count += 1
+    if page_size is None:
+        yield ']}'
+        return
+    # A full page only has a next page when another slot follows it
+    cursor = to_iso(slot.start) if count == page_size and next(slots, None) else None
+    yield '], "next": ' + json.dumps(cursor) + '}'
+
+
+async def stream_in_thread(chunks, chunk_size:int=100):
+    """
+    Streams a sync generator of text from the ASGI server. Django buffers sync streaming content into one list under
+    ASGI, so the generator is advanced in the sync thread chunk_size chunks at a time instead, keeping any database
+    queries it makes out of the event loop.
+    :param chunks: iterable of str
+    :param chunk_size: number of chunks joined per thread hop
+    :returns: async generator of str
+    """
+    chunks = iter(chunks)
+    next_chunks = sync_to_async(lambda: ''.join(islice(chunks, chunk_size)))
+    while text := await next_chunks():
+        yield text
+
+
 def interviews_availability(request, id:int):
     """
     Gets the InterviewTemplate table from the database adds all possible time blocks for a given interview duration
-    and returns it as a JsonResponse.
+    and returns it as a JsonResponse. Time blocks are served from the precomputed InterviewAvailability and only
+    recomputed when they are stale.
     :param id: interviewId of InterviewTemplate
+    query parameters:
+        limit: only return the first limit slots Ex: ?limit=5
+        days: scheduling horizon in days, up to INTERVIEWS_MAX_HORIZON_DAYS Ex: ?days=30
+        weeks: scheduling horizon in weeks when days is not given Ex: ?weeks=4
+        page_size: return one page of slots and the cursor of the next page in "next" Ex: ?page_size=50
+        after: cursor, only return slots starting after it Ex: ?after=2025-01-22T10:00:00Z
+        stream: stream the response one slot at a time Ex: ?stream=1
+    headers:
+        If-None-Match: ETag of a previous response, answered with 304 Not Modified without computing slots when the
+        template, its interviewers' busy data versions and the window are unchanged
     :returns: json response of interview Ex:
     {
         "interviewId": 1,
@@ -31,9 +168,424 @@ def interviews_availability(request, id:int):
         ]
     }
     """
+    try:
+        limit = get_query_int(request, 'limit')
+        days = get_query_int(request, 'days', minimum=1, maximum=settings.INTERVIEWS_MAX_HORIZON_DAYS)
+        weeks = get_query_int(request, 'weeks', minimum=1, maximum=settings.INTERVIEWS_MAX_HORIZON_DAYS // 7)
+        page_size = get_query_int(request, 'page_size', minimum=1, maximum=settings.INTERVIEWS_MAX_PAGE_SIZE)
+        after = datetime.fromisoformat(request.GET['after']) if request.GET.get('after') else None
+        if after is not None and after.tzinfo is None:
+            raise ValueError('after must include a timezone')
+    except ValueError as e:
+        return JsonResponse({'message': str(e)}, status=400)
+    if days is None and weeks is not None:
+        days = weeks * 7
+    stream = request.GET.get('stream') in ('1', 'true')
     interview = InterviewTemplate.get_json_by_id(id)
+    held_time_blocks = reservation_holds.get_held_time_blocks(
+        [interviewer['id'] for interviewer in interview.get('interviewers') or []]
+    )
+    etag = get_availability_etag(request, interview, held_time_blocks)
+    try:
+        response = get_conditional_response(request, etag=etag) or get_availability_response(
+            etag, interview, limit, days, page_size, after, stream, held_time_blocks, isinstance(request, ASGIRequest)
+        )
+    except FreeBusyProviderError as e:
+        return JsonResponse({'message': str(e)}, status=502)
+    response.headers['ETag'] = etag
+    # Clients and the proxy keep the body but revalidate it on every poll
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def get_availability_response(etag:str, interview:dict, limit:int, days:int, page_size:int, after:datetime,
+                              stream:bool, held_time_blocks:list[Slot], asgi:bool=False):
+    """
+    Builds the response of interviews_availability once its query parameters are parsed, leaving out held slots.
+    :param etag: ETag of the response
+    :param interview: json object of InterviewTemplate
+    :param limit: only return the first limit slots
+    :param days: number of days in the horizon
+    :param page_size: number of slots per page
+    :param after: cursor, only return slots starting after it
+    :param stream: stream the response one slot at a time
+    :param held_time_blocks: sorted non-overlapping time blocks held on the interviewers' calendars
+    :param asgi: the request is served by the ASGI server
+    :returns: JsonResponse or StreamingHttpResponse
+    :raises FreeBusyProviderError: if the free/busy provider fails before the first slot is known
+    """
+    if stream:
+        slots = iter_unheld_time_blocks(
+            InterviewAvailability.iter_available_slots(interview, days=days, after=after), held_time_blocks
+        )
+        # Generating the first slot fetches the first busy data, a provider failure is still a 502 before streaming
+        first_slot = list(islice(slots, 1))
+        slots = chain(first_slot, slots)
+        chunks = stream_interview_json(interview, slots if page_size else islice(slots, limit), page_size)
+        return StreamingHttpResponse(stream_in_thread(chunks) if asgi else chunks, content_type='application/json')
+    return JsonResponse(get_availability_json(etag, interview, limit, days, page_size, after, held_time_blocks))
+
+
+@single_flight_cache(
+    lambda etag, *args: f'interviews:availability:{etag}', lambda: settings.INTERVIEWS_AVAILABILITY_CACHE_TTL
+)
+def get_availability_json(etag:str, interview:dict, limit:int, days:int, page_size:int, after:datetime,
+                          held_time_blocks:list[Slot]) -> dict:
+    """
+    Gets the json of a non streamed interviews_availability response. It is cached in the shared cache under its
+    ETag so every worker serves it until the template, busy data versions, holds, window or query parameters change,
+    and when it expires only one request recomputes it while the others wait for its result.
+    :param etag: ETag of the response, the cache key
+    :param interview: json object of InterviewTemplate
+    :param limit: only return the first limit slots
+    :param days: number of days in the horizon
+    :param page_size: number of slots per page
+    :param after: cursor, only return slots starting after it
+    :param held_time_blocks: sorted non-overlapping time blocks held on the interviewers' calendars
+    :returns: json object of InterviewTemplate with its availableSlots
+    """
     #TODO change interviewers to match expected
     # interviewer_ids = [interviewer['id'] for interviewer in interview.get('interviewers', [])]
     # interview['availableSlots'] = get_all_available_time_blocks(interviewer_ids, interview['durationMinutes'])
-    interview['availableSlots'] = get_all_available_time_blocks(interview.get('interviewers'), interview['durationMinutes'])
+    if days is None and after is None and page_size is None:
+        # Held slots are left out before the first limit slots are taken
+        slots = InterviewAvailability.get_available_slots(interview, limit=None if held_time_blocks else limit)
+        interview['availableSlots'] = time_blocks_to_json(islice(iter_unheld_time_blocks(slots, held_time_blocks), limit))
+        return interview
+
+    slots = iter_unheld_time_blocks(
+        InterviewAvailability.iter_available_slots(interview, days=days, after=after), held_time_blocks
+    )
+    page = list(islice(slots, page_size or limit))
+    interview['availableSlots'] = time_blocks_to_json(page)
+    if page_size is not None:
+        interview['next'] = to_iso(page[-1].start) if len(page) == page_size and next(slots, None) else None
+    return interview
+
+
+async def interviews_availability_async(request, id:int):
+    """
+    Async version of interviews_availability that always computes fresh time blocks. Busy data of every interviewer
+    is fetched from the free/busy provider concurrently, at most FREE_BUSY_MAX_CONCURRENCY requests at a time and
+    each within FREE_BUSY_TIMEOUT seconds, so latency does not grow with panel size.
+    :param id: interviewId of InterviewTemplate
+    query parameters:
+        limit: only return the first limit slots Ex: ?limit=5
+        days: scheduling horizon in days, up to INTERVIEWS_MAX_HORIZON_DAYS Ex: ?days=30
+    :returns: json response of interview in the same format as interviews_availability
+    """
+    try:
+        limit = get_query_int(request, 'limit')
+        days = get_query_int(request, 'days', minimum=1, maximum=settings.INTERVIEWS_MAX_HORIZON_DAYS) or DEFAULT_HORIZON_DAYS
+    except ValueError as e:
+        return JsonResponse({'message': str(e)}, status=400)
+    interview = await sync_to_async(InterviewTemplate.get_json_by_id)(id)
+    interviewers = interview.get('interviewers') or []
+    try:
+        unavailable_time_blocks_list = await get_time_blocks_from_busy_data_async(
+            [interviewer['id'] for interviewer in interviewers], days=days
+        )
+    except FreeBusyProviderError as e:
+        return JsonResponse({'message': str(e)}, status=502)
+    held_time_blocks = await sync_to_async(reservation_holds.get_held_time_blocks)(
+        [interviewer['id'] for interviewer in interviewers]
+    )
+    available_time_blocks = get_all_available_time_blocks(
+        interviewers, interview['durationMinutes'], unavailable_time_blocks_list=unavailable_time_blocks_list,
+        backend='bitmask' if settings.INTERVIEWS_AVAILABILITY_BACKEND == 'bitmask' else 'python',
+        limit=None if held_time_blocks else limit, days=days
+    )
+    interview['availableSlots'] = time_blocks_to_json(
+        islice(iter_unheld_time_blocks(available_time_blocks, held_time_blocks), limit)
+    )
     return JsonResponse(interview)
+
+
+def format_event(event:str, data:dict) -> str:
+    """
+    Formats a Server-Sent Event.
+    :param event: event type
+    :param data: JSON data of the event
+    :returns: event text
+    """
+    return f'event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n'
+
+
+async def get_snapshot_event(interview:dict) -> str:
+    """
+    Gets the Server-Sent Event holding every available slot of an interview.
+    :param interview: json object of InterviewTemplate
+    :returns: event text
+    """
+    slots = await sync_to_async(InterviewAvailability.get_available_slots)(interview)
+    held_time_blocks = await sync_to_async(reservation_holds.get_held_time_blocks)(
+        [interviewer['id'] for interviewer in interview.get('interviewers') or []]
+    )
+    slots = list(iter_unheld_time_blocks(slots, held_time_blocks))
+    return format_event('snapshot', {**interview, 'availableSlots': time_blocks_to_json(slots)})
+
+
+async def stream_availability_events(interview:dict, hub):
+    """
+    Streams the availability of an interview as Server-Sent Events, a snapshot of the available slots first and then
+    the slots added and removed every time its stored availability changes. The stream follows the template before
+    the snapshot is read so no change in between is missed, and is sent a fresh snapshot whenever it falls behind.
+    :param interview: json object of InterviewTemplate
+    :param AvailabilityEventHub hub: event hub of the running event loop
+    :returns: async generator of event text
+    """
+    queue = await hub.subscribe(interview['interviewId'])
+    try:
+        yield f'retry: {settings.INTERVIEWS_EVENTS_RETRY * 1000}\n\n'
+        yield await get_snapshot_event(interview)
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=settings.INTERVIEWS_EVENTS_HEARTBEAT)
+            except TimeoutError:
+                # Comments keep proxies from closing the connection as idle
+                yield ': keepalive\n\n'
+                continue
+            yield await get_snapshot_event(interview) if event is RESYNC else format_event('diff', event)
+    except FreeBusyProviderError:
+        # The stream is already open, the client reconnects after the retry delay
+        logger.warning('Free/busy provider failed, closing availability events of %s', interview['interviewId'],
+                       exc_info=True)
+    finally:
+        await hub.unsubscribe(interview['interviewId'], queue)
+
+
+async def interviews_availability_events(request, id:int):
+    """
+    Streams the availability of an InterviewTemplate as Server-Sent Events instead of polling
+    interviews_availability. Diffs are computed once per change where the stored availability is updated and fanned
+    out to every worker through Redis pub/sub, so clients only receive the slots that changed. Needs the ASGI server
+    and Redis.
+    :param id: interviewId of InterviewTemplate
+    :returns: text/event-stream response Ex:
+    event: snapshot
+    data: {"interviewId": 1, "name": "Technical Interview", ..., "availableSlots": [...]}
+
+    event: diff
+    data: {"interviewId": 1, "added": [{"start": "2025-01-22T10:00:00Z", "end": "2025-01-22T11:00:00Z"}], "removed": []}
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'message': 'Availability events are only served by the ASGI server'}, status=501)
+    hub = get_event_hub()
+    if hub is None:
+        return JsonResponse({'message': 'Availability events need Redis'}, status=503)
+    interview = await sync_to_async(InterviewTemplate.get_json_by_id)(id)
+    try:
+        # Stale stored availability is recomputed here, so a provider failure is a 502 instead of a broken stream
+        await sync_to_async(InterviewAvailability.get_available_slots)(interview)
+    except FreeBusyProviderError as e:
+        return JsonResponse({'message': str(e)}, status=502)
+    response = StreamingHttpResponse(stream_availability_events(interview, hub), content_type='text/event-stream')
+    response.headers['X-Accel-Buffering'] = 'no'
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+@csrf_exempt
+@require_POST
+def interviews_availability_batch(request):
+    """
+    Gets available time blocks for many InterviewTemplates and ad-hoc interviewer panels in one request. Busy data is
+    fetched once for every interviewer in the request.
+    :returns: json response of interviews and panels Ex:
+    request body:
+    {
+        "templates": [1, 2],
+        "panels": [
+            { "interviewer_ids": [1, 3], "duration": 30 }
+        ]
+    }
+    response:
+    {
+        "templates": [
+            { "interviewId": 1, "name": "Technical Interview", ..., "availableSlots": [...] },
+            { "interviewId": 2, "name": "Culture Interview", ..., "availableSlots": [...] }
+        ],
+        "panels": [
+            { "interviewer_ids": [1, 3], "duration": 30, "availableSlots": [...] }
+        ]
+    }
+    """
+    try:
+        body = json.loads(request.body)
+        template_ids = [int(template_id) for template_id in body.get('templates', [])]
+        panels = [
+            {'interviewer_ids': [int(interviewer_id) for interviewer_id in panel['interviewer_ids']],
+             'duration': int(panel['duration'])}
+            for panel in body.get('panels', [])
+        ]
+    except (ValueError, TypeError, KeyError, AttributeError):
+        return JsonResponse({'message': 'Invalid request body'}, status=400)
+
+    templates = InterviewTemplate.get_json_by_ids(template_ids)
+    missing_ids = [template_id for template_id in template_ids if template_id not in templates]
+    if missing_ids:
+        return JsonResponse({'message': f'InterviewTemplates not found: {missing_ids}'}, status=404)
+
+    interviews = [dict(templates[template_id]) for template_id in template_ids]
+    # Interviewers of ad hoc panels are looked up for their working hours, unknown ids keep the defaults
+    interviewers = {
+        interviewer['id']: interviewer for interviewer in Interviewer.objects.filter(
+            id__in={_id for panel in panels for _id in panel['interviewer_ids']}
+        ).values('id', 'start_time', 'end_time', 'timezone')
+    }
+    availability_requests = [
+        {'interviewers': interview.get('interviewers'), 'duration': interview['durationMinutes']} for interview in interviews
+    ] + [
+        {'interviewers': [interviewers.get(_id, {'id': _id}) for _id in panel['interviewer_ids']], 'duration': panel['duration']}
+        for panel in panels
+    ]
+    try:
+        available_time_blocks_list = get_batch_available_time_blocks(availability_requests)
+    except FreeBusyProviderError as e:
+        return JsonResponse({'message': str(e)}, status=502)
+    held_time_blocks_by_interviewer = reservation_holds.get_held_time_blocks_by_interviewer({
+        interviewer['id'] for availability_request in availability_requests
+        for interviewer in availability_request['interviewers'] or []
+    })
+    for result, availability_request, available_time_blocks in zip(
+        interviews + panels, availability_requests, available_time_blocks_list
+    ):
+        held_time_blocks = merge_unavailable_time_blocks([
+            held_time_blocks_by_interviewer[interviewer['id']] for interviewer in availability_request['interviewers'] or []
+        ])
+        result['availableSlots'] = time_blocks_to_json(iter_unheld_time_blocks(available_time_blocks, held_time_blocks))
+    return JsonResponse({'templates': interviews, 'panels': panels})
+
+
+@csrf_exempt
+@require_POST
+def interviewer_busy_blocks(request, id:int):
+    """
+    Ingests busy blocks added to or removed from an interviewer's calendar and updates the stored availability of
+    every InterviewTemplate that includes the interviewer.
+    :param id: id of Interviewer
+    :returns: json response of the number of availabilities updated Ex:
+    request body:
+    {
+        "events": [
+            { "action": "add", "start": "2025-01-22T10:00:00Z", "end": "2025-01-22T11:00:00Z" },
+            { "action": "remove", "start": "2025-01-23T13:00:00Z", "end": "2025-01-23T14:00:00Z" }
+        ]
+    }
+    response:
+    { "interviewerId": 1, "updated": 3 }
+    """
+    try:
+        events = [
+            {'action': event['action'], 'start': event['start'], 'end': event['end']}
+            for event in json.loads(request.body)['events']
+        ]
+        for event in events:
+            start, end = datetime.fromisoformat(event['start']), datetime.fromisoformat(event['end'])
+            if event['action'] not in ('add', 'remove') or start.tzinfo is None or end.tzinfo is None or start >= end:
+                raise ValueError
+    except (ValueError, TypeError, KeyError):
+        return JsonResponse({'message': 'Invalid request body'}, status=400)
+    if not Interviewer.objects.filter(id=id).exists():
+        return JsonResponse({'message': 'Interviewer not found'}, status=404)
+    return JsonResponse({'interviewerId': id, 'updated': InterviewAvailability.apply_busy_block_events(id, events)})
+
+
+def hold_to_json(hold:dict, status:str) -> dict:
+    """
+    Converts a hold of ReservationHolds to the json of a reservation.
+    :param hold: hold of ReservationHolds
+    :param status: held or confirmed
+    :returns: json object of the reservation
+    """
+    return {
+        'reservationId': hold['holdId'],
+        'status': status,
+        'interviewId': hold['interviewId'],
+        'candidate': hold['candidate'],
+        'start': to_iso(hold['start']),
+        'end': to_iso(hold['end']),
+    }
+
+
+@csrf_exempt
+@require_POST
+def interviews_reservations(request, id:int):
+    """
+    Holds an available slot of an InterviewTemplate for a candidate. The hold is placed atomically in Redis, where
+    concurrent requests for overlapping slots of the same interviewers get exactly one winner, and celery confirms it
+    into a Reservation. Holds overlapping a confirmed Reservation are released again in case Redis lost its booking.
+    The slot drops out of availability responses as soon as it is held and the hold expires after
+    INTERVIEWS_RESERVATION_HOLD_TTL seconds if it is never confirmed.
+    :param id: interviewId of InterviewTemplate
+    :returns: json response of the held reservation with status 202, 409 if the slot is not available Ex:
+    request body:
+    { "start": "2025-01-22T10:00:00Z", "candidate": "Carol Jones" }
+    response:
+    {
+        "reservationId": "4f1c8a5e-5c1b-4a4e-9a59-2f5d0f7c6a10",
+        "status": "held",
+        "interviewId": 1,
+        "candidate": "Carol Jones",
+        "start": "2025-01-22T10:00:00Z",
+        "end": "2025-01-22T11:00:00Z",
+        "expiresAt": "2025-01-20T09:02:00Z"
+    }
+    """
+    try:
+        body = json.loads(request.body)
+        start = datetime.fromisoformat(body['start'])
+        candidate = str(body['candidate']).strip()
+        if start.tzinfo is None or not candidate or len(candidate) > 100:
+            raise ValueError
+    except (ValueError, TypeError, KeyError):
+        return JsonResponse({'message': 'Invalid request body'}, status=400)
+    if reservation_holds.client is None:
+        return JsonResponse({'message': 'Reservations need Redis'}, status=503)
+    interview = InterviewTemplate.get_json_by_ids([id]).get(id)
+    if interview is None:
+        return JsonResponse({'message': 'InterviewTemplate not found'}, status=404)
+    slot = Slot(to_minutes(start), to_minutes(start) + interview['durationMinutes'])
+    try:
+        available_slots = InterviewAvailability.get_available_slots(interview)
+    except FreeBusyProviderError as e:
+        return JsonResponse({'message': str(e)}, status=502)
+    if slot not in available_slots:
+        return JsonResponse({'message': 'Slot is not available'}, status=409)
+    interviewer_ids = [interviewer['id'] for interviewer in interview.get('interviewers') or []]
+    try:
+        hold = reservation_holds.hold(id, interviewer_ids, slot, candidate)
+        if hold is None:
+            return JsonResponse({'message': 'Slot is already held'}, status=409)
+        # Checked after the hold is placed so a reservation confirmed meanwhile is seen either in Redis or here
+        if Reservation.is_booked(interviewer_ids, to_datetime(slot.start), to_datetime(slot.end)):
+            reservation_holds.release(hold)
+            return JsonResponse({'message': 'Slot is already booked'}, status=409)
+    except redis.RedisError:
+        return JsonResponse({'message': 'Reservations are unavailable'}, status=503)
+    confirm_reservation.delay(hold['holdId'])
+    return JsonResponse(
+        hold_to_json(hold, 'held') | {'expiresAt': datetime.fromtimestamp(hold['expiresAt'] / 1000, UTC)}, status=202
+    )
+
+
+def reservation_status(request, id):
+    """
+    Gets a reservation, confirmed once celery stored it and held until then.
+    :param UUID id: reservationId returned by interviews_reservations
+    :returns: json response of the reservation in the same format as interviews_reservations, 404 if it is not
+    confirmed and its hold expired
+    """
+    reservation = Reservation.objects.filter(id=id).first()
+    if reservation is not None:
+        return JsonResponse(hold_to_json({
+            'holdId': str(reservation.id), 'interviewId': reservation.interview_id, 'candidate': reservation.candidate,
+            'start': to_minutes(reservation.period.lower), 'end': to_minutes(reservation.period.upper, ceil=True),
+        }, 'confirmed'))
+    try:
+        hold = reservation_holds.get(str(id)) if reservation_holds.client is not None else None
+    except redis.RedisError:
+        return JsonResponse({'message': 'Reservations are unavailable'}, status=503)
+    if hold is None:
+        return JsonResponse({'message': 'Reservation not found'}, status=404)
+    return JsonResponse(hold_to_json(hold, 'held') | {'expiresAt': datetime.fromtimestamp(hold['expiresAt'] / 1000, UTC)})
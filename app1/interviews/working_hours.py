@@ -0,0 +1,138 @@
+from datetime import date, datetime, time, timedelta, UTC
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+from interviews.slots import Slot, to_minutes
+
+DEFAULT_START_TIME = time(hour=9)
+DEFAULT_END_TIME = time(hour=17)
+DEFAULT_TIMEZONE = 'UTC'
+WEEK_DAYS = 7
+
+
+def get_working_hours_key(interviewer:dict) -> tuple[str, time, time]:
+    """
+    Gets the working hours an interviewer dict was serialized with, missing fields default to the Interviewer model
+    defaults and times serialized to JSON are parsed back.
+    :param interviewer: interviewer dict Ex: {'id': 1, 'start_time': '09:00:00', 'end_time': '17:00:00', 'timezone': 'UTC'}
+    :returns: (timezone, start_time, end_time)
+    """
+    start_time = interviewer.get('start_time') or DEFAULT_START_TIME
+    end_time = interviewer.get('end_time') or DEFAULT_END_TIME
+    return (
+        interviewer.get('timezone') or DEFAULT_TIMEZONE,
+        time.fromisoformat(start_time) if isinstance(start_time, str) else start_time,
+        time.fromisoformat(end_time) if isinstance(end_time, str) else end_time,
+    )
+
+
+@lru_cache(maxsize=1024)
+def get_week_working_hours(timezone:str, start_time:time, end_time:time, week_start:date) -> tuple[Slot, ...]:
+    """
+    Gets the working hours of one (timezone, start_time, end_time) combination for the week starting at week_start,
+    converting each local working day to UTC once so no slot needs a time zone conversion. Working days are Monday to
+    Friday in the local time zone and end_time at or before start_time runs past midnight.
+    :param timezone: time zone name Ex: America/New_York
+    :param start_time: local start of the working day
+    :param end_time: local end of the working day
+    :param week_start: Monday the week starts on
+    :returns: sorted working hours [(start_minute, end_minute), ...]
+    """
+    zone = ZoneInfo(timezone)
+    working_hours = []
+    for day in range(WEEK_DAYS):
+        local_date = week_start + timedelta(days=day)
+        if local_date.weekday() >= 5:
+            continue
+        end_date = local_date + timedelta(days=1) if end_time <= start_time else local_date
+        working_hours.append(Slot(
+            to_minutes(datetime.combine(local_date, start_time, tzinfo=zone)),
+            to_minutes(datetime.combine(end_date, end_time, tzinfo=zone), ceil=True)
+        ))
+    return tuple(working_hours)
+
+
+def get_combination_working_hours(working_hours_key:tuple, start_date:date, days:int) -> list[Slot]:
+    """
+    Gets the working hours of a (timezone, start_time, end_time) combination covering days UTC days from start_date
+    from the cached weeks.
+    :param working_hours_key: (timezone, start_time, end_time)
+    :param start_date: first UTC day of the horizon
+    :param days: number of days in the horizon
+    :returns: sorted working hours [(start_minute, end_minute), ...]
+    """
+    # Local days one day either side of the UTC horizon can overlap it
+    week_start = start_date - timedelta(days=start_date.weekday() + WEEK_DAYS)
+    last_date = start_date + timedelta(days=days)
+    working_hours = []
+    while week_start <= last_date:
+        working_hours.extend(get_week_working_hours(*working_hours_key, week_start))
+        week_start += timedelta(days=WEEK_DAYS)
+    return working_hours
+
+
+def intersect_working_hours(working_hours_list) -> list[Slot]:
+    """
+    Intersects sorted non-overlapping working hours in a single sweep. Intervals that touch, such as the days of a
+    24 hour shift or an overnight shift ending when the next one starts, are coalesced into one so an interview can
+    run across the boundary.
+    :param list[list[Slot]] working_hours_list: sorted non-overlapping working hours of each combination
+    :returns: sorted, disjoint and non-touching times every combination is working [(start_minute, end_minute), ...]
+    """
+    intersection = working_hours_list[0]
+    for working_hours in working_hours_list[1:]:
+        merged, index, other_index = [], 0, 0
+        while index < len(intersection) and other_index < len(working_hours):
+            start = max(intersection[index][0], working_hours[other_index][0])
+            end = min(intersection[index][1], working_hours[other_index][1])
+            if start < end:
+                merged.append(Slot(start, end))
+            if intersection[index][1] < working_hours[other_index][1]:
+                index += 1
+            else:
+                other_index += 1
+        intersection = merged
+    coalesced = []
+    for start, end in intersection:
+        if coalesced and start <= coalesced[-1].end:
+            coalesced[-1] = Slot(coalesced[-1].start, max(coalesced[-1].end, end))
+        else:
+            coalesced.append(Slot(start, end))
+    return coalesced
+
+
+@lru_cache(maxsize=1024)
+def get_working_hours_intersection(working_hours_keys:tuple, start_date:date, days:int) -> tuple[Slot, ...]:
+    """
+    Gets the times every (timezone, start_time, end_time) combination is working within the horizon, cached since
+    most panels share the same few combinations.
+    :param working_hours_keys: sorted (timezone, start_time, end_time) combinations
+    :param start_date: first UTC day of the horizon
+    :param days: number of days in the horizon
+    :returns: sorted working hours clipped to the horizon [(start_minute, end_minute), ...]
+    """
+    working_hours = intersect_working_hours([
+        get_combination_working_hours(working_hours_key, start_date, days) for working_hours_key in working_hours_keys
+    ])
+    horizon_start = to_minutes(datetime.combine(start_date, time(0), tzinfo=UTC))
+    horizon_end = horizon_start + days * 24 * 60
+    return tuple(
+        Slot(max(start, horizon_start), min(end, horizon_end))
+        for start, end in working_hours if start < horizon_end and end > horizon_start
+    )
+
+
+def get_panel_working_hours(interviewers, start_date:date, days:int) -> tuple[Slot, ...]:
+    """
+    Gets the times every interviewer of a panel is working within the horizon. Interviewers sharing working hours are
+    only intersected once and the intersection is cached per set of working hours, so panels where everyone keeps the
+    defaults cost one cached lookup.
+    :param list[dict] interviewers: dict of interviewers, an empty panel gets the default working hours
+    :param start_date: first UTC day of the horizon
+    :param days: number of days in the horizon
+    :returns: sorted working hours clipped to the horizon [(start_minute, end_minute), ...]
+    """
+    working_hours_keys = tuple(sorted({get_working_hours_key(interviewer) for interviewer in interviewers})) or (
+        (DEFAULT_TIMEZONE, DEFAULT_START_TIME, DEFAULT_END_TIME),
+    )
+    return get_working_hours_intersection(working_hours_keys, start_date, days)
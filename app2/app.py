@@ -10,7 +10,8 @@ from resources.endpoints import (
     Example,
     Projects,
     Project,
-    Comments
+    Comments,
+    TokenCacheStats
 )
 from resources.auth import (
     UserRegister,
@@ -75,6 +76,7 @@ def create_app():
     api.add_resource(Projects, '/projects', endpoint='projects')
     api.add_resource(Project, '/projects/<project_id>', endpoint='projects.id')
     api.add_resource(Comments, '/projects/<project_id>/comments', endpoint='projects.comments')
+    api.add_resource(TokenCacheStats, '/metrics/token-cache', endpoint='metrics.token_cache')
     api.add_resource(UserRegister, '/register')
     api.add_resource(User, '/user/<int:user_id>')
     api.add_resource(UserLogin, '/login')
@@ -14,3 +14,9 @@ JWT_BLACKLIST_ENABLED = True
 JWT_BLACKLIST_TOKEN_CHECKS = ['access', 'refresh']
 CELERY_BROKER_URL = 'redis://redis2:6379'
 RESULT_BACKEND = 'redis://redis2:6379'
+# Seconds valid and invalid token introspection results stay cached per process, and the most valid and invalid
+# tokens cached
+TOKEN_CACHE_TTL = int(os.environ.get("TOKEN_CACHE_TTL", 60))
+TOKEN_CACHE_NEGATIVE_TTL = int(os.environ.get("TOKEN_CACHE_NEGATIVE_TTL", 10))
+TOKEN_CACHE_MAX_SIZE = int(os.environ.get("TOKEN_CACHE_MAX_SIZE", 10000))
+TOKEN_CACHE_NEGATIVE_MAX_SIZE = int(os.environ.get("TOKEN_CACHE_NEGATIVE_MAX_SIZE", 1000))
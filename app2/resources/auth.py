@@ -3,6 +3,7 @@ from flask_restful import Resource, reqparse
 from flask_jwt_extended import create_access_token, create_refresh_token, get_jwt_identity, jwt_required, get_jwt
 from models.user import UserModel
 from blacklist import BLACKLIST
+from token_cache import token_cache
 
 
 class UserRegister(Resource):
@@ -89,6 +90,18 @@ def introspect_token(access_token):
     return token_mapping.get(access_token, invalid_response)
 
 
+def get_token_info(access_token):
+    """
+    Introspects a token through the process-wide token cache, only tokens that are not cached reach the
+    authorization server.
+    """
+    token_info = token_cache.get(access_token)
+    if token_info is None:
+        token_info = introspect_token(access_token)
+        token_cache.set(access_token, token_info)
+    return token_info
+
+
 def safe_str_cmp(a: str, b: str) -> bool:
     """This function compares strings in somewhat constant time. This
     requires that the length of at least one string is known in advance.
@@ -1,10 +1,11 @@
 import json
 
 import flask_restful
-from flask import Response, request
+from flask import Response, g, request
 from flask_restful import Resource, reqparse
-from resources.auth import introspect_token
+from resources.auth import get_token_info
 from models.project import ProjectModel, CommentModel
+from token_cache import token_cache
 from functools import wraps
 
 
@@ -12,7 +13,8 @@ def check_bearer_token(fn):
     """
     Decorator function that checks for valid bearer token. Missing and invalid tokens
     sends 401 Unauthorized response before the Resource this decorator is on is
-    executed.
+    executed. The introspection result is kept in flask.g.token_info for the rest
+    of the request.
     """
     @wraps(fn)
     def wrapper(*args, **kwargs):
@@ -20,9 +22,10 @@ def check_bearer_token(fn):
         if not auth_header or len(auth_header) < len("Bearer "):
             flask_restful.abort(401, message="Missing authentication token")
         access_token = auth_header[len("Bearer "):]
-        token_info = introspect_token(access_token)
+        token_info = get_token_info(access_token)
         if not token_info.get("token_is_valid"):
             flask_restful.abort(401, message="Invalid authentication token")
+        g.token_info = token_info
         return fn(*args, **kwargs)
     return wrapper
 
@@ -31,10 +34,10 @@ def get_user(auth_header):
     """
     Takes in an authorization header and returns the authorized user's user_id
     and username. Token is already determined to be valid in Resource before
-    this function runs.
+    this function runs, so the introspection result of check_bearer_token is
+    reused.
     """
-    access_token = auth_header[len("Bearer "):]
-    token_info = introspect_token(access_token)
+    token_info = g.get("token_info") or get_token_info(auth_header[len("Bearer "):])
     user_info = token_info["user_info"]
     return user_info["user_id"], user_info["username"]
 
@@ -123,3 +126,14 @@ class Comments(Resource):
             commenter_id=user_id, commenter_username=username, message=args["message"]
         ).save_to_db()
         return comment.json(), 201
+
+
+class TokenCacheStats(Resource):
+    @classmethod
+    @check_bearer_token
+    def get(cls):
+        """
+        Returns the token introspection cache counters of the worker process that
+        answers the request.
+        """
+        return token_cache.get_stats(), 200
@@ -0,0 +1,81 @@
+"""
+Unit tests of the process-wide token cache, run with python -m unittest test_token_cache. Sizes and TTLs are passed
+explicitly so no Flask app is needed.
+"""
+import time
+import unittest
+from unittest.mock import patch
+
+from token_cache import TokenCache
+
+VALID = {"token_is_valid": True, "user_info": {"id": "8bde3e84-a964-479c-9c7b-4d7991717a1b"}}
+INVALID = {"token_is_valid": False, "user_info": None}
+
+
+class TokenCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = TokenCache(max_size=3, ttl=60, negative_ttl=10, negative_max_size=2)
+
+    def test_get(self):
+        self.assertIsNone(self.cache.get("token"))
+        self.cache.set("token", VALID)
+        self.cache.set("bad token", INVALID)
+        self.assertEqual(self.cache.get("token"), VALID)
+        self.assertEqual(self.cache.get("bad token"), INVALID)
+        self.assertEqual(self.cache.get_stats(), {
+            "hits": 1, "negative_hits": 1, "misses": 1, "evictions": 0, "negative_evictions": 0,
+            "size": 1, "negative_size": 1,
+        })
+
+    def test_ttl(self):
+        self.cache.set("token", VALID)
+        self.cache.set("bad token", INVALID)
+        now = time.monotonic()
+        with patch("token_cache.time.monotonic", return_value=now + 11):
+            self.assertEqual(self.cache.get("token"), VALID)
+            self.assertIsNone(self.cache.get("bad token"))
+        with patch("token_cache.time.monotonic", return_value=now + 61):
+            self.assertIsNone(self.cache.get("token"))
+        self.assertEqual(self.cache.get_stats()["size"] + self.cache.get_stats()["negative_size"], 0)
+
+    def test_exp_clamp(self):
+        self.cache.set("token", dict(VALID, exp=time.time() + 5))
+        with patch("token_cache.time.monotonic", return_value=time.monotonic() + 6):
+            self.assertIsNone(self.cache.get("token"))
+        # Tokens that already expired are not cached at all
+        self.cache.set("expired token", dict(VALID, exp=time.time() - 1))
+        self.assertIsNone(self.cache.get("expired token"))
+        self.assertEqual(self.cache.get_stats()["size"], 0)
+
+    def test_eviction(self):
+        for index in range(3):
+            self.cache.set(f"token {index}", VALID)
+        self.cache.get("token 0")
+        self.cache.set("token 3", VALID)
+        self.assertIsNone(self.cache.get("token 1"))
+        self.assertEqual(self.cache.get("token 0"), VALID)
+        # Invalid tokens only evict each other, however many there are
+        for index in range(5):
+            self.cache.set(f"bad token {index}", INVALID)
+        for index in (0, 2, 3):
+            self.assertEqual(self.cache.get(f"token {index}"), VALID)
+        stats = self.cache.get_stats()
+        self.assertEqual((stats["evictions"], stats["negative_evictions"]), (1, 3))
+        self.assertEqual((stats["size"], stats["negative_size"]), (3, 2))
+
+    def test_token_changes_validity(self):
+        self.cache.set("token", INVALID)
+        self.cache.set("token", VALID)
+        self.assertEqual(self.cache.get("token"), VALID)
+        self.assertEqual(self.cache.get_stats()["negative_size"], 0)
+
+    def test_clear(self):
+        self.cache.set("token", VALID)
+        self.cache.set("bad token", INVALID)
+        self.cache.clear()
+        self.assertIsNone(self.cache.get("token"))
+        self.assertIsNone(self.cache.get("bad token"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+
+
+class TokenCache:
+    """
+    Process-wide LRU cache of token introspection results. Valid tokens are kept for TOKEN_CACHE_TTL seconds and
+    invalid tokens for TOKEN_CACHE_NEGATIVE_TTL seconds so repeated requests with a bad token do not reach the
+    authorization server either. Invalid tokens are kept in a separate, smaller LRU of TOKEN_CACHE_NEGATIVE_MAX_SIZE
+    entries so a flood of random tokens cannot evict valid ones. Tokens are stored as SHA-256 digests, never in plain
+    text.
+    """
+
+    def __init__(self, max_size=None, ttl=None, negative_ttl=None, negative_max_size=None):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._negative_max_size = negative_max_size
+        self._entries = OrderedDict()
+        self._negative_entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "negative_hits": 0, "misses": 0, "evictions": 0, "negative_evictions": 0}
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size or current_app.config.get("TOKEN_CACHE_MAX_SIZE", 10000)
+
+    @property
+    def negative_max_size(self) -> int:
+        return self._negative_max_size or current_app.config.get("TOKEN_CACHE_NEGATIVE_MAX_SIZE", 1000)
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl if self._ttl is not None else current_app.config.get("TOKEN_CACHE_TTL", 60)
+
+    @property
+    def negative_ttl(self) -> float:
+        return self._negative_ttl if self._negative_ttl is not None else current_app.config.get("TOKEN_CACHE_NEGATIVE_TTL", 10)
+
+    @staticmethod
+    def get_key(access_token: str) -> str:
+        return hashlib.sha256(access_token.encode("utf-8")).hexdigest()
+
+    def get(self, access_token: str):
+        """Returns the cached introspection result of a token, or None when it is not cached or has expired."""
+        key = self.get_key(access_token)
+        now = time.monotonic()
+        with self._lock:
+            for entries, stat in ((self._entries, "hits"), (self._negative_entries, "negative_hits")):
+                entry = entries.get(key)
+                if entry is None:
+                    continue
+                if entry[0] <= now:
+                    del entries[key]
+                    break
+                entries.move_to_end(key)
+                self._stats[stat] += 1
+                return entry[1]
+            self._stats["misses"] += 1
+            return None
+
+    def set(self, access_token: str, token_info: dict) -> None:
+        """Caches the introspection result of a token. A valid token is never kept past its exp claim."""
+        if token_info.get("token_is_valid"):
+            ttl, max_size = self.ttl, self.max_size
+            entries, other_entries, stat = self._entries, self._negative_entries, "evictions"
+        else:
+            ttl, max_size = self.negative_ttl, self.negative_max_size
+            entries, other_entries, stat = self._negative_entries, self._entries, "negative_evictions"
+        if token_info.get("exp"):
+            ttl = min(ttl, token_info["exp"] - time.time())
+        if ttl <= 0:
+            return
+        key = self.get_key(access_token)
+        with self._lock:
+            other_entries.pop(key, None)
+            entries[key] = (time.monotonic() + ttl, token_info)
+            entries.move_to_end(key)
+            while len(entries) > max_size:
+                entries.popitem(last=False)
+                self._stats[stat] += 1
+
+    def get_stats(self) -> dict:
+        """Returns the hit, miss and eviction counters of this process and the number of tokens in each cache."""
+        with self._lock:
+            return {**self._stats, "size": len(self._entries), "negative_size": len(self._negative_entries)}
+
+    def clear(self) -> None:
+        """Removes every cached token, e.g. after tokens were revoked on the authorization server."""
+        with self._lock:
+            self._entries.clear()
+            self._negative_entries.clear()
+
+
+token_cache = TokenCache()